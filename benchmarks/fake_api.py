@@ -0,0 +1,191 @@
+"""
+In-process stand-in of the IEA External DB API, backed by SQLite, to test the upload path without network.
+
+Implemented endpoints:
+- GET /dimension/<dimension>[?code=...&category=...&<field>=...]: the matching rows (404 if a code matches nothing);
+- POST /dimension/<dimension>: inserts the rows, or updates them when their code exists (201);
+- PUT /dimension/<dimension> (list of rows with their id) and PUT /dimension/<dimension>/<id>: updates rows;
+- POST /main/datapoint: upserts datapoints on their dimension fields (201), in any payload encoding
+  of core.payload.
+
+Every request waits for latency seconds before being processed, to mimic the network and the server.
+
+Example:
+    >>> with FakeApi(latency=0.05) as api, api.use():
+    ...     batch_upload(data, f'{api.url}/main/datapoint', 1000)
+    >>> api.count('datapoint')
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from benchmarks.replay import patch_setting
+from iea_scraper.core.payload import decode
+
+# fields identifying a datapoint: posting a datapoint with the same fields replaces its value
+DATAPOINT_KEY = ('provider', 'source', 'flow', 'product', 'area', 'to_area', 'entity', 'frequency', 'period',
+                 'unit', 'sector', 'detail')
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, status, payload=None):
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        time.sleep(self.server.api.latency)
+        parts = urlsplit(self.path)
+        match = re.fullmatch(r'/(dimension|main)/(\w+)(?:/(\d+))?', parts.path)
+        if match is None:
+            return None, None, None, {}
+        return match.group(1), match.group(2), match.group(3), dict(parse_qsl(parts.query))
+
+    def _body(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.api.add('bytes_received', len(body))
+        return decode(body, self.headers)
+
+    def do_GET(self):
+        kind, name, _, filters = self._route()
+        if kind != 'dimension':
+            return self._reply(404, {'error': 'unknown endpoint'})
+        rows = self.server.api.select(name, filters)
+        self._reply(404 if 'code' in filters and not rows else 200, rows)
+
+    def do_POST(self):
+        kind, name, _, _ = self._route()
+        if kind is None:
+            return self._reply(404, {'error': 'unknown endpoint'})
+        rows = self._body()
+        if kind == 'main' and name == 'datapoint':
+            self.server.api.upsert_datapoints(rows)
+        elif kind == 'dimension':
+            self.server.api.upsert_dimension(name, rows)
+        else:
+            return self._reply(404, {'error': 'unknown endpoint'})
+        self._reply(201, {'processed_rows': len(rows)})
+
+    def do_PUT(self):
+        kind, name, row_id, _ = self._route()
+        if kind != 'dimension':
+            return self._reply(404, {'error': 'unknown endpoint'})
+        rows = self._body()
+        if row_id is not None:
+            rows = [{**rows, 'id': int(row_id)}]
+        updated = self.server.api.update_dimension(name, rows)
+        self._reply(200 if updated == len(rows) else 404, {'updated_rows': updated})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeApi:
+    """
+    Fake External DB API served by a thread on a free local port (see the module documentation).
+    """
+
+    def __init__(self, latency=0.0):
+        """
+        :param latency: seconds waited by every request before it is processed.
+        """
+        self.latency = latency
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(':memory:', check_same_thread=False)
+        self._db.execute("CREATE TABLE dimension (id INTEGER PRIMARY KEY AUTOINCREMENT, dimension TEXT, code TEXT, "
+                         "category TEXT, row TEXT, UNIQUE (dimension, code))")
+        self._db.execute("CREATE TABLE datapoint (key TEXT PRIMARY KEY, row TEXT)")
+        self._server = None
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), FakeApiHandler)
+        self._server.api = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def use(self):
+        """
+        Context manager pointing settings.API_END_POINT (in every loaded iea_scraper module) to this API.
+        """
+        return patch_setting('API_END_POINT', self.url)
+
+    def add(self, counter, value):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def select(self, dimension, filters):
+        """
+        :return: the rows of dimension matching every filter (code and category, or any other field).
+        """
+        query = "SELECT id, row FROM dimension WHERE dimension = ?"
+        params = [dimension]
+        for field in ('code', 'category'):
+            if field in filters:
+                query += f" AND {field} = ?"
+                params.append(filters[field])
+        with self._lock:
+            rows = [{**json.loads(row), 'id': row_id} for row_id, row in self._db.execute(query, params)]
+        others = {k: v for k, v in filters.items() if k not in ('code', 'category')}
+        return [row for row in rows if all(str(row.get(k)) == v for k, v in others.items())]
+
+    def upsert_dimension(self, dimension, rows):
+        with self._lock, self._db:
+            for row in rows:
+                row = {k: v for k, v in row.items() if k != 'id'}
+                self._db.execute("INSERT INTO dimension (dimension, code, category, row) VALUES (?, ?, ?, ?) "
+                                 "ON CONFLICT (dimension, code) DO UPDATE SET category = excluded.category, "
+                                 "row = excluded.row",
+                                 (dimension, row.get('code'), row.get('category'), json.dumps(row, default=str)))
+        self.add(f'dimension.{dimension}', len(rows))
+
+    def update_dimension(self, dimension, rows):
+        """
+        :return: the number of rows found and updated.
+        """
+        updated = 0
+        with self._lock, self._db:
+            for row in rows:
+                current = self._db.execute("SELECT row FROM dimension WHERE dimension = ? AND id = ?",
+                                           (dimension, row.get('id'))).fetchone()
+                if current is None:
+                    continue
+                merged = {**json.loads(current[0]), **{k: v for k, v in row.items() if k != 'id'}}
+                self._db.execute("UPDATE dimension SET code = ?, category = ?, row = ? WHERE id = ?",
+                                 (merged.get('code'), merged.get('category'), json.dumps(merged, default=str),
+                                  row['id']))
+                updated += 1
+        return updated
+
+    def upsert_datapoints(self, rows):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO datapoint (key, row) VALUES (?, ?)",
+                                 [(json.dumps([row.get(field) for field in DATAPOINT_KEY], default=str),
+                                   json.dumps(row, default=str)) for row in rows])
+        self.add('datapoint', len(rows))
+
+    def count(self, table, dimension=None):
+        """
+        :return: the number of datapoints ('datapoint') or of rows of a dimension ('dimension', dimension).
+        """
+        with self._lock:
+            if table == 'datapoint':
+                return self._db.execute("SELECT COUNT(*) FROM datapoint").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM dimension WHERE dimension = ?", (dimension,)).fetchone()[0]
@@ -0,0 +1,92 @@
+"""
+Benchmark of the mapping of series names to dimension codes (core.ts): the compiled VocabularyMatcher
+against the reference get_one_mapping(), which searches every vocabulary entry in every text.
+
+The dimensions and series names are synthetic, shaped like the EIA INTL details mapped to the
+product, flow and sector dimensions: a few hundred codes per dimension, each with its code, long name
+and keywords, and names of about ten words.
+
+Usage:
+    python -m benchmarks.mapping [--texts 5000] [--codes 300] [--dimensions 3]
+"""
+import argparse
+import random
+import time
+
+from iea_scraper.core.ts import Normalizer, VocabularyMatcher, get_one_mapping, get_vocab_list
+
+WORDS = ('crude oil', 'natural gas', 'coal', 'electricity', 'nuclear', 'hydro', 'solar', 'wind', 'biomass',
+         'gasoline', 'diesel', 'jet fuel', 'kerosene', 'lpg', 'naphtha', 'fuel oil', 'lubricants', 'bitumen',
+         'production', 'consumption', 'imports', 'exports', 'stocks', 'refinery', 'capacity', 'generation',
+         'residential', 'industry', 'transport', 'commercial', 'total', 'net', 'gross', 'dry', 'marketed',
+         'including lease condensate', 'renewable', 'fossil', 'petroleum', 'products', 'other', 'liquids')
+UNITS = ('thousand barrels per day', 'billion cubic feet', 'quadrillion btu', 'billion kilowatthours',
+         'million metric tons', 'terajoules')
+
+
+def make_dimension(codes, seed=0):
+    """
+    :return: a list of dimension rows (code, long_name, meta_data with keywords).
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(codes):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        keywords = [f'{rng.choice(WORDS)} {rng.choice(WORDS)}' for _ in range(rng.randint(0, 3))]
+        rows.append({'code': f"{'_'.join(word.upper().replace(' ', '') for word in words)}_{i}",
+                     'long_name': ' '.join(words).capitalize(),
+                     'meta_data': f'{{"keywords": {keywords!r}}}'.replace("'", '"')})
+    return rows
+
+
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.sample(WORDS, rng.randint(3, 8))).capitalize()}, {rng.choice(UNITS)}, "
+            f"{rng.choice(['France', 'Japan', 'United States', 'Brazil', 'India'])}" for _ in range(n)]
+
+
+def run(texts, codes, dimensions):
+    """
+    Maps texts with both implementations and checks they agree.
+    :return: dictionary {implementation: seconds}.
+    """
+    normalizer = Normalizer()
+    maps = {f'dimension_{d}': {x['code']: get_vocab_list(x, normalizer) for x in make_dimension(codes, seed=d)}
+            for d in range(dimensions)}
+    normalized = [normalizer.normalize(text) for text in texts]
+
+    begin = time.perf_counter()
+    expected = [get_one_mapping(text, maps) for text in normalized]
+    reference = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    matchers = {dimension: VocabularyMatcher(names) for dimension, names in maps.items()}
+    compiled = time.perf_counter() - begin
+    results = []
+    for text in normalized:
+        mapping = {}
+        for dimension, matcher in matchers.items():
+            code = matcher.earliest(text)
+            if code is not None:
+                mapping[dimension] = code
+        results.append(mapping)
+    matched = time.perf_counter() - begin
+    assert results == expected, 'the matcher and get_one_mapping() disagree'
+    return {'get_one_mapping': reference, 'VocabularyMatcher (with compilation)': matched,
+            'VocabularyMatcher compilation': compiled}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the mapping of series names to dimension codes')
+    parser.add_argument('--texts', type=int, default=5000)
+    parser.add_argument('--codes', type=int, default=300, help='codes per dimension')
+    parser.add_argument('--dimensions', type=int, default=3)
+    args = parser.parse_args()
+    results = run(make_texts(args.texts), args.codes, args.dimensions)
+    for implementation, seconds in results.items():
+        print(f'{implementation:<40}{seconds:>10.3f} s')
+    print(f"{'speed-up':<40}{results['get_one_mapping'] / results['VocabularyMatcher (with compilation)']:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark of the area and period code lookups: the vectorised core.reference_index functions
+against the former merge of the dimension DataFrame on every call (merge, delete, rename).
+
+The area and period dimensions are synthetic (about 250 areas, and the annual, quarterly and monthly
+periods of 1980-2030); the looked up columns hold random identifiers, some of them unknown.
+
+Usage:
+    python -m benchmarks.reference_index [--rows 10000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from iea_scraper.core.reference_index import ReferenceIndex
+
+AREAS = [{'code': f'AREA_{i}', 'iso_alpha_3': f'{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}X'} for i in range(250)]
+PERIODS = [{'code': code, 'id': int(code.replace('Q', '').replace('M', ''))}
+           for year in range(1980, 2031)
+           for code in (str(year), *(f'{year}Q{q}' for q in range(1, 5)), *(f'{year}M{m:02d}' for m in range(1, 13)))]
+
+
+def merge_area(df, areas):
+    """Former convert_area_to_code()."""
+    areas = pd.DataFrame(areas)[['code', 'iso_alpha_3']]
+    df = pd.merge(df, areas, left_on='area', right_on='iso_alpha_3', how='left')
+    del df['iso_alpha_3'], df['area']
+    df.loc[df['code'].isnull(), 'code'] = None
+    df.rename(columns={'code': 'area'}, inplace=True)
+    return df
+
+
+def merge_period(df, periods):
+    """Former map_period() of the EIA bulk jobs."""
+    df['period'] = df['period'].map(lambda x: int(x.replace('Q', '')))
+    periods = pd.DataFrame(periods)[['code', 'id']]
+    df = pd.merge(df, periods, left_on='period', right_on='id', how='left')
+    del df['id'], df['period']
+    df.loc[df['code'].isnull(), 'code'] = None
+    df.rename(columns={'code': 'period'}, inplace=True)
+    return df
+
+
+def index_area(df, areas):
+    codes = ReferenceIndex(areas, 'iso_alpha_3').map(df['area'])
+    df = df.drop(columns='area')
+    df['area'] = codes
+    return df
+
+
+def index_period(df, periods):
+    codes = ReferenceIndex(periods, 'id').map(df['period'], convert=lambda x: int(x.replace('Q', '')))
+    df = df.drop(columns='period')
+    df['period'] = codes
+    return df
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    isos = np.array([area['iso_alpha_3'] for area in AREAS] + ['ZZZ'], dtype=object)
+    periods = np.array([period['code'] for period in PERIODS if 'M' not in period['code']] + ['1900'], dtype=object)
+    return pd.DataFrame({'area': isos[rng.integers(0, len(isos), rows)],
+                         'period': periods[rng.integers(0, len(periods), rows)],
+                         'value': rng.random(rows)})
+
+
+def timed(function, *args):
+    begin = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - begin
+
+
+def run(rows):
+    """
+    Looks up the area and period codes of rows with both implementations and checks they agree.
+    :return: dictionary {lookup: (merge seconds, index seconds)}.
+    """
+    df = make_frame(rows)
+    results = {}
+    for name, merge, index, dimension in (('area', merge_area, index_area, AREAS),
+                                          ('period', merge_period, index_period, PERIODS)):
+        expected, merge_seconds = timed(merge, df.copy(), dimension)
+        mapped, index_seconds = timed(index, df.copy(), dimension)
+        # unknown identifiers are None or NaN, depending on the pandas string dtype
+        assert expected[name].fillna('None').tolist() == mapped[name].fillna('None').tolist(), \
+            f'{name}: the implementations disagree'
+        results[name] = (merge_seconds, index_seconds)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark of the area and period code lookups')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+    print(f"{'lookup':<10}{'merge s':>10}{'index s':>10}{'speed-up':>10}")
+    for name, (merge_seconds, index_seconds) in run(args.rows).items():
+        print(f"{name:<10}{merge_seconds:>10.3f}{index_seconds:>10.3f}{merge_seconds / index_seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Offline benchmark of the job transforms, replaying recorded sources.
+
+A job is recorded once, with network access: its sources are downloaded, then its transform
+(pre_run() for an EdcJob) runs while every HTTP response obtained through requests (External DB API
+dimensions, EDC data...) is saved. The fixture bundle (benchmarks/fixtures/<provider_code>.<source_code>/)
+holds the downloaded files, the job's sources and the recorded responses.
+
+The benchmark replays the bundle offline: the file store is redirected to a copy of the recorded files
+and requests answers from the recorded responses (an unrecorded request fails). Each job is timed over
+repeated runs; its peak memory (tracemalloc) is measured in one extra run. Results can be saved as
+the baseline (benchmarks/baseline.json) and compared against it.
+
+Only HTTP through requests is replayed: a transform reading other remote resources (FTP, urllib...)
+cannot be benchmarked offline.
+
+Usage:
+    python -m benchmarks.replay record gov_noaa_ncei.gsod
+    python -m benchmarks.replay run [job ...] [--repeat 5] [--save-baseline] [--tolerance 0.2]
+"""
+import argparse
+import hashlib
+import io
+import json
+import pickle
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, ExitStack
+from copy import deepcopy
+from pathlib import Path
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from iea_scraper import settings
+from iea_scraper.core import factory
+from iea_scraper.core.dimension_cache import DimensionCache
+from iea_scraper.core.job import EdcJob, ExtDbApiJobV2
+
+BENCHMARKS_PATH = Path(__file__).absolute().parent
+FIXTURES_PATH = BENCHMARKS_PATH / 'fixtures'
+BASELINE_PATH = BENCHMARKS_PATH / 'baseline.json'
+
+# jobs covered by default, with the parameters of their constructor
+JOBS = {
+    'gov_eia.bulk_intl': {},
+    'gov_noaa_ncei.gsod': {'start_year': 2020},
+    'org_jodidata.world_csv': {},
+    'eu_entsoe.european_power_stats': {},
+    'gov_cftc.futures_and_options_comb': {},
+}
+
+
+def get_job(name, **kwargs):
+    """
+    :param name: '<provider_code>.<source_code>'.
+    :return: a new instance of the job.
+    """
+    provider_code, source_code = name.split('.')
+    return factory.get_scraper_job(provider_code, source_code, **kwargs)
+
+
+def request_key(method, url, params=None, data=None, json=None, **kwargs):
+    """
+    Key of a request in the recorded responses: method, full url and hash of the body.
+    """
+    prepared = requests.Request(method.upper(), url, params=params, data=data, json=json).prepare()
+    body = prepared.body.encode() if isinstance(prepared.body, str) else prepared.body
+    return prepared.method, prepared.url, hashlib.md5(body).hexdigest() if body else None
+
+
+class Recorder:
+    """
+    Context manager recording the responses of the requests sent through requests while it is active.
+    """
+
+    def __init__(self):
+        self.responses = {}
+
+    def __enter__(self):
+        send = requests.Session.request
+        recorder = self
+
+        def request(session, method, url, **kwargs):
+            response = send(session, method, url, **kwargs)
+            recorder.responses[request_key(method, url, **kwargs)] = {
+                'status_code': response.status_code,
+                'headers': dict(response.headers),
+                'url': response.url,
+                # reads a streamed body: the caller then iterates over the loaded content
+                'content': response.content,
+            }
+            return response
+
+        self._patch = mock.patch.object(requests.Session, 'request', request)
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._patch.stop()
+        return False
+
+
+def build_response(recorded):
+    """
+    :return: a requests.Response with the recorded status, headers and body.
+    """
+    response = requests.Response()
+    response.status_code = recorded['status_code']
+    response.headers = CaseInsensitiveDict(recorded['headers'])
+    response.url = recorded['url']
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = recorded['content']
+    response._content_consumed = True
+    response.raw = io.BytesIO(recorded['content'])
+    return response
+
+
+@contextmanager
+def replay_responses(responses):
+    """
+    Answers the requests sent through requests from the recorded responses.
+    :raise ConnectionError: on a request that was not recorded.
+    """
+
+    def request(session, method, url, **kwargs):
+        key = request_key(method, url, **kwargs)
+        if key not in responses:
+            raise requests.ConnectionError(f'No recorded response for {key[0]} {key[1]}')
+        response = build_response(responses[key])
+        response.request = requests.Request(method.upper(), url).prepare()
+        return response
+
+    with mock.patch.object(requests.Session, 'request', request):
+        yield
+
+
+@contextmanager
+def patch_setting(setting, value):
+    """
+    Replaces a setting in iea_scraper.settings and in every loaded iea_scraper module that imported it.
+    :param setting: the setting name (e.g. 'FILE_STORE_PATH').
+    :param value: the value to use instead.
+    """
+    original = getattr(settings, setting)
+    with ExitStack() as stack:
+        for name, module in list(sys.modules.items()):
+            if name.startswith('iea_scraper') and module is not None \
+                    and getattr(module, setting, None) == original:
+                stack.enter_context(mock.patch.object(module, setting, value))
+        yield
+
+
+def file_store(path):
+    """
+    Redirects settings.FILE_STORE_PATH to path.
+    """
+    return patch_setting('FILE_STORE_PATH', path)
+
+
+def fresh_dimension_cache():
+    """
+    Gives the job an empty dimension cache kept in memory, so that its dimension requests are recorded
+    (and replayed) whatever the snapshots of the file store.
+    """
+    return mock.patch('iea_scraper.core.utils.get_dimension_cache', return_value=DimensionCache(ttl={}))
+
+
+def transform(job):
+    """
+    Runs the transform part of the job, consuming data produced lazily.
+    :return: the number of data rows produced.
+    """
+    if isinstance(job, EdcJob):
+        job.pre_run()
+        return len(job.df_dw)
+    if isinstance(job, ExtDbApiJobV2):
+        job.add_sources_to_dynamic_dim()
+        job.transform_provider()
+    job.transform()
+    data = job.data
+    if data is None:
+        return 0
+    if hasattr(data, 'shape') or hasattr(data, 'num_rows'):
+        return len(data)
+    rows = 0
+    for item in data:
+        rows += len(item) if hasattr(item, 'shape') or hasattr(item, 'num_rows') else 1
+    return rows
+
+
+def record(name, kwargs=None, fixtures=FIXTURES_PATH):
+    """
+    Downloads the sources of a job and records its transform in a fixture bundle.
+    :param name: '<provider_code>.<source_code>'.
+    :param kwargs: parameters of the job constructor. Defaults to JOBS[name].
+    :param fixtures: the folder of the bundles.
+    :return: the bundle folder.
+    """
+    kwargs = JOBS.get(name, {}) if kwargs is None else kwargs
+    job = get_job(name, **kwargs)
+    bundle = fixtures / name
+    shutil.rmtree(bundle, ignore_errors=True)
+    (bundle / 'files').mkdir(parents=True)
+    sources = complements = []
+    if not isinstance(job, EdcJob):
+        job.get_sources()
+        job.download_and_get_checksum()
+        sources, complements = deepcopy(job.sources), deepcopy(job.source_complements)
+        for source in sources + complements:
+            path = settings.FILE_STORE_PATH / source.path
+            if path.is_file():
+                (bundle / 'files' / source.path).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, bundle / 'files' / source.path)
+    with Recorder() as recorder, fresh_dimension_cache():
+        transform(job)
+    with open(bundle / 'bundle.pickle', 'wb') as f:
+        pickle.dump({'kwargs': kwargs, 'sources': sources, 'source_complements': complements,
+                     'responses': recorder.responses}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f'{name}: {len(sources) + len(complements)} sources and {len(recorder.responses)} responses '
+          f'recorded in {bundle}')
+    return bundle
+
+
+def benchmark(name, repeat=5, fixtures=FIXTURES_PATH):
+    """
+    Replays the fixture bundle of a job offline through its transform.
+    :param name: '<provider_code>.<source_code>'.
+    :param repeat: number of timed runs.
+    :param fixtures: the folder of the bundles.
+    :return: a dictionary with the median and minimum time (seconds), peak memory (bytes) and rows.
+    """
+    bundle = fixtures / name
+    with open(bundle / 'bundle.pickle', 'rb') as f:
+        recorded = pickle.load(f)
+
+    def run(measure_memory=False):
+        job = get_job(name, **recorded['kwargs'])
+        if not isinstance(job, EdcJob):
+            job.sources = deepcopy(recorded['sources'])
+            job.source_complements = deepcopy(recorded['source_complements'])
+        if measure_memory:
+            tracemalloc.start()
+        begin = time.perf_counter()
+        try:
+            with fresh_dimension_cache():
+                rows = transform(job)
+            return time.perf_counter() - begin, rows, tracemalloc.get_traced_memory()[1]
+        finally:
+            if measure_memory:
+                tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as folder:
+        shutil.copytree(bundle / 'files', Path(folder) / 'files')
+        with file_store(Path(folder) / 'files'), replay_responses(recorded['responses']):
+            times = []
+            for _ in range(repeat):
+                elapsed, rows, _ = run()
+                times.append(elapsed)
+            _, _, peak = run(measure_memory=True)
+    return {'median': statistics.median(times), 'min': min(times), 'peak_memory': peak, 'rows': rows}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with the baseline.
+    :param results: dictionary {job: benchmark() result}.
+    :param baseline: dictionary {job: benchmark() result}.
+    :param tolerance: accepted relative increase of the median time and of the peak memory.
+    :return: the list of (job, measure, ratio) exceeding the tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for measure in ('median', 'peak_memory'):
+            ratio = result[measure] / baseline[name][measure] if baseline[name][measure] else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append((name, measure, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark of the job transforms.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    record_parser = subparsers.add_parser('record', help='Record the fixture bundle of jobs (needs network).')
+    record_parser.add_argument('jobs', nargs='*', default=list(JOBS))
+    run_parser = subparsers.add_parser('run', help='Replay the fixture bundles offline.')
+    run_parser.add_argument('jobs', nargs='*', default=list(JOBS))
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline.')
+    run_parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Accepted relative increase of time and memory over the baseline.')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        for name in args.jobs:
+            record(name)
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.is_file() else {}
+    results = {}
+    print(f"{'job':<36}{'median s':>10}{'min s':>10}{'peak MB':>10}{'rows':>12}{'vs baseline':>14}")
+    for name in args.jobs:
+        if not (FIXTURES_PATH / name / 'bundle.pickle').is_file():
+            print(f'{name:<36} no fixture bundle: run "python -m benchmarks.replay record {name}" first')
+            continue
+        result = results[name] = benchmark(name, args.repeat)
+        change = f"{result['median'] / baseline[name]['median'] - 1:+.1%}" if name in baseline else '-'
+        print(f"{name:<36}{result['median']:>10.3f}{result['min']:>10.3f}{result['peak_memory'] / 1e6:>10.1f}"
+              f"{result['rows']:>12}{change:>14}")
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2))
+        print(f'Baseline saved in {BASELINE_PATH}')
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    for name, measure, ratio in regressions:
+        print(f'REGRESSION {name}: {measure} x{ratio:.2f}')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
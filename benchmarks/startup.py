@@ -0,0 +1,128 @@
+"""
+Start-up benchmark: import time of the scraper modules, measured with python -X importtime.
+
+Each module is imported in a fresh interpreter; its import time is the cumulative time of the
+import statement (the module and its parent packages), the minimum over repeated runs. The
+modules which should only be imported when they are used (selenium, pycountry...) are reported
+when a module pulls them in. Results can be saved as the baseline (benchmarks/startup_baseline.json)
+and compared against it.
+
+Usage:
+    python -m benchmarks.startup [module ...] [--repeat 5] [--save-baseline] [--tolerance 0.2]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from iea_scraper.core import registry
+from iea_scraper.settings import EDC_HOURLY_JOBS
+
+BENCHMARKS_PATH = Path(__file__).absolute().parent
+BASELINE_PATH = BENCHMARKS_PATH / 'startup_baseline.json'
+
+# modules imported lazily, by the code which needs them
+LAZY_MODULES = ('selenium', 'pycountry', 'yaml', 'smtplib')
+
+
+def default_modules():
+    """
+    :return: the core modules and the modules of the hourly jobs, whose start-up is the largest part of their run.
+    """
+    jobs = registry.get_registry()
+    hourly = [jobs[key]['module'] for key in (f"{job['provider_code']}.{job['source_code']}"
+                                               for job in EDC_HOURLY_JOBS.values()) if key in jobs]
+    return ['iea_scraper.settings', 'iea_scraper.core.job', 'iea_scraper.jobs.utils', *hourly]
+
+
+def parse_importtime(output, module):
+    """
+    :param output: stderr of python -X importtime.
+    :param module: the imported module.
+    :return: (import time of module in seconds, names of all the imported modules).
+    """
+    total = 0
+    imported = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.append(name.strip())
+        # parent packages and module are the top level entries (no indentation) of the import statement
+        name = name[1:]
+        if not name.startswith(' ') and (module == name or module.startswith(f'{name}.')):
+            total += int(cumulative)
+    return total / 1e6, imported
+
+
+def import_time(module, repeat=5):
+    """
+    Imports module in fresh interpreters.
+    :return: dictionary {'seconds': minimum import time, 'lazy': lazy modules imported}.
+    """
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if process.returncode:
+            raise ImportError(f'Cannot import {module}: {process.stderr.strip().splitlines()[-1]}')
+        seconds, imported = parse_importtime(process.stderr, module)
+        times.append(seconds)
+    lazy = sorted({name.split('.')[0] for name in imported} & set(LAZY_MODULES))
+    return {'seconds': min(times), 'lazy': lazy}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with the baseline.
+    :param results: dictionary {module: import_time() result}.
+    :param baseline: dictionary {module: import_time() result}.
+    :param tolerance: accepted relative increase of the import time.
+    :return: the list of (module, ratio) exceeding the tolerance.
+    """
+    regressions = []
+    for module, result in results.items():
+        if module in baseline and baseline[module]['seconds']:
+            ratio = result['seconds'] / baseline[module]['seconds']
+            if ratio > 1 + tolerance:
+                regressions.append((module, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time of the scraper modules.')
+    parser.add_argument('modules', nargs='*')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Accepted relative increase of the import time over the baseline.')
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.is_file() else {}
+    results = {}
+    failed = False
+    print(f"{'module':<60}{'import s':>10}{'vs baseline':>14}  lazy modules imported")
+    for module in args.modules or default_modules():
+        try:
+            result = results[module] = import_time(module, args.repeat)
+        except ImportError as e:
+            print(f'{module:<60} {e}')
+            failed = True
+            continue
+        change = f"{result['seconds'] / baseline[module]['seconds'] - 1:+.1%}" \
+            if baseline.get(module, {}).get('seconds') else '-'
+        print(f"{module:<60}{result['seconds']:>10.3f}{change:>14}  {', '.join(result['lazy'])}")
+        failed = failed or bool(result['lazy'])
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2))
+        print(f'Baseline saved in {BASELINE_PATH}')
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    for module, ratio in regressions:
+        print(f'REGRESSION {module}: import time x{ratio:.2f}')
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
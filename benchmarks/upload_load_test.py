@@ -0,0 +1,78 @@
+"""
+Load test of the upload path (batch_upload, insert_new_dynamic_dim, update_sources_metadata)
+against the local fake External DB API (benchmarks.fake_api), for several request latencies.
+
+Usage:
+    python -m benchmarks.upload_load_test [--rows 100000] [--batch 20000] [--dims 5000] [--sources 200]
+                                          [--latency 0 0.05 0.2] [--max-in-flight 4]
+"""
+import argparse
+import time
+
+from benchmarks.fake_api import FakeApi
+from benchmarks.upload_payload import make_datapoints
+from iea_scraper.core import job as core_job
+from iea_scraper.core import utils
+from iea_scraper.core.job import ExtDbApiJob
+from iea_scraper.core.source import BaseSource
+
+
+class LoadTestJob(ExtDbApiJob):
+    """ExtDbApiJob whose dynamic dimensions and sources are set by the load test."""
+
+    def get_sources(self):
+        pass
+
+    def transform(self):
+        pass
+
+
+def timed(function, *args, **kwargs):
+    begin = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - begin
+
+
+def run(latency, rows, batch, dims, sources, max_in_flight):
+    """
+    Measures the upload path against a fake API answering after latency seconds.
+    :return: dictionary {step: (items, seconds)}.
+    """
+    data = make_datapoints(rows)
+    results = {}
+    with FakeApi(latency) as api, api.use():
+        results['batch_upload'] = (rows, timed(utils.batch_upload, data, f'{api.url}/main/datapoint', batch,
+                                               max_in_flight=max_in_flight))
+        assert api.counters['datapoint'] == rows
+
+        job = LoadTestJob()
+        job.dynamic_dim['entity'] = [{'code': f'LOAD_TEST_{i}', 'category': 'load test'} for i in range(dims)]
+        job.sources = [BaseSource(code=f'load_test_{i}', url='http://load.test', path=f'load_test_{i}.csv',
+                                  checksum='0' * 32, last_download='2022-01-01T00:00:00Z') for i in range(sources)]
+        job.dynamic_dim['source'] = [{'code': source.code, 'url': source.url} for source in job.sources]
+        results['insert_new_dynamic_dim'] = (dims + sources, timed(job.insert_new_dynamic_dim))
+        assert api.count('dimension', 'entity') == dims
+        results['update_sources_metadata'] = (sources, timed(job.update_sources_metadata))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload path load test against a local fake API')
+    parser.add_argument('--rows', type=int, default=100000, help='datapoints uploaded')
+    parser.add_argument('--batch', type=int, default=core_job.BATCH_SIZE, help='datapoints per request')
+    parser.add_argument('--dims', type=int, default=5000, help='dynamic dimension rows inserted')
+    parser.add_argument('--sources', type=int, default=200, help='sources updated')
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0, 0.05, 0.2],
+                        help='seconds waited by the API before processing each request')
+    parser.add_argument('--max-in-flight', type=int, default=utils.UPLOAD_MAX_IN_FLIGHT)
+    args = parser.parse_args()
+
+    print(f"{'latency s':>10}  {'step':<26}{'items':>10}{'seconds':>10}{'items/s':>12}")
+    for latency in args.latency:
+        results = run(latency, args.rows, args.batch, args.dims, args.sources, args.max_in_flight)
+        for step, (items, seconds) in results.items():
+            print(f"{latency:>10.3f}  {step:<26}{items:>10}{seconds:>10.3f}{items / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measures the bytes and time per batch of each upload payload encoding (see iea_scraper.core.payload)
+against the local fake External DB API (benchmarks.fake_api).
+
+The fake API decodes every request (so decompression and parsing are part of the timing) and stores the rows.
+
+Usage: python -m benchmarks.upload_payload [--rows 100000] [--batch 10000]
+"""
+import argparse
+import math
+import random
+import time
+
+from benchmarks.fake_api import FakeApi
+from iea_scraper.core import utils
+from iea_scraper.core.payload import PayloadEncoder
+
+ENCODERS = {'json (requests)': None,
+            'records': PayloadEncoder('records'),
+            'records+gzip': PayloadEncoder('records', 'gzip'),
+            'columns': PayloadEncoder('columns'),
+            'columns+gzip': PayloadEncoder('columns', 'gzip'),
+            'columns+deflate': PayloadEncoder('columns', 'deflate')}
+
+
+def make_datapoints(rows):
+    """
+    Synthetic datapoints shaped like EdcJob.df_dw_processed records.
+    """
+    areas = ['FRA', 'DEU', 'ITA', 'ESP', 'GBR', 'USA', 'JPN', 'IND', 'CHN', 'BRA']
+    products = ['ELECTRICITY', 'NATGAS', 'COAL', 'NUCLEAR', 'WIND', 'SOLAR']
+    return [{'area': random.choice(areas),
+             'product': random.choice(products),
+             'flow': 'GENERATION',
+             'period': f'2021-{1 + i % 12:02d}-{1 + i % 28:02d}',
+             'frequency': 'Daily',
+             'unit': 'GWh',
+             'source': 'ENTSOE_DAILY',
+             'value': round(random.uniform(0, 10000), 3),
+             'last_update': '2021-06-01'} for i in range(rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload payload encoding benchmark')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=10000)
+    args = parser.parse_args()
+
+    data = make_datapoints(args.rows)
+    requests = math.ceil(args.rows / args.batch)
+    print(f"{'encoding':<18}{'bytes/batch':>14}{'ms/batch':>10}")
+    with FakeApi() as api:
+        for name, encoder in ENCODERS.items():
+            api.counters.clear()
+            start = time.perf_counter()
+            utils.batch_upload(data, f'{api.url}/main/datapoint', args.batch, max_in_flight=1, encoder=encoder)
+            elapsed = time.perf_counter() - start
+            assert api.counters['datapoint'] == args.rows
+            print(f"{name:<18}{api.counters['bytes_received'] // requests:>14}{1000 * elapsed / requests:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
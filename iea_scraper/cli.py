@@ -1,8 +1,19 @@
+import pkgutil
+import runpy
+import sys
 from pathlib import Path
 import click
 from iea_scraper.settings import ROOT_PATH
-from subprocess import call
 
+SCRIPTS_PACKAGE = 'iea_scraper.scripts'
+
+
+def get_scripts():
+    """
+    :return: names of the modules of iea_scraper.scripts (without importing them).
+    """
+    iea_scripts_dir = Path(ROOT_PATH) / 'iea_scraper' / 'scripts'
+    return sorted(module.name for module in pkgutil.iter_modules([str(iea_scripts_dir)]))
 
 
 def get_opts(ctx, args, incomplete):
@@ -15,19 +26,25 @@ def get_opts(ctx, args, incomplete):
         been entered yet.
     :return: list of possible choices
     """
-    iea_scripts_dir = Path(ROOT_PATH) / 'iea_scraper' / 'scripts'
-    files = [x.name[:-3] for x in iea_scripts_dir.glob('**/*') if x.is_file()]
-    return [arg for arg in files if arg.startswith(incomplete)]
+    return [arg for arg in get_scripts() if arg.startswith(incomplete)]
 
 
-@click.command()
+@click.command(context_settings={'ignore_unknown_options': True})
 @click.argument('script')
-def cli(script):
-    iea_scripts_dir = Path(ROOT_PATH) / 'iea_scraper' / 'scripts'
-    files = [x.name[:-3] for x in iea_scripts_dir.glob('**/*') if x.is_file()]
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def cli(script, args):
+    """
+    Runs the script iea_scraper.scripts.<script> in the current interpreter, forwarding args.
+    """
+    files = get_scripts()
     if script is None:
         print('Please add argument --script')
     elif script not in files:
         print(f'Script argument must be in {files}')
     else:
-        call(["python", ROOT_PATH / 'iea_scraper' / 'scripts' / (script +'.py') ])
+        argv = sys.argv
+        sys.argv = [script, *args]
+        try:
+            runpy.run_module(f'{SCRIPTS_PACKAGE}.{script}', run_name='__main__', alter_sys=True)
+        finally:
+            sys.argv = argv
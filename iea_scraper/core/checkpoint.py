@@ -0,0 +1,255 @@
+import logging
+import pickle
+import shutil
+import sqlite3
+import uuid
+from contextlib import closing
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+
+from iea_scraper.core.payload import is_columnar
+from iea_scraper.settings import RUN_CHECKPOINT_PATH, RUN_CHECKPOINT_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+# number of items of a generator pickled together in a spill file
+SPILL_CHUNK = 10000
+
+
+class RunCheckpointStore:
+    """
+    Local store (SQLite file) of the progress of job runs: stages completed and upload batches
+    acknowledged by the API, per run id. Data spilled by a run is kept in a folder named after its run id.
+
+    One connection is opened per operation, so the store can be shared by upload threads
+    and by jobs running in separate processes.
+    """
+
+    def __init__(self, path=RUN_CHECKPOINT_PATH):
+        self.path = path
+        with closing(self._connect()) as con, con:
+            con.execute("CREATE TABLE IF NOT EXISTS run ("
+                        "run_id TEXT PRIMARY KEY, job TEXT, started TEXT, finished TEXT)")
+            con.execute("CREATE TABLE IF NOT EXISTS stage (run_id TEXT, stage TEXT, PRIMARY KEY (run_id, stage))")
+            con.execute("CREATE TABLE IF NOT EXISTS batch ("
+                        "run_id TEXT, endpoint TEXT, number INTEGER, PRIMARY KEY (run_id, endpoint, number))")
+
+    def _connect(self):
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def spill_folder(self, run_id):
+        return self.path.parent / run_id
+
+    def start_run(self, job):
+        """
+        Registers a new run of job. The unfinished runs of job cannot be resumed anymore: they are deleted.
+        :return: the run id.
+        """
+        with closing(self._connect()) as con:
+            abandoned = [row[0] for row in con.execute("SELECT run_id FROM run WHERE job = ? AND finished IS NULL",
+                                                       (job,))]
+        for run_id in abandoned:
+            self.delete_run(run_id)
+        run_id = f"{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}"
+        with closing(self._connect()) as con, con:
+            con.execute("INSERT INTO run (run_id, job, started) VALUES (?, ?, ?)",
+                        (run_id, job, datetime.now().isoformat()))
+        return run_id
+
+    def last_unfinished_run(self, job):
+        """
+        :return: the id of the latest run of job that did not finish, None if there is none.
+        """
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT run_id FROM run WHERE job = ? AND finished IS NULL "
+                              "ORDER BY started DESC LIMIT 1", (job,)).fetchone()
+        return None if row is None else row[0]
+
+    def finish_run(self, run_id):
+        """Marks the run as finished and deletes its spilled data and progress."""
+        with closing(self._connect()) as con, con:
+            con.execute("UPDATE run SET finished = ? WHERE run_id = ?", (datetime.now().isoformat(), run_id))
+            con.execute("DELETE FROM stage WHERE run_id = ?", (run_id,))
+            con.execute("DELETE FROM batch WHERE run_id = ?", (run_id,))
+        shutil.rmtree(self.spill_folder(run_id), ignore_errors=True)
+
+    def delete_run(self, run_id):
+        """Deletes a run with its spilled data and progress."""
+        with closing(self._connect()) as con, con:
+            con.execute("DELETE FROM run WHERE run_id = ?", (run_id,))
+            con.execute("DELETE FROM stage WHERE run_id = ?", (run_id,))
+            con.execute("DELETE FROM batch WHERE run_id = ?", (run_id,))
+        shutil.rmtree(self.spill_folder(run_id), ignore_errors=True)
+
+    def prune(self, days=RUN_CHECKPOINT_RETENTION_DAYS):
+        """
+        Deletes the runs started more than days ago, finished or not, with their spilled data.
+        :return: the number of runs deleted.
+        """
+        started = (datetime.now() - timedelta(days=days)).isoformat()
+        with closing(self._connect()) as con:
+            run_ids = [row[0] for row in con.execute("SELECT run_id FROM run WHERE started < ?", (started,))]
+        for run_id in run_ids:
+            self.delete_run(run_id)
+        if run_ids:
+            logger.info(f'{len(run_ids)} run checkpoint(s) older than {days} days deleted')
+        return len(run_ids)
+
+    def completed_stages(self, run_id):
+        with closing(self._connect()) as con:
+            return {row[0] for row in con.execute("SELECT stage FROM stage WHERE run_id = ?", (run_id,))}
+
+    def complete_stage(self, run_id, stage):
+        with closing(self._connect()) as con, con:
+            con.execute("INSERT OR IGNORE INTO stage (run_id, stage) VALUES (?, ?)", (run_id, stage))
+
+    def acknowledged_batches(self, run_id, endpoint):
+        with closing(self._connect()) as con:
+            return {row[0] for row in con.execute("SELECT number FROM batch WHERE run_id = ? AND endpoint = ?",
+                                                  (run_id, endpoint))}
+
+    def acknowledge_batch(self, run_id, endpoint, number):
+        with closing(self._connect()) as con, con:
+            con.execute("INSERT OR IGNORE INTO batch (run_id, endpoint, number) VALUES (?, ?, ?)",
+                        (run_id, endpoint, number))
+
+
+@lru_cache(maxsize=1)
+def get_run_checkpoint_store():
+    """
+    Shared run checkpoint store (created on first use in settings.RUN_CHECKPOINT_PATH),
+    without the runs older than settings.RUN_CHECKPOINT_RETENTION_DAYS.
+    :return: a RunCheckpointStore.
+    """
+    RUN_CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    store = RunCheckpointStore()
+    store.prune()
+    return store
+
+
+class RunCheckpoint:
+    """
+    Progress of one run of a job, to resume it after a failure: completed stages are skipped,
+    the transform output is reloaded from a local spill and the upload continues from the first
+    batch not acknowledged by the API.
+
+    Example:
+        >>> checkpoint = RunCheckpoint.open('iea_scraper.jobs.gov_noaa_ncei.gsod.Job', resume=True)
+        >>> if not checkpoint.done('transform'):
+        ...     job.transform()
+        ...     job.data = checkpoint.spill('data', job.data)
+        ...     checkpoint.complete('transform')
+        ... else:
+        ...     job.data = checkpoint.load('data')
+
+    A checkpoint without store (RunCheckpoint(None)) records nothing.
+    """
+
+    def __init__(self, store, run_id=None):
+        self.store = store
+        self.run_id = run_id
+        self._completed = set() if store is None else store.completed_stages(run_id)
+
+    @classmethod
+    def open(cls, job, resume=False, store=None):
+        """
+        Starts a new run of job, or with resume the latest run of job that did not finish (if any).
+        :param job: the job name.
+        :param resume: if True, continue the latest unfinished run.
+        :param store: a RunCheckpointStore. Defaults to the shared store.
+        :return: a RunCheckpoint.
+        """
+        store = store or get_run_checkpoint_store()
+        run_id = store.last_unfinished_run(job) if resume else None
+        if run_id is None:
+            if resume:
+                logger.warning(f'No unfinished run of {job} to resume (only the runs started with checkpoints '
+                               f'are recorded): starting a new run.')
+            return cls(store, store.start_run(job))
+        checkpoint = cls(store, run_id)
+        logger.info(f'Resuming run {run_id} of {job} (completed stages: {sorted(checkpoint._completed)})')
+        return checkpoint
+
+    @staticmethod
+    def can_resume(job, store=None):
+        """
+        :param job: the job name.
+        :param store: a RunCheckpointStore. Defaults to the shared store.
+        :return: True if job has an unfinished run to resume.
+        """
+        store = store or get_run_checkpoint_store()
+        return store.last_unfinished_run(job) is not None
+
+    def done(self, stage):
+        return stage in self._completed
+
+    def complete(self, stage):
+        if self.store is not None:
+            self.store.complete_stage(self.run_id, stage)
+            self._completed.add(stage)
+
+    def _path(self, name):
+        folder = self.store.spill_folder(self.run_id)
+        folder.mkdir(parents=True, exist_ok=True)
+        return folder / f'{name}.pickle'
+
+    def spill(self, name, obj):
+        """
+        Saves obj in the spill folder of the run.
+        A generator is consumed entirely here, before anything is uploaded: it is written by chunks
+        (so it never has to fit in memory) and replaced by a generator reading it back from disk.
+        :param name: the name of the spilled object.
+        :param obj: a picklable object or a generator.
+        :return: the object to use instead of obj.
+        """
+        if self.store is None:
+            return obj
+        path = self._path(name)
+        streamed = not (obj is None or is_columnar(obj) or isinstance(obj, (list, tuple, dict)))
+        with open(path, 'wb') as f:
+            pickle.dump(streamed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if not streamed:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                iterator = iter(obj)
+                for chunk in iter(lambda: list(islice(iterator, SPILL_CHUNK)), []):
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return self.load(name) if streamed else obj
+
+    def load(self, name):
+        """
+        Reads an object saved by spill().
+        :return: the object, or a generator for a spilled generator.
+        """
+        path = self._path(name)
+        with open(path, 'rb') as f:
+            if not pickle.load(f):
+                return pickle.load(f)
+        return self._read_chunks(path)
+
+    @staticmethod
+    def _read_chunks(path):
+        with open(path, 'rb') as f:
+            pickle.load(f)
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                yield from chunk
+
+    def upload_progress(self, endpoint):
+        """
+        Arguments for batch_upload() skipping the batches already acknowledged for endpoint in this run
+        and recording the new ones.
+        :return: a dictionary of keyword arguments (empty without store).
+        """
+        if self.store is None:
+            return {}
+        return {'skip_batches': self.store.acknowledged_batches(self.run_id, endpoint),
+                'on_batch_done': lambda number: self.store.acknowledge_batch(self.run_id, endpoint, number)}
+
+    def finish(self):
+        if self.store is not None:
+            self.store.finish_run(self.run_id)
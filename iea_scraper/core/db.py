@@ -0,0 +1,54 @@
+import atexit
+import logging
+import threading
+
+from sqlalchemy import create_engine
+
+logger = logging.getLogger(__name__)
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_str, **options):
+    """
+    Gets the shared SQLAlchemy engine for a connection string and engine options,
+    so jobs and scripts reuse the same connection pool (and database logins) within a process.
+    :param db_str: the database connection string (e.g. settings.EXT_DB_STR).
+    :param options: keyword arguments for sqlalchemy.create_engine() (e.g. fast_executemany=True).
+    :return: a sqlalchemy Engine.
+    """
+    key = (db_str, tuple(sorted(options.items())))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            logger.debug(f"Creating engine for {engine_label(db_str)} with options {options}")
+            engine = create_engine(db_str, **options)
+            _engines[key] = engine
+    return engine
+
+
+def dispose_engines(close=True):
+    """
+    Closes the connections of all the shared engines (called at process exit).
+    :param close: False in a process forked from the one which created the engines: their connections
+    belong to the parent process, so they are dropped without being closed.
+    """
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose(close=close)
+    if engines:
+        logger.debug(f"{len(engines)} engine(s) disposed")
+
+
+def engine_label(db_str):
+    """
+    Connection string without credentials, for logging.
+    """
+    scheme, _, rest = db_str.partition('://')
+    return f"{scheme}://{rest.rpartition('@')[2]}"
+
+
+atexit.register(dispose_engines)
@@ -0,0 +1,95 @@
+import logging
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def get_deadline():
+    """
+    Deadline of the current thread, set by the innermost deadline() block.
+    :return: a time.monotonic() value, or None without deadline.
+    """
+    return getattr(_local, 'deadline', None)
+
+
+def remaining_time():
+    """
+    Seconds left before the deadline of the current thread.
+    :return: a float (negative once the deadline has passed), or None without deadline.
+    """
+    deadline_ = get_deadline()
+    return None if deadline_ is None else deadline_ - time.monotonic()
+
+
+def check_deadline():
+    """
+    Raises TimeoutError if the deadline of the current thread has passed.
+    Long loops call it between iterations, HttpClient calls it before each request.
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise TimeoutError(f'deadline exceeded by {-remaining:.1f} seconds')
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Sets a deadline in seconds for the current thread while the block runs.
+    Nested blocks cannot extend the deadline of the outer ones.
+    Threads do not inherit the deadline: pass remaining_time() to the code they run.
+    :param seconds: number of seconds, None for no (additional) deadline.
+    """
+    previous = get_deadline()
+    current = previous
+    if seconds is not None:
+        current = time.monotonic() + seconds
+        if previous is not None:
+            current = min(current, previous)
+    _local.deadline = current
+    try:
+        yield current
+    finally:
+        _local.deadline = previous
+
+
+def _run_child(connection, function, args, kwargs):
+    try:
+        connection.send((True, function(*args, **kwargs)))
+    except BaseException as e:
+        connection.send((False, e))
+    finally:
+        connection.close()
+
+
+def run_in_subprocess(function, *args, timeout=None, **kwargs):
+    """
+    Runs function(*args, **kwargs) in a child process, killed if it takes longer than timeout seconds.
+    The function, its arguments and its result must be picklable, and changes it makes to objects
+    (a job's data for instance) stay in the child process.
+    :param timeout: number of seconds, None to wait until the function ends.
+    :return: the result of the function.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_child, args=(sender, function, args, kwargs), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            logger.warning(f'killing process {process.pid} after {timeout} seconds')
+            process.kill()
+            raise TimeoutError(f'{getattr(function, "__name__", function)} took more than {timeout} seconds')
+        try:
+            success, result = receiver.recv()
+        except EOFError:
+            raise ChildProcessError(f'{getattr(function, "__name__", function)} exited without result') from None
+    finally:
+        process.join()
+        receiver.close()
+    if not success:
+        raise result
+    return result
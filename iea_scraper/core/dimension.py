@@ -1,6 +1,6 @@
-import requests
-
 from iea_scraper.settings import API_END_POINT
+from iea_scraper.core.dimension_cache import get_dimension_cache
+from iea_scraper.core.http_client import get_api_client
 from iea_scraper.core.utils import parallelize
 
 import logging
@@ -35,13 +35,14 @@ class Updater:
 
     def update(self, data):
         a = parallelize(self.update_one, data , 10)
+        get_dimension_cache().invalidate(self.dimension)
         return
 
     def update_one(self, elem):
         endpoint = f"{API_END_POINT}/dimension/{self.dimension}"
-        r = requests.get(f"{endpoint}?code={elem['code']}")
+        r = get_api_client().get(f"{endpoint}?code={elem['code']}")
         _id = r.json()[0]['id']
-        r = requests.put(f"{endpoint}/{_id}", json=elem)
+        r = get_api_client().put(f"{endpoint}/{_id}", json=elem)
         if r.status_code >= 300:
             logger.error(f"Issue for insertion of element {elem} \n {r.text}")
         return None
@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from iea_scraper.settings import DIMENSION_CACHE_PATH, DIMENSION_CACHE_TTL, DIMENSION_MEMORY_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class DimensionCache:
+    """
+    Cache of the External DB API dimension data (see utils.get_dimension_db_data()).
+
+    Every (dimension, query string) is fetched once and kept in memory for memory_ttl seconds (see clear()
+    to drop it sooner, e.g. between the jobs run by a worker process). The dimensions with a time to live
+    are also saved as snapshots (pickle files under path/<dimension>/), which are shared by the job processes
+    of a master script: a dimension such as area or period is fetched once per run of the master script
+    instead of once per job or per batch. Expired snapshots are fetched again.
+
+    Writing to a dimension invalidates it (see invalidate()): its snapshots are deleted, so every process
+    fetches it again on its next read.
+    """
+
+    def __init__(self, path=DIMENSION_CACHE_PATH, ttl=None, memory_ttl=DIMENSION_MEMORY_TTL):
+        """
+        :param path: folder of the snapshots.
+        :param ttl: dictionary {dimension: time to live in seconds} of the dimensions saved as snapshots.
+        Defaults to settings.DIMENSION_CACHE_TTL.
+        :param memory_ttl: time to live in seconds of the data of the other dimensions.
+        """
+        self.path = Path(path)
+        self.ttl = DIMENSION_CACHE_TTL if ttl is None else ttl
+        self.memory_ttl = memory_ttl
+        # {(api, dimension, query string): (fetch time, snapshot modification time, data)}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _snapshot_path(self, api, dimension, query_string):
+        key = hashlib.md5(f'{api}|{query_string}'.encode()).hexdigest()
+        return self.path / dimension / f'{key}.pickle'
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_snapshot(self, path, ttl):
+        try:
+            with open(path, 'rb') as f:
+                fetched, data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return (fetched, data) if time.time() - fetched < ttl else None
+
+    def _write_snapshot(self, path, fetched, data):
+        """Saves a snapshot atomically: the other processes read either no file or a complete one."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((fetched, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f'Cannot save the snapshot {path}: {e}')
+            return None
+        return self._mtime(path)
+
+    def get(self, dimension, query_string, fetch, api=None):
+        """
+        :param dimension: the dimension.
+        :param query_string: the query string of the request (or None).
+        :param fetch: function fetching the data from the API: fetch(dimension, query_string).
+        :param api: the API end point, so that the data of different APIs is not mixed.
+        :return: the data of the dimension.
+        """
+        key = (api, dimension, query_string)
+        ttl = self.ttl.get(dimension)
+        path = self._snapshot_path(api, dimension, query_string) if ttl else None
+        mtime = self._mtime(path) if path else None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            fetched, entry_mtime, data = entry
+            # an invalidated snapshot (deleted by another process) is read again
+            if ttl and entry_mtime == mtime and time.time() - fetched < ttl:
+                return data
+            if not ttl and time.time() - fetched < self.memory_ttl:
+                return data
+
+        snapshot = self._read_snapshot(path, ttl) if mtime is not None else None
+        if snapshot is not None:
+            logger.debug(f'{dimension} dimension ({query_string}) read from the snapshot {path}')
+            fetched, data = snapshot
+        else:
+            fetched, data = time.time(), fetch(dimension, query_string)
+            mtime = self._write_snapshot(path, fetched, data) if path else None
+        with self._lock:
+            self._entries[key] = (fetched, mtime, data)
+        return data
+
+    def clear(self):
+        """
+        Drops the data cached in memory: the next reads use the snapshots (or the API).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, dimension=None):
+        """
+        Drops the cached data and the snapshots of a dimension.
+        :param dimension: the dimension, or None for every dimension.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if dimension is None or key[1] == dimension]:
+                del self._entries[key]
+        folder = self.path if dimension is None else self.path / dimension
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def dimension_of(endpoint):
+    """
+    :param endpoint: an External DB API end point.
+    :return: the dimension of a dimension end point ('.../dimension/<dimension>[/<id>][?...]'), else None.
+    """
+    if '/dimension/' not in endpoint:
+        return None
+    return endpoint.split('/dimension/', 1)[1].split('?')[0].split('/')[0] or None
+
+
+@lru_cache(maxsize=1)
+def get_dimension_cache():
+    return DimensionCache()
@@ -0,0 +1,137 @@
+from collections import namedtuple
+
+import pandas as pd
+
+from iea_scraper.core.exceptions import EdcJobError
+
+Violation = namedtuple('Violation', ['rule', 'column', 'metric', 'values', 'message'])
+
+FlowRule = namedtuple('FlowRule', ['allow_all', 'allowed', 'nan_allowed'])
+
+
+def _is_nan(value):
+    return isinstance(value, float) and value != value
+
+
+class CheckReport:
+    """
+    Result of EdcRules.check(): the list of all the violations found in a dataframe.
+    """
+
+    def __init__(self, violations=None):
+        self.violations = violations or []
+
+    def __bool__(self):
+        """True when the dataframe passed all checks."""
+        return not self.violations
+
+    def __len__(self):
+        return len(self.violations)
+
+    def __iter__(self):
+        return iter(self.violations)
+
+    def __repr__(self):
+        return f"CheckReport({len(self.violations)} violation(s))"
+
+    def to_frame(self):
+        return pd.DataFrame(self.violations, columns=Violation._fields)
+
+    def raise_if_errors(self):
+        """
+        Raises an EdcJobError listing every violation (the first one comes first in the message).
+        """
+        if self.violations:
+            raise EdcJobError('\n'.join(violation.message for violation in self.violations))
+
+
+class EdcRules:
+    """
+    The EDC checks of a configuration (see edc_config/*.yml and utils.load_config()),
+    compiled into sets so that a dataframe is checked with one pass over its distinct values.
+    """
+
+    def __init__(self, tolerated_columns, mandatory_columns, tolerated_metrics, tolerated_flows):
+        self.tolerated_columns = list(tolerated_columns)
+        self._tolerated_columns = set(tolerated_columns)
+        self.mandatory_columns = list(mandatory_columns)
+        self.tolerated_metrics = list(tolerated_metrics)
+        self._tolerated_metrics = set(tolerated_metrics)
+        self.tolerated_flows = tolerated_flows
+        self.flow_rules = {flow: {metric: self._compile_flow_rule(values) for metric, values in rules.items()}
+                           for flow, rules in tolerated_flows.items()}
+
+    @classmethod
+    def from_job(cls, job):
+        return cls(job.tolerated_columns, job.mandatory_columns, job.tolerated_metrics, job.tolerated_flows)
+
+    @staticmethod
+    def _compile_flow_rule(values):
+        return FlowRule(allow_all='ALL' in values,
+                        allowed=frozenset(value for value in values if not _is_nan(value)),
+                        nan_allowed=any(_is_nan(value) for value in values))
+
+    def check(self, df_dw):
+        """
+        Checks df_dw against the rules:
+            - not empty
+            - not tolerated columns
+            - mandatory columns that were not used
+            - not tolerated metrics
+            - not tolerated flows (and products) depending on metric
+            - mandatory flows per metric
+            - no null product
+        :param df_dw: the dataframe to check.
+        :return: a CheckReport.
+        """
+        if df_dw.empty:
+            return CheckReport([Violation('empty', None, None, [], 'Output DataFrame is empty')])
+        violations = []
+        not_tolerated_columns = [col for col in df_dw.columns if col not in self._tolerated_columns]
+        if not_tolerated_columns:
+            violations.append(Violation('tolerated_columns', None, None, not_tolerated_columns,
+                                        f"[{str(not_tolerated_columns)}] not tolerated as a column name(s). "
+                                        f"Accepted columns are [{str(self.tolerated_columns)}]"))
+        lost_mandatory_columns = [col for col in self.mandatory_columns if col not in df_dw.columns]
+        if lost_mandatory_columns:
+            violations.append(Violation('mandatory_columns', None, None, lost_mandatory_columns,
+                                        f"[{str(lost_mandatory_columns)}] is/are mandatory in df_dw"))
+        if 'Metric' not in df_dw.columns:
+            return CheckReport(violations)
+
+        # the only pass over the rows: distinct combinations of metric and flows
+        flow_columns = [flow for flow in self.flow_rules if flow in df_dw.columns]
+        combinations = df_dw.groupby(['Metric'] + flow_columns, dropna=False, sort=False).size().reset_index()
+        metrics = list(combinations['Metric'].unique())
+        not_tolerated_metrics = [metric for metric in metrics if metric not in self._tolerated_metrics]
+        if not_tolerated_metrics:
+            violations.append(Violation('tolerated_metrics', 'Metric', None, not_tolerated_metrics,
+                                        f"{str(not_tolerated_metrics)} not tolerated as metric(s). "
+                                        f"Accepted metrics are {str(self.tolerated_metrics)}"))
+
+        for metric in metrics:
+            if metric in not_tolerated_metrics:
+                continue
+            for flow, rules in self.flow_rules.items():
+                rule = rules.get(metric)
+                if rule is None:
+                    violations.append(Violation('missing_rule', flow, metric, [],
+                                                f"No rule for {flow} and metric {metric} in the configuration"))
+                elif flow in df_dw.columns:
+                    if rule.allow_all:
+                        continue
+                    values = combinations.loc[combinations['Metric'] == metric, flow].unique()
+                    not_tolerated_flows = [value for value in values if not pd.isnull(value)
+                                           and value != 'nan' and value not in rule.allowed]
+                    if not_tolerated_flows:
+                        violations.append(Violation('tolerated_flows', flow, metric, not_tolerated_flows,
+                                                    f"{not_tolerated_flows} not tolerated as {flow}. "
+                                                    f"Accepted {flow} for metric {metric} are "
+                                                    f"{self.tolerated_flows[flow][metric]}"))
+                elif not rule.nan_allowed:
+                    violations.append(Violation('mandatory_flows', flow, metric, [],
+                                                f"[{flow}] is mandatory in df_dw for {metric}"))
+
+        if 'Product' in df_dw.columns and df_dw['Product'].isnull().any():
+            violations.append(Violation('null_product', 'Product', None, [], "Product cannot be NULL"))
+        return CheckReport(violations)
@@ -1,5 +1,6 @@
 import logging
 import importlib
+from . import registry
 from .job import BaseJob
 
 BASE_PACKAGE = 'iea_scraper.jobs'
@@ -16,7 +17,8 @@ def get_scraper_job(provider_code: str,
     This method instantiates the corresponding scraper job for a given provider and source.
 
     It loads a module 'scraper.jobs.<provider_code>.<source_code>' and instantiate a class with
-    <job_prefix>Job(<full_load>).
+    <job_prefix>Job(<full_load>). Without job_prefix, the class is the one of the job in the registry
+    (see core.registry).
 
     Examples (for job scraper.jobs.br_gov_anp.job.BrazilOilProd):
     factory.get_scraper_job('br_gov_anp', 'job', job_prefix = 'BrazilOilProd')
@@ -28,24 +30,28 @@ def get_scraper_job(provider_code: str,
     :param provider_code: provider code, it should corresponds to an existing python package in scraper.jobs.
     :param source_code: source code, it should corresponds to a python module in scraper.jobs.<provider_code>.
     :param job_prefix: (optional) a prefix to compose to the name of the scraper's job class.
-    If not present, the class is assumed to be called Job.
+    If not present, the class is taken from the job registry, else assumed to be called <SourceCode>Job.
     :param **kwargs: Forward following parameters to class constructor.
     :return: An instance of the corresponding table checker class.
     """
     module_name: str = None
     class_name: str = None
 
+    # module and class of the job from the registry, without scanning or importing other jobs
+    entry = registry.get_registry().get(f"{provider_code}.{source_code}")
     try:
-        module_name = f"{BASE_PACKAGE}.{provider_code}.{source_code}"
+        module_name = entry['module'] if entry else f"{BASE_PACKAGE}.{provider_code}.{source_code}"
         logger.debug(f'Loading module {module_name}')
         module = importlib.import_module(name=module_name)
 
-        class_prefix = job_prefix
-        if not job_prefix:
-            # calculates a Job class prefix based on source_name
-            # example: 'br_oil_prod' -> 'BrOilProd'
-            class_prefix = source_code.replace('_', ' ').title().replace(' ', '')
-        class_name = f"{class_prefix}Job"
+        if job_prefix:
+            class_name = f"{job_prefix}Job"
+        elif entry:
+            class_name = entry['class']
+        else:
+            # calculates a Job class name based on source_name
+            # example: 'br_oil_prod' -> 'BrOilProdJob'
+            class_name = registry.class_name(source_code)
         logger.debug(f'Getting class {class_name}')
         job_class: BaseJob = getattr(module, class_name)
     except (ImportError, AttributeError) as e:
@@ -0,0 +1,199 @@
+import logging
+import threading
+from contextlib import nullcontext
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from iea_scraper.core import metrics
+from iea_scraper.core.deadline import check_deadline, remaining_time
+from iea_scraper.settings import PROXY_DICT, SSL_CERTIFICATE_PATH, REQUESTS_HEADERS, \
+    HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUS, HTTP_POOL_MAXSIZE, \
+    HTTP_MAX_PER_HOST
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Thread-safe HTTP client keeping one pooled requests.Session per host.
+
+    Every session carries the default proxies, SSL certificate and headers, keeps
+    connections alive between calls and retries failed requests with an exponential
+    backoff. No more than max_per_host requests are sent to the same host at a time:
+    extra threads wait for a free slot. Keyword arguments passed to request() override the session defaults for
+    that call only.
+
+    Example:
+        >>> http = HttpClient()
+        >>> r = http.get('https://api.eia.gov/series/?...')
+    """
+
+    def __init__(self, proxies=PROXY_DICT, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS,
+                 max_retries=HTTP_MAX_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR,
+                 status_forcelist=HTTP_RETRY_STATUS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 max_per_host=HTTP_MAX_PER_HOST):
+        """
+        Constructor.
+        :param proxies: proxies dictionary used by every session. None to rely on environment.
+        :param verify: SSL certificate path (or boolean) used by every session.
+        :param headers: default headers for every session.
+        :param max_retries: number of retries for connection errors and retryable statuses.
+        :param backoff_factor: backoff factor between retries (sleeps factor * 2 ** (retry - 1) seconds).
+        :param status_forcelist: HTTP statuses triggering a retry.
+        :param pool_maxsize: maximum number of connections kept alive per host.
+        :param max_per_host: maximum number of concurrent requests per host (None for no limit).
+        """
+        self.proxies = proxies
+        self.verify = verify
+        self.headers = headers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+        self.pool_maxsize = pool_maxsize
+        self.max_per_host = max_per_host
+        self._sessions = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        retry = Retry(total=self.max_retries,
+                      connect=self.max_retries,
+                      read=self.max_retries,
+                      status=self.max_retries,
+                      backoff_factor=self.backoff_factor,
+                      status_forcelist=self.status_forcelist,
+                      # the last response is returned to the caller, who decides what to do with the status
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=self.pool_maxsize,
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if self.proxies is not None:
+            session.proxies.update(self.proxies)
+        if self.verify is not None:
+            session.verify = self.verify
+        if self.headers:
+            session.headers.update(self.headers)
+        return session
+
+    @staticmethod
+    def _host(url):
+        parts = urlsplit(url)
+        return parts.scheme, parts.netloc
+
+    def session(self, url):
+        """
+        Gets the session dedicated to the host of the given url, creating it if needed.
+        :param url: the url to request.
+        :return: a requests.Session.
+        """
+        key = self._host(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                logger.debug(f'Opening HTTP session for {key[0]}://{key[1]}')
+                session = self._build_session()
+                self._sessions[key] = session
+        return session
+
+    def slots(self, url):
+        """
+        Gets the semaphore limiting the concurrent requests to the host of the given url.
+        :param url: the url to request.
+        :return: a threading.BoundedSemaphore, or a null context manager without limit.
+        """
+        if self.max_per_host is None:
+            return nullcontext()
+        key = self._host(url)
+        with self._lock:
+            slots = self._slots.get(key)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.max_per_host)
+                self._slots[key] = slots
+        return slots
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request through the pooled session of the url's host,
+        waiting for a free slot if max_per_host requests to that host are already running.
+        With stream=True, the slot is released once the response headers are received.
+        The bytes sent and received are added to the HTTP counters of core.metrics.
+        Under a deadline (see core.deadline), the request timeout is capped to the remaining time
+        and TimeoutError is raised once the deadline has passed.
+        :param method: HTTP method.
+        :param url: the url to request.
+        :param kwargs: forwarded to requests.Session.request().
+        :return: a requests.Response.
+        """
+        session = self.session(url)
+        with self.slots(url):
+            check_deadline()
+            remaining = remaining_time()
+            if remaining is not None:
+                timeout = kwargs.get('timeout')
+                if isinstance(timeout, tuple):
+                    kwargs['timeout'] = tuple(remaining if t is None else min(t, remaining) for t in timeout)
+                else:
+                    kwargs['timeout'] = remaining if timeout is None else min(timeout, remaining)
+            try:
+                response = session.request(method, url, **kwargs)
+            except requests.exceptions.Timeout:
+                if remaining is not None:
+                    check_deadline()
+                raise
+        self._count_bytes(response, kwargs.get('stream', False))
+        return response
+
+    @staticmethod
+    def _count_bytes(response, stream):
+        """
+        Adds the bytes of a request and its response to the HTTP counters of core.metrics.
+        The body of a streamed response is counted by utils.stream_to_file() while it is read.
+        Objects other than a requests.Response (e.g. None returned by a mock) are ignored.
+        """
+        body = getattr(getattr(response, 'request', None), 'body', None)
+        if isinstance(body, (bytes, str)):
+            metrics.count('http_bytes_sent', len(body))
+        content = None if stream else getattr(response, 'content', None)
+        if isinstance(content, bytes):
+            metrics.count('http_bytes_received', len(content))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def close(self):
+        """Closes all the sessions (and their connection pools)."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """
+    Shared client for external websites (through IEA proxy with SSL certificate and browser headers).
+    :return: an HttpClient.
+    """
+    return HttpClient()
+
+
+@lru_cache(maxsize=1)
+def get_api_client():
+    """
+    Shared client for IEA External DB API (internal network: no proxy, no custom headers).
+    :return: an HttpClient.
+    """
+    return HttpClient(proxies=None, verify=None, headers=None)
@@ -2,21 +2,30 @@ import collections
 import locale
 import logging
 import os
+import time
 from abc import ABC, ABCMeta, abstractmethod
 from datetime import datetime, timedelta
 from typing import NoReturn
-from copy import copy
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from copy import copy, deepcopy
+from functools import wraps
 
 import numpy as np
 import pandas as pd
-import requests
-from sqlalchemy import create_engine
 
+from iea_scraper.core.checkpoint import RunCheckpoint
+from iea_scraper.core.db import get_engine
+from iea_scraper.core.deadline import remaining_time
+from iea_scraper.core.edc_rules import EdcRules
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.core.utils import batch_upload, parallelize, \
-    calc_checksum_download, get_db_source_dict, timeit, timeout, get_country_iso3, load_config
-from iea_scraper.settings import FILE_STORE_PATH, API_END_POINT, PROXY_DICT, \
-    EDC_TIMEOUT, EXT_DB_STR, SSL_CERTIFICATE_PATH
+from iea_scraper.core.http_client import get_http_client, get_api_client
+from iea_scraper.core.metrics import StageMeter
+from iea_scraper.core.source import BaseSource
+from iea_scraper.core.utils import batch_upload, parallelize, stream_to_file, \
+    calc_checksum_download, get_db_source_index, update_db_sources, timeit, timeout, map_country_iso3, load_config
+from iea_scraper.settings import FILE_STORE_PATH, API_END_POINT, EDC_TIMEOUT, EDC_DATE_WORKERS, EXT_DB_STR, \
+    RUN_CHECKPOINTS
 
 MAX_WORKER = 15
 BATCH_SIZE = 20000
@@ -34,6 +43,9 @@ class BaseJob(ABC):
     (BaseSource.__init__()) before doing anything else to the thread.
     """
     title: str = "BaseJob class (on child class, define class variable title for metadata)."
+    # if True, every run of the job records a checkpoint, else only the runs started with resume
+    # (see open_checkpoint())
+    checkpoints: bool = RUN_CHECKPOINTS
 
     def __init__(self, full_load=None, **kwargs):
         """
@@ -46,6 +58,76 @@ class BaseJob(ABC):
         """
         super().__init__(**kwargs)
         self.full_load = full_load
+        self.stages = {}
+        self.checkpoint = RunCheckpoint(None)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures a stage of the run in self.stages[name] (see core.metrics.StageMeter): wall time ('duration')
+        and CPU time in seconds, HTTP bytes received and sent, and peak RSS of the process.
+        The block can set the number of rows it read ('rows_in') and wrote ('rows') in the yielded dictionary.
+        Example:
+            >>> with self.stage('upsert') as upsert:
+            ...     upsert['rows'] = self.upsert()
+        :param name: the stage name.
+        """
+        stages = self.__dict__.setdefault('stages', {})
+        with StageMeter(stages.setdefault(name, {})) as metrics:
+            yield metrics
+
+    @property
+    def checkpoint_name(self):
+        """
+        Name of the job in the run checkpoint store (same class and load mode).
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}{'[full_load]' if self.full_load else ''}"
+
+    def can_resume(self):
+        """
+        :return: True if a run of this job failed after recording its progress, i.e. open_checkpoint(resume=True)
+        continues it instead of starting a new run.
+        """
+        return RunCheckpoint.can_resume(self.checkpoint_name)
+
+    def open_checkpoint(self, resume=False):
+        """
+        Starts recording the progress of the run in self.checkpoint, to resume it if it fails.
+        Without checkpoints (see settings.RUN_CHECKPOINTS) and resume, nothing is recorded nor spilled.
+        :param resume: if True, continue the latest unfinished run of this job (same class and load mode),
+        and record the progress of this run even without checkpoints.
+        :return: the RunCheckpoint.
+        """
+        if self.checkpoints or resume:
+            self.checkpoint = RunCheckpoint.open(self.checkpoint_name, resume)
+        else:
+            self.checkpoint = RunCheckpoint(None)
+        return self.checkpoint
+
+    def spill(self, *names):
+        """
+        Saves attributes of the job in the checkpoint (see RunCheckpoint.spill()).
+        A generator attribute is consumed entirely (written to disk) before the upload starts.
+        :param names: the attribute names.
+        """
+        for name in names:
+            setattr(self, name, self.checkpoint.spill(name, getattr(self, name)))
+
+    def restore(self, *names):
+        """
+        Reloads attributes of the job saved by spill() in a previous attempt of the run.
+        :param names: the attribute names.
+        """
+        for name in names:
+            setattr(self, name, self.checkpoint.load(name))
+
+    @property
+    def http(self):
+        """
+        Shared HTTP client (pooled keep-alive sessions per host with proxy, SSL certificate,
+        default headers and retries). Use self.http.get(url) instead of requests.get(url).
+        """
+        return get_http_client()
 
     @abstractmethod
     def run(self, download=True):
@@ -56,12 +138,74 @@ class BaseJob(ABC):
         """
 
 
+def _invalidates_df_dw(method):
+    """
+    Decorates an EdcJob method that changes the data behind df_dw: df_dw and df_dw_processed are recomputed
+    on each access while it runs, and the cached values are dropped when it returns.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._mutating = (self.__dict__.get('_mutating') or 0) + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            # reset() may have re-initialised the job in between
+            self._mutating = max((getattr(self, '_mutating', 0) or 0) - 1, 0)
+            self.invalidate_df_dw()
+    wrapper.invalidates_df_dw = True
+    return wrapper
+
+
+def _memoised_df_dw(prop, owner):
+    """
+    Wraps the df_dw property defined by an EdcJob subclass so that it is built once per generation of the data.
+    """
+    @wraps(prop.fget)
+    def getter(self):
+        return self.memoise(f'{owner}.df_dw', lambda: prop.fget(self))
+    return property(getter, prop.fset, prop.fdel, prop.__doc__)
+
+
 class EdcJob(BaseJob):
     """
     The EDC scraper job is meant to send data to the datawarehouse with an 
     enforced schema that fits EDC's guidelines
+
+    df_dw and df_dw_processed are memoised: they are built once, and built again after an assignment to an
+    attribute of the job, after pre_run() or run_date() (which change the data in place), or after an explicit
+    call to invalidate_df_dw(). Each access returns a copy, so the memoised DataFrames cannot be changed.
     """
     title: str = "EdcJob class (on child class, define class variable title for metadata)."
+    # methods changing the data behind df_dw
+    _invalidating_methods = ('pre_run', 'run_date')
+    # attributes assigned without changing the data behind df_dw
+    _untracked_attributes = frozenset({'_cache', '_computing', '_df_dw_processed', '_edc_rules', '_generation', '_mutating',
+                                       'cache_stats', 'checkpoint', 'driver', 'export_datetime', 'stages'})
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls._invalidating_methods:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, 'invalidates_df_dw', False):
+                setattr(cls, name, _invalidates_df_dw(method))
+        df_dw = cls.__dict__.get('df_dw')
+        if isinstance(df_dw, property) and df_dw.fget is not None:
+            cls.df_dw = _memoised_df_dw(df_dw, cls.__qualname__)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name not in self._untracked_attributes and not self.__dict__.get('_computing'):
+            self.invalidate_df_dw()
+
+    def __copy__(self):
+        """
+        Shallow copy of the job (e.g. to fetch a day in a worker thread) with its own df_dw cache:
+        the values memoised by the copy are never seen by the original job.
+        """
+        job = type(self).__new__(type(self))
+        job.__dict__.update(self.__dict__)
+        job.__dict__.update(_cache={}, _computing=0, cache_stats=collections.Counter())
+        return job
 
     def __init__(self, full_load=None, config='electricity', **kwargs):
         """
@@ -84,6 +228,11 @@ class EdcJob(BaseJob):
             setattr(self, key, val)
             
         self._df_dw_processed = None
+        self._edc_rules = None
+        self._generation = 0
+        self._mutating = 0
+        self._cache = {}
+        self.cache_stats = collections.Counter()
       
     @property
     @abstractmethod
@@ -94,9 +243,46 @@ class EdcJob(BaseJob):
     @property
     def df_dw_processed(self):
         """Final dataframe with modifications to make it fit for DW"""
-        self._df_dw_processed = self.process_df_dw()
+        self._df_dw_processed = self.memoise('df_dw_processed', self.process_df_dw)
         return self._df_dw_processed
 
+    def invalidate_df_dw(self):
+        """
+        Drops the memoised df_dw and df_dw_processed: to be called after changing their data in place
+        outside of pre_run() and run_date().
+        """
+        # reset() sets every attribute to None, _generation included
+        self._generation = (self.__dict__.get('_generation') or 0) + 1
+
+    def memoise(self, key, compute):
+        """
+        Returns the value computed by compute() for key in the current generation of the data,
+        calling compute() only once per generation. A DataFrame is returned as a copy of the memoised one.
+        :param key: the name of the memoised value.
+        :param compute: a function without parameters.
+        """
+        if '_cache' not in self.__dict__ or self._cache is None or self._mutating:
+            # not initialised yet, or data being changed
+            return compute()
+        generation, value = self._cache.get(key, (None, None))
+        if generation == self._generation:
+            self.cache_stats['hit'] += 1
+        else:
+            self.cache_stats['miss'] += 1
+            logger.debug(f'{key}: computing (generation {self._generation})')
+            # attributes assigned while computing (e.g. by df_dw itself) do not invalidate the value
+            self._computing = (self.__dict__.get('_computing') or 0) + 1
+            try:
+                value = compute()
+            finally:
+                self._computing -= 1
+            self._cache[key] = (self._generation, value)
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def log_cache_stats(self):
+        logger.info(f"{type(self).__name__} df_dw cache: {self.cache_stats['hit']} hit(s), "
+                    f"{self.cache_stats['miss']} miss(es)")
+
     def process_df_dw(self, max_limit=1000000, min_limit=-30000):
         """
         Performs some actions on df_dw:
@@ -136,19 +322,16 @@ class EdcJob(BaseJob):
                 df_dw_p[col] = pd.to_datetime(df_dw_p[col])
             except:
                 raise EdcJobError(f"{[col]} has to be a date/datetime")
-        if 'local_datetime' in df_dw_p.columns and not(df_dw_p.loc[~df_dw_p['local_datetime'].isnull()].empty):
-            df_dw_p.loc[~df_dw_p['local_datetime'].isnull(),'local_date'] = df_dw_p.loc[
-                ~df_dw_p['local_datetime'].isnull(),'local_datetime'].apply(lambda x: x.date())
-            df_dw_p['local_datetime'] = df_dw_p['local_datetime'].apply(lambda x: x.replace(tzinfo=None))
-        if 'utc_datetime' in df_dw_p.columns and not(df_dw_p.loc[~df_dw_p['utc_datetime'].isnull()].empty):
-            df_dw_p.loc[~df_dw_p['utc_datetime'].isnull(),'utc_date'] = df_dw_p.loc[
-                ~df_dw_p['utc_datetime'].isnull(),'utc_datetime'].apply(lambda x: x.date())
-            df_dw_p['utc_datetime'] = df_dw_p['utc_datetime'].apply(lambda x: x.replace(tzinfo=None))
+        for datetime_col, date_col in (('local_datetime', 'local_date'), ('utc_datetime', 'utc_date')):
+            if datetime_col in df_dw_p.columns and df_dw_p[datetime_col].notnull().any():
+                not_null = df_dw_p[datetime_col].notnull()
+                df_dw_p.loc[not_null, date_col] = self._to_date(df_dw_p.loc[not_null, datetime_col])
+                df_dw_p[datetime_col] = self._remove_tz(df_dw_p[datetime_col])
         df_dw_p = df_dw_p.drop_duplicates()
         attribute_cols = [col for col in df_dw_p.columns if col != 'Value']
         df_dw_p = df_dw_p.groupby(attribute_cols, dropna=False).sum().reset_index()
         df_dw_p['Export Date'] = self.export_datetime
-        df_dw_p['Country'] = df_dw_p['Country'].apply(get_country_iso3)
+        df_dw_p['Country'] = map_country_iso3(df_dw_p['Country'])
 
         not_tolerated_countries = [col for col in set(df_dw_p['Country'])
                                    if col not in self.tolerated_countries]
@@ -157,6 +340,23 @@ class EdcJob(BaseJob):
                               f"Countries must be ISO3")
         return df_dw_p
 
+    @staticmethod
+    def _to_date(datetimes):
+        """Dates (datetime.date) of a datetime column, in its own timezone."""
+        if pd.api.types.is_datetime64_any_dtype(datetimes):
+            return datetimes.dt.date
+        # mixed timezones: pd.to_datetime() left an object column
+        return datetimes.apply(lambda x: x.date())
+
+    @staticmethod
+    def _remove_tz(datetimes):
+        """Local time of a datetime column, without timezone info."""
+        if isinstance(datetimes.dtype, pd.DatetimeTZDtype):
+            return datetimes.dt.tz_localize(None)
+        if pd.api.types.is_datetime64_dtype(datetimes):
+            return datetimes
+        return datetimes.apply(lambda x: x.replace(tzinfo=None))
+
     @abstractmethod
     def pre_run(self):
         """
@@ -169,12 +369,19 @@ class EdcJob(BaseJob):
         Execute the job.
         :param download: if False, bypass source files download.
         """
-        self.pre_run()
-        self.check_df_dw()
+        with self.stage('scrape'):
+            self.pre_run()
+        with self.stage('check') as check:
+            self.check_df_dw()
+            check['rows_in'] = check['rows'] = len(self.df_dw)
         if db_str is not None:
-            self.to_sql(db_str)
+            with self.stage('load') as load:
+                self.to_sql(db_str)
+                load['rows_in'] = len(self.df_dw)
+                load['rows'] = len(self.df_dw_processed)
         if self.driver is not None:
             self.driver.close()
+        self.log_cache_stats()
 
     @timeit
     def test_run(self, folder=None, historical=None, plot=True):
@@ -195,58 +402,30 @@ class EdcJob(BaseJob):
             self.to_csv(folder)
         else:
             _ = self.df_dw_processed
+        self.log_cache_stats()
 
-    def check_df_dw(self):
-        """
-        Checks include:
-            - not empty
-            - not tolerated columns
-            - mandatory columns that were not used
-            - not tolerated products
-            - not tolerated countries
-            - not tolerated flow 1 depending on metric
-            - not tolerated flow 2 depending on metric
-            - mandatory flows per metric
-        """
-        df_dw = self.df_dw
-        if df_dw.empty:
-            raise EdcJobError('Output DataFrame is empty')
-        not_tolerated_columns = [col for col in df_dw.columns
-                                 if col not in self.tolerated_columns]
-        if not_tolerated_columns:
-            raise EdcJobError(f"[{str(not_tolerated_columns)}] not tolerated as a column name(s). "
-                              f"Accepted columns are [{str(self.tolerated_columns)}]")
-        lost_mandatory_columns = [col for col in self.mandatory_columns
-                                  if col not in df_dw.columns]
-        if lost_mandatory_columns:
-            raise EdcJobError(f"[{str(lost_mandatory_columns)}] is/are "
-                              f"mandatory in df_dw")
-        not_tolerated_metrics = [col for col in set(self.df_dw['Metric'])
-                                 if col not in self.tolerated_metrics]
-        if not_tolerated_metrics:
-            raise EdcJobError(f"{str(not_tolerated_metrics)} not tolerated as metric(s). "
-                              f"Accepted metrics are {str(self.tolerated_metrics)}")
-
-        for metric in set(df_dw['Metric']):
-            for flow in self.tolerated_flows:
-                tolerated_flows = self.tolerated_flows[flow][metric]
-                if flow in df_dw.columns:
-                    df_metric = df_dw.loc[df_dw['Metric'] == metric]
-                    not_tolerated_flows = list(df_metric.loc[~df_metric[flow].isin(tolerated_flows), flow].unique())
-                    not_tolerated_flows = [flow for flow in not_tolerated_flows if str(flow) != 'nan']
-                    if 'ALL' in tolerated_flows:
-                        not_tolerated_flows = []
-                    if not_tolerated_flows:
-                        raise EdcJobError(f"{not_tolerated_flows} not tolerated as {flow}. "
-                                          f"Accepted {flow} for metric {metric} are {tolerated_flows}")
-                else:
-                    if np.nan not in tolerated_flows:
-                        raise EdcJobError(f"[{flow}] is mandatory in df_dw for {metric}")
-        df_no_product = df_dw.loc[df_dw['Product'].isnull()]
-        if not df_no_product.empty:
-            raise EdcJobError(f"Product cannot be NULL")
-
-        logging.info('Dataframe checked')
+    @property
+    def edc_rules(self):
+        """Checks of the job configuration, compiled at first use"""
+        if self._edc_rules is None:
+            self._edc_rules = EdcRules.from_job(self)
+        return self._edc_rules
+
+    def check_df_dw(self, raise_errors=True):
+        """
+        Checks df_dw against the job configuration (see EdcRules.check()).
+        All the violations are collected before raising.
+        :param raise_errors: if True, raises an EdcJobError listing the violations, if any.
+        :return: a CheckReport.
+        """
+        report = self.edc_rules.check(self.df_dw)
+        if raise_errors:
+            report.raise_if_errors()
+        if report:
+            logging.info('Dataframe checked')
+        else:
+            logger.warning(f'df_dw failed {len(report)} check(s)')
+        return report
 
     def to_csv(self, folder):
         '''Sends df_dw in a csv file in folder'''
@@ -255,7 +434,7 @@ class EdcJob(BaseJob):
 
     def to_sql(self, db_str):
         '''Sends the data in the DW'''
-        engine = create_engine(db_str, fast_executemany=True)
+        engine = get_engine(db_str, fast_executemany=True)
         self.df_dw_processed.to_sql(self.table_name,
                                     con=engine,
                                     schema='edc',
@@ -370,8 +549,15 @@ class EdcBulkJob(EdcJob):
     """
     This classes ensures historical data is extracted together with 
     latest available data.
+
+    Subclasses whose run_date() can be split in a download and a merge step implement
+    fetch_date() and merge_date(): pre_run() and bulk_run() then fetch up to max_date_workers
+    days concurrently, and merge them one at a time in the order of the days.
     """
     title: str = "EdcJobBulk class (on child class, define class variable title for metadata)."
+    _invalidating_methods = EdcJob._invalidating_methods + ('merge_date',)
+    # number of days fetched concurrently when fetch_date() is implemented
+    max_date_workers: int = EDC_DATE_WORKERS
     def __init__(self, full_load: object = None, **kwargs: object) -> object:
         """
         Constructor.
@@ -426,6 +612,93 @@ class EdcBulkJob(EdcJob):
         """
         self.run_date(tdate)
 
+    def _fetch_date(self, tdate, seconds=EDC_TIMEOUT):
+        """
+        Executes fetch_date with a timeout of seconds in the worker thread running it
+        (see utils.timeout(): its HTTP calls stop at the deadline)
+        """
+        return timeout(seconds)(self.fetch_date)(tdate)
+
+    def fetch_date(self, tdate):
+        """
+        Downloads the data of one day without changing the job state, so that several days
+        can be fetched at the same time (use self.http, which limits the requests per host).
+        Subclasses implementing it also implement merge_date() and run_date(tdate) as
+        self.merge_date(tdate, self.fetch_date(tdate)).
+        :param tdate: datetime
+        :return: the payload given to merge_date().
+        """
+        raise NotImplementedError
+
+    def merge_date(self, tdate, payload):
+        """
+        Adds the payload returned by fetch_date() for one day to the job state.
+        Called from the main thread, in the order of the days.
+        :param tdate: datetime
+        :param payload: the result of fetch_date(tdate).
+        """
+        raise NotImplementedError
+
+    @property
+    def fetches_concurrently(self):
+        return self.max_date_workers > 1 and type(self).fetch_date is not EdcBulkJob.fetch_date
+
+    def run_dates(self, dates):
+        """
+        Runs the given days in order.
+        If fetch_date() is implemented, the next max_date_workers days are fetched in a pool of threads
+        while the current one is merged. Each fetch has EDC_TIMEOUT seconds (or the time left before the
+        deadline of the calling thread) from its submission: the worker thread stops at the same deadline as
+        the wait for its result. Closing the generator cancels the fetches not started yet.
+        :param dates: an iterable of datetimes (consumed lazily).
+        :return: a generator of (tdate, error) in the order of dates, error being None if the day worked.
+        """
+        if not self.fetches_concurrently:
+            for tdate in dates:
+                error = None
+                try:
+                    self._run_date(tdate)
+                except Exception as e:
+                    error = e
+                yield tdate, error
+            return
+
+        dates = iter(dates)
+        in_flight = collections.deque()
+        with ThreadPoolExecutor(self.max_date_workers) as executor:
+            def submit_next():
+                tdate = next(dates, None)
+                if tdate is not None:
+                    remaining = remaining_time()
+                    seconds = EDC_TIMEOUT if remaining is None else max(min(EDC_TIMEOUT, remaining), 0)
+                    in_flight.append((tdate, time.monotonic() + seconds,
+                                      executor.submit(self._fetch_date, tdate, seconds)))
+
+            try:
+                for _ in range(self.max_date_workers):
+                    submit_next()
+                while in_flight:
+                    tdate, expires, future = in_flight.popleft()
+                    submit_next()
+                    error = None
+                    try:
+                        payload = future.result(timeout=max(expires - time.monotonic(), 0))
+                        self.merge_date(tdate, payload)
+                    except Exception as e:
+                        error = e
+                    yield tdate, error
+            finally:
+                for _, _, future in in_flight:
+                    future.cancel()
+
+    @staticmethod
+    def days_back(end_date, start_date):
+        """Generates the days from end_date back to start_date (both included)."""
+        tdate = end_date
+        while tdate >= start_date:
+            yield tdate
+            tdate -= timedelta(days=1)
+
     def bulk_run(self, start_date=None, end_date=None, error_tolerance=7,
                  db_str=None):
         """
@@ -441,16 +714,16 @@ class EdcBulkJob(EdcJob):
         start_date = datetime(1900, 1, 1) if start_date is None else start_date
         end_date = self.last_available_date if end_date is None or end_date > self.last_available_date else end_date
         errors = 0
-        date_to_scrape = end_date
-        while errors <= error_tolerance and date_to_scrape >= start_date:
-            try:
-                self._run_date(date_to_scrape)
-                errors = 0
-                self.earliest_available_date = date_to_scrape
-            except:
-                errors += 1
-                logger.warning(f'{date_to_scrape} did not work')
-            date_to_scrape -= timedelta(days=1)
+        with closing(self.run_dates(self.days_back(end_date, start_date))) as runs:
+            for date_to_scrape, error in runs:
+                if error is None:
+                    errors = 0
+                    self.earliest_available_date = date_to_scrape
+                else:
+                    errors += 1
+                    logger.warning(f'{date_to_scrape} did not work')
+                    if errors > error_tolerance:
+                        break
         self.check_df_dw()
         if db_str is not None:
             self.to_sql(db_str)
@@ -458,14 +731,93 @@ class EdcBulkJob(EdcJob):
             _ = self.df_dw_processed
 
     def bulk_run_by_batches(self, batch_days, start_date=None, end_date=None,
-                            error_tolerance=7, db_str=None):
-        """
-        Same parameters as bulk_run except batch_days that gives the number of days 
-        in each batch loaded into db
-        """
+                            error_tolerance=7, db_str=None, folder=None, file_format='csv',
+                            checkpoint=None):
+        """
+        Same parameters as bulk_run except:
+        :param batch_days: number of days in each batch. Every batch_days days, the data is checked,
+            loaded into db_str and/or written in folder, then dropped (see reset_data()):
+            only one batch is held in memory, whatever the number of days.
+        :param folder: folder where each batch is written (one file per batch). None for no file.
+        :param file_format: 'csv' or 'parquet'.
+        :param checkpoint: path of a file where the earliest committed day is saved after each batch.
+            If the file exists, the run resumes from the day before. None for no checkpoint.
+            The checkpoint only moves once the batch is committed, and never past a day which could not
+            be scraped: the next run tries that day again.
+        """
+        if file_format not in ('csv', 'parquet'):
+            raise EdcJobError(f"file_format must be 'csv' or 'parquet', not {file_format}")
+        start_date = datetime(1900, 1, 1) if start_date is None else start_date
+        end_date = self.last_available_date if end_date is None or end_date > self.last_available_date else end_date
+        if checkpoint is not None and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                committed = datetime.fromisoformat(f.read().strip())
+            logger.info(f'{self.name}: resuming before {committed.date()} (checkpoint {checkpoint})')
+            end_date = min(end_date, committed - timedelta(days=1))
 
-        # not possible at the moment, missing reset df_dw
-        pass
+        state = self.save_data_state()
+        errors = 0
+        batch_dates = []
+        batch_failed = []
+        batch_scraped = False
+        # False once a day could not be scraped: the checkpoint stays after it
+        checkpoint_moves = checkpoint is not None
+
+        def end_batch():
+            nonlocal checkpoint_moves
+            first_date, last_date = batch_dates[-1], batch_dates[0]
+            if batch_scraped:
+                self.commit_batch(first_date, last_date, db_str, folder, file_format)
+                self.reset_data(state)
+            else:
+                logger.warning(f'{self.name}: no data between {first_date.date()} and {last_date.date()}')
+            if not checkpoint_moves:
+                return
+            committed = first_date
+            if batch_failed:
+                checkpoint_moves = False
+                committed = max(batch_failed) + timedelta(days=1)
+                if committed > last_date:
+                    return
+            with open(checkpoint, 'w') as f:
+                f.write(committed.isoformat())
+
+        with closing(self.run_dates(self.days_back(end_date, start_date))) as runs:
+            for date_to_scrape, error in runs:
+                batch_dates.append(date_to_scrape)
+                if error is None:
+                    errors = 0
+                    batch_scraped = True
+                    self.earliest_available_date = date_to_scrape
+                else:
+                    errors += 1
+                    batch_failed.append(date_to_scrape)
+                    logger.warning(f'{date_to_scrape} did not work')
+                    if errors > error_tolerance:
+                        break
+                if len(batch_dates) == batch_days:
+                    end_batch()
+                    batch_dates, batch_failed, batch_scraped = [], [], False
+        if batch_dates:
+            end_batch()
+
+    def commit_batch(self, first_date, last_date, db_str=None, folder=None, file_format='csv'):
+        """
+        Checks the data scraped for the days between first_date and last_date,
+        then loads it into db_str and/or writes it in folder.
+        """
+        self.check_df_dw()
+        if db_str is not None:
+            self.to_sql(db_str)
+        if folder is not None:
+            file_name = os.path.join(folder, f'{self.name}_{first_date:%Y_%m_%d}_{last_date:%Y_%m_%d}.{file_format}')
+            if file_format == 'parquet':
+                self.df_dw_processed.to_parquet(file_name, index=False)
+            else:
+                self.df_dw_processed.to_csv(file_name, index=False)
+        if db_str is None and folder is None:
+            _ = self.df_dw_processed
+        logger.info(f'{self.name}: batch between {first_date.date()} and {last_date.date()} committed')
 
     def pre_run(self, historical=True, max_errors=21):
         """
@@ -478,20 +830,21 @@ class EdcBulkJob(EdcJob):
         """
         if historical:
             count_errors = 0
-            for day in self.day_lags:
-                try:
-                    self._run_date(self.export_date - timedelta(days=day))
-                except Exception as e:
-                    logger.warning(f'{self.export_date - timedelta(days=day)} could not be scraped')
-                    logger.exception(e)
-                    last_error = e
+            for tdate, error in self.run_dates(self.export_date - timedelta(days=day) for day in self.day_lags):
+                if error is not None:
+                    logger.warning(f'{tdate} could not be scraped')
+                    logger.error(error, exc_info=error)
+                    last_error = error
                     count_errors += 1
             logger.info(f'{count_errors} days could not be scraped')
             if count_errors >= max_errors:
                 raise EdcJobError(f'{self.name} did not work. Last error {last_error}')
         else:
-            self._run_date(self.export_date - timedelta(days=self.offset_now))
-            self._run_date(self.export_date - timedelta(days=self.offset_now + 1))
+            days = [self.offset_now, self.offset_now + 1]
+            with closing(self.run_dates(self.export_date - timedelta(days=day) for day in days)) as runs:
+                for _, error in runs:
+                    if error is not None:
+                        raise error
 
     @timeit
     def test_run(self, folder=None, historical=False, **kwargs):
@@ -502,6 +855,34 @@ class EdcBulkJob(EdcJob):
             setattr(self, attribute, None)
         self.__init__()
 
+    # attributes kept by reset_data(): progress of the run and df_dw cache bookkeeping
+    _run_attributes = ('earliest_available_date', '_generation', '_mutating', '_cache', 'cache_stats')
+
+    def save_data_state(self):
+        """
+        Copies the job attributes before any day is run, for reset_data().
+        Attributes that cannot be copied (drivers, clients...) are left out and never reset.
+        :return: a dictionary of attribute copies.
+        """
+        state = {}
+        for attribute, value in self.__dict__.items():
+            if attribute in self._run_attributes:
+                continue
+            try:
+                state[attribute] = deepcopy(value)
+            except Exception:
+                logger.debug(f'{self.name}: {attribute} cannot be copied, it will not be reset')
+        return state
+
+    def reset_data(self, state):
+        """
+        Drops the data accumulated by run_date() by restoring the attributes saved by save_data_state().
+        Subclasses keeping data outside of their attributes override it.
+        :param state: the result of save_data_state().
+        """
+        self.__dict__.update(deepcopy(state))
+        self.invalidate_df_dw()
+
     def run_last_date(self):
         '''Runs the latest date available'''
         self.run_date(self.export_date - timedelta(days=self.offset_now))
@@ -540,20 +921,38 @@ class ExtDbApiJob(BaseJob):
         self.data = None
         self.sources = []
         self.source_complements = []
+        self._db_sources = None
 
-    def run(self, download=True, parallel_download=True):
+    def run(self, download=True, parallel_download=True, resume=False):
         """
         Execute the job.
         :param download: if False, bypass source files download.
         :param parallel_download: if False, download source files sequentially.
+        :param resume: if True, resume the latest failed run: the stages it completed are skipped,
+        the transform output is reloaded from its spill and the upload restarts from the first batch
+        not acknowledged by the API.
         """
-        self.get_sources()
-        self.download_and_get_checksum(download, parallel_download)
-        self.rm_sources_up_to_date()
-        self.transform()
-        self.insert_new_dynamic_dim()
-        self.upsert()
-        self.update_sources_metadata()
+        checkpoint = self.open_checkpoint(resume)
+        if checkpoint.done('transform'):
+            self.restore('sources', 'dynamic_dim', 'data')
+        else:
+            with self.stage('download'):
+                self.get_sources()
+                self.download_and_get_checksum(download, parallel_download)
+                self.rm_sources_up_to_date()
+            with self.stage('transform'):
+                self.transform()
+                self.spill('sources', 'dynamic_dim', 'data')
+            checkpoint.complete('transform')
+        if not checkpoint.done('dynamic_dim'):
+            with self.stage('dynamic_dim') as dynamic_dim:
+                dynamic_dim['rows'] = self.insert_new_dynamic_dim()
+            checkpoint.complete('dynamic_dim')
+        with self.stage('upsert') as upsert:
+            upsert['rows'] = self.upsert()
+        with self.stage('update_sources'):
+            self.update_sources_metadata()
+        checkpoint.finish()
 
     @abstractmethod
     def get_sources(self):
@@ -572,13 +971,16 @@ class ExtDbApiJob(BaseJob):
                 'entity': [{'code': 'code1', 'category': 'category1', ...},
                            {'code': 'code2', ... }, ...],
                 ...}
-        *  In self.data the data to be uploaded to upserted with the API
+        *  In self.data the data to be uploaded to upserted with the API: a list (or generator) of dictionaries,
+           or a DataFrame / Arrow table (or a list or generator of them), serialised by chunks without
+           converting them to dictionaries
         """
 
     @timeit
     def download_and_get_checksum(self, download=True, parallel_download=True):
         """
-        This function downloads all files listed in self.sources.
+        This function downloads all files listed in self.sources and calculates the checksum
+        of the sources that were not checksummed during download.
 
         :param download: Flag determining whether the file should be downloaded or not. Default is True.
         :param parallel_download: Flag determining whether download should occur in parallel. Default is True.
@@ -592,55 +994,77 @@ class ExtDbApiJob(BaseJob):
             else:
                 for f in file_for_download:
                     self.download_source(f)
-        parallelize(calc_checksum_download, self.sources, MAX_WORKER)
+        # sources streamed by download_source() already have their checksum
+        sources_to_check = [source for source in self.sources if getattr(source, 'checksum', None) is None]
+        parallelize(calc_checksum_download, sources_to_check, MAX_WORKER)
+
+    def get_db_sources(self, refresh=False):
+        """
+        Index of the dimension.source rows of the job sources by code, fetched from the API once per job run.
+        :param refresh: if True, fetch the rows again (e.g. after inserting new sources).
+        :return: a dictionary {source code: source meta-data}.
+        """
+        if refresh or self._db_sources is None:
+            self._db_sources = get_db_source_index([source.code for source in self.sources], MAX_WORKER)
+            logger.debug(f"{len(self._db_sources)} sources read from dimension.source")
+        return self._db_sources
 
     @timeit
     def rm_sources_up_to_date(self):
+        db_sources = self.get_db_sources()
         for source in reversed(self.sources):
             logger.debug(f"rm_sources_up_to_date: processing {source.code}")
-            try:
-                db_source = get_db_source_dict(source.code)
-                if 'checksum' in db_source and type(db_source['checksum']) == str \
-                        and db_source['checksum'].strip() == source.checksum:
-                    logger.debug(f"rm_sources_up_to_date: removing {source.code} from self.sources")
-                    self.sources.remove(source)
-            except ValueError as e:
+            db_source = db_sources.get(source.code)
+            if db_source is None:
                 logger.debug(f"Source code {source.code} not found in dimension.source: it's a new source.")
+            elif 'checksum' in db_source and type(db_source['checksum']) == str \
+                    and db_source['checksum'].strip() == source.checksum:
+                logger.debug(f"rm_sources_up_to_date: removing {source.code} from self.sources")
+                self.sources.remove(source)
 
     @timeit
     def insert_new_dynamic_dim(self):
+        """
+        Loads the new elements of the dynamic dimensions (self.dynamic_dim).
+        :return: the number of rows loaded.
+        """
         logger.debug(f"Running insert_new_dynamic_dim(): {len(self.dynamic_dim)} items")
+        rows = 0
         for dimension, data in self.dynamic_dim.items():
             logger.debug(f"Processing {dimension}: size {len(data)}")
             if len(data) > 0:
                 logger.debug(f"{dimension}: loading {len(data)} rows")
                 endpoint = f"{API_END_POINT}/dimension/{dimension}"
-                batch_upload(data, endpoint, BATCH_SIZE_DIM)
-        return None
+                rows += batch_upload(data, endpoint, BATCH_SIZE_DIM)
+        return rows
 
     @timeit
     def upsert(self):
         endpoint = f"{API_END_POINT}/main/datapoint"
         if self.data is not None:
-            batch_upload(self.data, endpoint, BATCH_SIZE)
+            return batch_upload(self.data, endpoint, BATCH_SIZE, **self.checkpoint.upload_progress(endpoint))
         return None
 
     @timeit
     def update_sources_metadata(self):
-        endpoint = f"{API_END_POINT}/dimension/source"
-        r = None
+        db_sources = self.get_db_sources()
+        if any(source.code not in db_sources for source in self.sources):
+            # sources inserted during this run
+            db_sources = self.get_db_sources(refresh=True)
+        last_update = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        updates = []
         for source in self.sources:
-            _id = get_db_source_dict(source.code)['id']
-            data = {}
-            data["last_update"] = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
-            data["checksum"] = source.checksum
+            if source.code not in db_sources:
+                raise ValueError(f"No code: {source.code} in source!")
+            data = {"id": db_sources[source.code]['id'],
+                    "last_update": last_update,
+                    "checksum": source.checksum}
             try:
                 data["last_download"] = source.last_download
-            except Exception as e:
+            except AttributeError:
                 logger.warning(f"Attribute source.last_download not available. Running with download=False?")
-
-            r = requests.put(f"{endpoint}/{_id}", json=data)
-        return r
+            updates.append(data)
+        return update_db_sources(updates, MAX_WORKER)
 
     def get_source_from_code(self, code):
         source = [s for s in self.sources if s.code == code]
@@ -652,7 +1076,9 @@ class ExtDbApiJob(BaseJob):
     @staticmethod
     def download_source(source, http_headers=None):
         """
-        Download one given file.
+        Download one given file, streaming it to disk and calculating its checksum on the fly.
+        If the file was downloaded before, the request is conditional (If-None-Match / If-Modified-Since)
+        and a 304 answer keeps the file already in the file store.
         :param source: BaseSource object describing the file to download.
         :param http_headers: optional headers to pass in the request. Default is None.
         Defined as a static method to allow overloading
@@ -662,19 +1088,29 @@ class ExtDbApiJob(BaseJob):
         except AttributeError as e:
             raise AttributeError(f"Missing an essential source attribute: {e}")
 
-        r = requests.get(url,
-                         proxies=PROXY_DICT,
-                         headers=http_headers,
-                         verify=SSL_CERTIFICATE_PATH)
-
-        r.raise_for_status()
-
         file_path = FILE_STORE_PATH / path
-        file_path.write_bytes(r.content)
-        logger.debug(f'{len(r.content)} bytes written to {file_path.name}.')
-
-        # if downloaded and saved successfully, we fill last_download column in table source
-        setattr(source, 'last_download', datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'))
+        conditional_headers = source.conditional_headers() if isinstance(source, BaseSource) else {}
+        if conditional_headers:
+            http_headers = {**(http_headers or {}), **conditional_headers}
+        with get_http_client().get(url, headers=http_headers, stream=True) as r:
+            r.raise_for_status()
+            if r.status_code == 304 and conditional_headers:
+                # not modified since previous download: file in file store is up to date
+                state = source.get_saved_state()
+                logger.debug(f'{source.code} not modified: keeping {file_path.name}.')
+                setattr(source, 'checksum', state['checksum'])
+                setattr(source, 'last_download', state['last_download'])
+                setattr(source, 'not_modified', True)
+                return
+            checksum, size = stream_to_file(r, file_path)
+        logger.debug(f'{size} bytes written to {file_path.name}.')
+
+        # if downloaded and saved successfully, we fill checksum and last_download columns in table source
+        last_download = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        setattr(source, 'checksum', checksum)
+        setattr(source, 'last_download', last_download)
+        if isinstance(source, BaseSource):
+            source.save_validators(r.headers, checksum, size, last_download)
 
     def remove_existing_dynamic_dim(self, dimension, filters=None):
         """
@@ -692,7 +1128,7 @@ class ExtDbApiJob(BaseJob):
             query = query[:-1]
 
         logger.debug(f'remove_existing_dynamic_dim: query - {query}')
-        r = requests.get(query)
+        r = get_api_client().get(query)
         data = r.json()
         codes = [x['code'] for x in data]
         logger.debug(f"self.dynamic_dim['{dimension}'] size before: {len(self.dynamic_dim[dimension])}")
@@ -757,22 +1193,40 @@ class ExtDbApiJobV2(BaseJob):
         self.data = None
         self.sources = []
         self.source_complements = []
+        self._db_sources = None
 
-    def run(self, download=True, parallel_download=True):
+    def run(self, download=True, parallel_download=True, resume=False):
         """
         Execute the job.
         :param download: if False, bypass source files download.
         :param parallel_download: if False, download source files sequentially.
+        :param resume: if True, resume the latest failed run: the stages it completed are skipped,
+        the transform output is reloaded from its spill and the upload restarts from the first batch
+        not acknowledged by the API.
         """
-        self.get_sources()
-        self.download_and_get_checksum(download, parallel_download)
-        self.rm_sources_up_to_date()
-        self.add_sources_to_dynamic_dim()
-        self.transform_provider()
-        self.transform()
-        self.insert_new_dynamic_dim()
-        self.upsert()
-        self.update_sources_metadata()
+        checkpoint = self.open_checkpoint(resume)
+        if checkpoint.done('transform'):
+            self.restore('sources', 'dynamic_dim', 'data')
+        else:
+            with self.stage('download'):
+                self.get_sources()
+                self.download_and_get_checksum(download, parallel_download)
+                self.rm_sources_up_to_date()
+            with self.stage('transform'):
+                self.add_sources_to_dynamic_dim()
+                self.transform_provider()
+                self.transform()
+                self.spill('sources', 'dynamic_dim', 'data')
+            checkpoint.complete('transform')
+        if not checkpoint.done('dynamic_dim'):
+            with self.stage('dynamic_dim') as dynamic_dim:
+                dynamic_dim['rows'] = self.insert_new_dynamic_dim()
+            checkpoint.complete('dynamic_dim')
+        with self.stage('upsert') as upsert:
+            upsert['rows'] = self.upsert()
+        with self.stage('update_sources'):
+            self.update_sources_metadata()
+        checkpoint.finish()
 
     @abstractmethod
     def get_sources(self):
@@ -817,13 +1271,16 @@ class ExtDbApiJobV2(BaseJob):
                 'entity': [{'code': 'code1', 'category': 'category1', ...},
                            {'code': 'code2', ... }, ...],
                 ...}
-        *  In self.data the data to be uploaded to upserted with the API
+        *  In self.data the data to be uploaded to upserted with the API: a list (or generator) of dictionaries,
+           or a DataFrame / Arrow table (or a list or generator of them), serialised by chunks without
+           converting them to dictionaries
         """
 
     @timeit
     def download_and_get_checksum(self, download=True, parallel_download=True):
         """
-        This function downloads all files listed in self.sources.
+        This function downloads all files listed in self.sources and calculates the checksum
+        of the sources that were not checksummed during download.
 
         :param download: Flag determining whether the file should be downloaded or not. Default is True.
         :param parallel_download: Flag determining whether download should occur in parallel. Default is True.
@@ -837,55 +1294,77 @@ class ExtDbApiJobV2(BaseJob):
             else:
                 for f in file_for_download:
                     self.download_source(f)
-        parallelize(calc_checksum_download, self.sources, MAX_WORKER)
+        # sources streamed by download_source() already have their checksum
+        sources_to_check = [source for source in self.sources if getattr(source, 'checksum', None) is None]
+        parallelize(calc_checksum_download, sources_to_check, MAX_WORKER)
+
+    def get_db_sources(self, refresh=False):
+        """
+        Index of the dimension.source rows of the job sources by code, fetched from the API once per job run.
+        :param refresh: if True, fetch the rows again (e.g. after inserting new sources).
+        :return: a dictionary {source code: source meta-data}.
+        """
+        if refresh or self._db_sources is None:
+            self._db_sources = get_db_source_index([source.code for source in self.sources], MAX_WORKER)
+            logger.debug(f"{len(self._db_sources)} sources read from dimension.source")
+        return self._db_sources
 
     @timeit
     def rm_sources_up_to_date(self):
+        db_sources = self.get_db_sources()
         for source in reversed(self.sources):
             logger.debug(f"rm_sources_up_to_date: processing {source.code}")
-            try:
-                db_source = get_db_source_dict(source.code)
-                if 'checksum' in db_source and type(db_source['checksum']) == str \
-                        and db_source['checksum'].strip() == source.checksum:
-                    logger.debug(f"rm_sources_up_to_date: removing {source.code} from self.sources")
-                    self.sources.remove(source)
-            except ValueError as e:
+            db_source = db_sources.get(source.code)
+            if db_source is None:
                 logger.debug(f"Source code {source.code} not found in dimension.source: it's a new source.")
+            elif 'checksum' in db_source and type(db_source['checksum']) == str \
+                    and db_source['checksum'].strip() == source.checksum:
+                logger.debug(f"rm_sources_up_to_date: removing {source.code} from self.sources")
+                self.sources.remove(source)
 
     @timeit
     def insert_new_dynamic_dim(self):
+        """
+        Loads the new elements of the dynamic dimensions (self.dynamic_dim).
+        :return: the number of rows loaded.
+        """
         logger.debug(f"Running insert_new_dynamic_dim(): {len(self.dynamic_dim)} items")
+        rows = 0
         for dimension, data in self.dynamic_dim.items():
             logger.debug(f"Processing {dimension}: size {len(data)}")
             if len(data) > 0:
                 logger.debug(f"{dimension}: loading {len(data)} rows")
                 endpoint = f"{API_END_POINT}/dimension/{dimension}"
-                batch_upload(data, endpoint, BATCH_SIZE_DIM)
-        return None
+                rows += batch_upload(data, endpoint, BATCH_SIZE_DIM)
+        return rows
 
     @timeit
     def upsert(self):
         endpoint = f"{API_END_POINT}/main/datapoint"
         if self.data is not None:
-            batch_upload(self.data, endpoint, BATCH_SIZE)
+            return batch_upload(self.data, endpoint, BATCH_SIZE, **self.checkpoint.upload_progress(endpoint))
         return None
 
     @timeit
     def update_sources_metadata(self):
-        endpoint = f"{API_END_POINT}/dimension/source"
-        r = None
+        db_sources = self.get_db_sources()
+        if any(source.code not in db_sources for source in self.sources):
+            # sources inserted during this run
+            db_sources = self.get_db_sources(refresh=True)
+        last_update = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        updates = []
         for source in self.sources:
-            _id = get_db_source_dict(source.code)['id']
-            data = {}
-            data["last_update"] = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
-            data["checksum"] = source.checksum
+            if source.code not in db_sources:
+                raise ValueError(f"No code: {source.code} in source!")
+            data = {"id": db_sources[source.code]['id'],
+                    "last_update": last_update,
+                    "checksum": source.checksum}
             try:
                 data["last_download"] = source.last_download
-            except Exception:
+            except AttributeError:
                 logger.warning(f"Attribute source.last_download not available. Running with download=False?")
-
-            r = requests.put(f"{endpoint}/{_id}", json=data)
-        return r
+            updates.append(data)
+        return update_db_sources(updates, MAX_WORKER)
 
     def get_source_from_code(self, code):
         source = [s for s in self.sources if s.code == code]
@@ -897,7 +1376,9 @@ class ExtDbApiJobV2(BaseJob):
     @staticmethod
     def download_source(source, http_headers=None):
         """
-        Download one given file.
+        Download one given file, streaming it to disk and calculating its checksum on the fly.
+        If the file was downloaded before, the request is conditional (If-None-Match / If-Modified-Since)
+        and a 304 answer keeps the file already in the file store.
         :param source: BaseSource object describing the file to download.
         :param http_headers: optional headers to pass in the request. Default is None.
         Defined as a static method to allow overloading
@@ -907,19 +1388,29 @@ class ExtDbApiJobV2(BaseJob):
         except AttributeError as e:
             raise AttributeError(f"Missing an essential source attribute: {e}")
 
-        r = requests.get(url,
-                         proxies=PROXY_DICT,
-                         headers=http_headers,
-                         verify=SSL_CERTIFICATE_PATH)
-
-        r.raise_for_status()
-
         file_path = FILE_STORE_PATH / path
-        file_path.write_bytes(r.content)
-        logger.debug(f'{len(r.content)} bytes written to {file_path.name}.')
-
-        # if downloaded and saved successfully, we fill last_download column in table source
-        setattr(source, 'last_download', datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'))
+        conditional_headers = source.conditional_headers() if isinstance(source, BaseSource) else {}
+        if conditional_headers:
+            http_headers = {**(http_headers or {}), **conditional_headers}
+        with get_http_client().get(url, headers=http_headers, stream=True) as r:
+            r.raise_for_status()
+            if r.status_code == 304 and conditional_headers:
+                # not modified since previous download: file in file store is up to date
+                state = source.get_saved_state()
+                logger.debug(f'{source.code} not modified: keeping {file_path.name}.')
+                setattr(source, 'checksum', state['checksum'])
+                setattr(source, 'last_download', state['last_download'])
+                setattr(source, 'not_modified', True)
+                return
+            checksum, size = stream_to_file(r, file_path)
+        logger.debug(f'{size} bytes written to {file_path.name}.')
+
+        # if downloaded and saved successfully, we fill checksum and last_download columns in table source
+        last_download = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        setattr(source, 'checksum', checksum)
+        setattr(source, 'last_download', last_download)
+        if isinstance(source, BaseSource):
+            source.save_validators(r.headers, checksum, size, last_download)
 
     def remove_existing_dynamic_dim(self, dimension, filters=None):
         """
@@ -937,7 +1428,7 @@ class ExtDbApiJobV2(BaseJob):
             query = query[:-1]
 
         logger.debug(f'remove_existing_dynamic_dim: query - {query}')
-        r = requests.get(query)
+        r = get_api_client().get(query)
         data = r.json()
         codes = [x['code'] for x in data]
         logger.debug(f"self.dynamic_dim['{dimension}'] size before: {len(self.dynamic_dim[dimension])}")
@@ -1070,9 +1561,7 @@ class ExtDbApiDedicatedTableJob(ExtDbApiJobV2, metaclass=ABCMeta):
             return
 
         logger.debug(f'Database: {EXT_DB_STR}')
-        engine = create_engine(
-            EXT_DB_STR,
-            fast_executemany=True)
+        engine = get_engine(EXT_DB_STR, fast_executemany=True)
 
         if self.full_load:
             # instead of truncating, send a create schema + to_sql(if_exists='replace')
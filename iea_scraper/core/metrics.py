@@ -0,0 +1,187 @@
+import collections
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+from iea_scraper.settings import METRICS_JSON_PATH, METRICS_TEXTFILE_PATH
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# measures of a stage (see BaseJob.stage()), with their Prometheus name and help
+STAGE_METRICS = {
+    'duration': ('iea_scraper_stage_wall_seconds', 'Wall time of the stage in the last run.'),
+    'cpu': ('iea_scraper_stage_cpu_seconds', 'CPU time of the process (all threads) during the stage.'),
+    'rows_in': ('iea_scraper_stage_rows_in', 'Rows read by the stage.'),
+    'rows': ('iea_scraper_stage_rows_out', 'Rows written or loaded by the stage.'),
+    'http_bytes_received': ('iea_scraper_stage_http_bytes_received', 'HTTP bytes received during the stage.'),
+    'http_bytes_sent': ('iea_scraper_stage_http_bytes_sent', 'HTTP bytes sent during the stage.'),
+    'peak_rss': ('iea_scraper_stage_peak_rss_bytes', 'Peak resident memory of the process at the end of the stage.'),
+}
+
+_counters = collections.Counter()
+_lock = threading.Lock()
+
+
+def count(name, value):
+    """
+    Adds value to a process-wide counter (e.g. count('http_bytes_received', len(content))).
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def counters():
+    """
+    :return: a copy of the process-wide counters.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def peak_rss():
+    """
+    Peak resident memory of the process since it started.
+    :return: a number of bytes, None where it cannot be measured (Windows).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageMeter:
+    """
+    Measures a stage of a job run into a dictionary of metrics: wall time ('duration'), CPU time ('cpu'),
+    HTTP bytes received and sent and peak RSS. The rows read ('rows_in') and written ('rows') are set by the stage.
+    A dictionary measured several times (a stage entered twice) accumulates times and bytes.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        for name in ('duration', 'cpu', 'http_bytes_received', 'http_bytes_sent'):
+            metrics.setdefault(name, 0.0 if name in ('duration', 'cpu') else 0)
+        for name in ('rows_in', 'rows', 'peak_rss'):
+            metrics.setdefault(name, None)
+
+    def __enter__(self):
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+        self._counters = counters()
+        return self.metrics
+
+    def __exit__(self, *exc):
+        metrics = self.metrics
+        metrics['duration'] += time.monotonic() - self._wall
+        metrics['cpu'] += time.process_time() - self._cpu
+        current = counters()
+        for name in ('http_bytes_received', 'http_bytes_sent'):
+            metrics[name] += current.get(name, 0) - self._counters.get(name, 0)
+        peak = peak_rss()
+        if peak is not None:
+            metrics['peak_rss'] = max(peak, metrics['peak_rss'] or 0)
+        return False
+
+
+def summarize(stages):
+    """
+    Compact summary of the stage metrics for a report, e.g. 'download 12s 3.2MB | upsert 4s 20000 rows'.
+    :param stages: dictionary {stage: metrics}.
+    :return: a string, None without stage.
+    """
+    if not stages:
+        return None
+    parts = []
+    for stage, metrics in stages.items():
+        part = f"{stage} {metrics.get('duration', 0):.0f}s"
+        if metrics.get('rows') is not None:
+            part += f" {metrics['rows']} rows"
+        received = metrics.get('http_bytes_received') or 0
+        if received:
+            part += f" {received / 1e6:.1f}MB"
+        parts.append(part)
+    peaks = [metrics['peak_rss'] for metrics in stages.values() if metrics.get('peak_rss')]
+    if peaks:
+        parts.append(f"rss {max(peaks) / 1e6:.0f}MB")
+    return ' | '.join(parts)
+
+
+def write_json_lines(job, started, status, duration, stages, path=METRICS_JSON_PATH):
+    """
+    Appends one JSON line per stage of a run to path.
+    :param job: the job name ('<provider_code>.<source_code>').
+    :param started: start of the run (datetime).
+    :param status: 'OK' or 'ERROR'.
+    :param duration: duration of the run in seconds.
+    :param stages: dictionary {stage: metrics}.
+    :param path: the JSON lines file.
+    """
+    lines = [json.dumps({'job': job, 'started': started.isoformat(), 'status': status,
+                         'run_duration': duration, 'stage': stage, **metrics})
+             for stage, metrics in (stages or {}).items()]
+    if not lines:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_textfile(job, started, status, duration, stages, folder=METRICS_TEXTFILE_PATH):
+    """
+    Writes the metrics of the last run of a job in a Prometheus text file (<folder>/iea_scraper_<job>.prom)
+    for the node-exporter textfile collector. The file is replaced atomically.
+    Arguments as in write_json_lines().
+    """
+    labels = f'job="{_label(job)}"'
+    lines = ['# HELP iea_scraper_run_seconds Duration of the last run.',
+             '# TYPE iea_scraper_run_seconds gauge',
+             f'iea_scraper_run_seconds{{{labels}}} {duration}',
+             '# HELP iea_scraper_run_success 1 if the last run succeeded, else 0.',
+             '# TYPE iea_scraper_run_success gauge',
+             f'iea_scraper_run_success{{{labels}}} {int(status == "OK")}',
+             '# HELP iea_scraper_run_timestamp_seconds Start of the last run.',
+             '# TYPE iea_scraper_run_timestamp_seconds gauge',
+             f'iea_scraper_run_timestamp_seconds{{{labels}}} {started.timestamp()}']
+    for name, (metric, description) in STAGE_METRICS.items():
+        values = [(stage, metrics[name]) for stage, metrics in (stages or {}).items()
+                  if metrics.get(name) is not None]
+        if values:
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} gauge']
+            lines += [f'{metric}{{{labels},stage="{_label(stage)}"}} {value}' for stage, value in values]
+    folder.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_name, folder / f"iea_scraper_{re.sub(r'[^A-Za-z0-9_.-]', '_', job)}.prom")
+
+
+# functions called with (job, started, status, duration, stages) at the end of every run reported by
+# jobs.utils.scrape_and_report(): append to this list to send the metrics elsewhere
+EXPORTERS = [exporter for exporter, enabled in ((write_json_lines, METRICS_JSON_PATH),
+                                                (write_textfile, METRICS_TEXTFILE_PATH)) if enabled is not None]
+
+
+def export(job, started, status, duration, stages):
+    """
+    Sends the metrics of a run to every exporter, logging (but not raising) errors: metrics must never fail a job.
+    Arguments as in write_json_lines().
+    """
+    for exporter in EXPORTERS:
+        try:
+            exporter(job, started, status, duration, stages)
+        except Exception:
+            logger.exception(f"Could not export the metrics of {job} with {exporter.__name__}")
@@ -0,0 +1,210 @@
+import gzip
+import json
+import logging
+import math
+import zlib
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional dependency: falls back to the standard library
+    orjson = None
+
+from iea_scraper.settings import UPLOAD_PAYLOAD_LAYOUT, UPLOAD_PAYLOAD_COMPRESSION
+
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ('records', 'columns')
+COMPRESSIONS = (None, 'gzip', 'deflate')
+
+
+def _to_json_compatible(obj):
+    """
+    Converts what orjson serialises natively (with OPT_SERIALIZE_NUMPY) for the standard json module:
+    numpy scalars and arrays to numbers and lists, NaN and infinite floats to None (null).
+    """
+    if isinstance(obj, dict):
+        return {key: _to_json_compatible(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_json_compatible(value) for value in obj]
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return _to_json_compatible(obj.tolist())
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _default(obj):
+    return obj.isoformat() if hasattr(obj, 'isoformat') else str(obj)
+
+
+def dumps(obj):
+    """
+    Serialises obj to JSON bytes, with orjson when installed.
+    Without orjson, the output is the same: numpy values as numbers, NaN as null, dates in ISO format.
+    :param obj: the object to serialise.
+    :return: bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_to_json_compatible(obj), separators=(',', ':'), default=_default, allow_nan=False).encode()
+
+
+def loads(body):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def to_columns(records):
+    """
+    Converts a list of records into the column-dictionary layout:
+    each column is either a plain list of values, or, when values repeat a lot (dimension codes),
+    a dictionary {'dict': [distinct values], 'codes': [index of the value in dict for each row]}.
+    :param records: a list of dictionaries. A key missing from some records is null in their rows.
+    :return: a dictionary {'format': 'columns', 'length': n, 'columns': {...}}.
+    """
+    columns = {}
+    # union of the keys, in order of first appearance
+    keys = dict.fromkeys(key for record in records for key in record)
+    for key in keys:
+        values = [record.get(key) for record in records]
+        index = {}
+        codes = [index.setdefault(value, len(index)) for value in values] \
+            if all(isinstance(value, str) for value in values) else None
+        if codes is not None and len(index) * 2 <= len(values):
+            columns[key] = {'dict': list(index), 'codes': codes}
+        else:
+            columns[key] = values
+    return {'format': 'columns', 'length': len(records), 'columns': columns}
+
+
+def is_columnar(data):
+    """
+    True for a pandas DataFrame or a pyarrow Table (duck-typed, so pyarrow is only needed by jobs using it).
+    """
+    return isinstance(data, pd.DataFrame) or \
+        (hasattr(data, 'num_rows') and hasattr(data, 'slice') and hasattr(data, 'to_pandas'))
+
+
+def iter_frame_batches(frames, batch):
+    """
+    Cuts DataFrames / Arrow tables into DataFrames of at most batch rows, without building one dictionary per row.
+    Batches do not span two frames.
+    :param frames: an iterable of DataFrames or Arrow tables.
+    :param batch: number of rows per batch.
+    :return: a generator of DataFrames.
+    """
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame):
+            for start in range(0, len(frame), batch):
+                yield frame.iloc[start:start + batch]
+        else:
+            for start in range(0, frame.num_rows, batch):
+                yield frame.slice(start, batch).to_pandas()
+
+
+def frame_to_columns(df):
+    """
+    Same as to_columns() for a DataFrame, computed column by column.
+    """
+    columns = {}
+    for key, series in df.items():
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime('%Y-%m-%dT%H:%M:%S')
+        if series.dtype == object and series.map(type).eq(str).all():
+            codes, uniques = pd.factorize(series)
+            if len(uniques) * 2 <= len(series):
+                columns[key] = {'dict': uniques.tolist(), 'codes': codes.tolist()}
+                continue
+        columns[key] = series.astype(object).where(series.notna(), None).tolist()
+    return {'format': 'columns', 'length': len(df), 'columns': columns}
+
+
+def frame_to_json(df):
+    """
+    Serialises a DataFrame to JSON records (as a list of dictionaries would be), missing values as null.
+    """
+    return df.to_json(orient='records', date_format='iso', double_precision=15).encode()
+
+
+def from_columns(payload):
+    """
+    Converts a column-dictionary payload back into a list of records (inverse of to_columns()).
+    """
+    columns = {}
+    for key, values in payload['columns'].items():
+        if isinstance(values, dict):
+            dictionary = values['dict']
+            values = [dictionary[code] for code in values['codes']]
+        columns[key] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+class PayloadEncoder:
+    """
+    Encodes a batch of records into the body of a POST request to the External DB API.
+
+    - layout: 'records' (list of dictionaries, as json=...) or 'columns' (see to_columns()).
+    - compression: None, 'gzip' or 'deflate' (sent as Content-Encoding).
+    """
+
+    def __init__(self, layout='records', compression=None, compresslevel=6):
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be in {LAYOUTS}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be in {COMPRESSIONS}")
+        self.layout = layout
+        self.compression = compression
+        self.compresslevel = compresslevel
+
+    def encode(self, records):
+        """
+        :param records: a list of dictionaries or a DataFrame.
+        :return: a tuple (body bytes, headers dictionary).
+        """
+        if isinstance(records, pd.DataFrame):
+            body = dumps(frame_to_columns(records)) if self.layout == 'columns' else frame_to_json(records)
+        else:
+            body = dumps(to_columns(records) if self.layout == 'columns' else records)
+        headers = {'Content-Type': 'application/json'}
+        if self.compression == 'gzip':
+            body = gzip.compress(body, compresslevel=self.compresslevel)
+            headers['Content-Encoding'] = 'gzip'
+        elif self.compression == 'deflate':
+            body = zlib.compress(body, self.compresslevel)
+            headers['Content-Encoding'] = 'deflate'
+        return body, headers
+
+    def __repr__(self):
+        return f"PayloadEncoder(layout={self.layout}, compression={self.compression})"
+
+
+def decode(body, headers):
+    """
+    Decodes a request body produced by PayloadEncoder.encode() (or by json=...) into a list of records.
+    :param body: the request body (bytes).
+    :param headers: the request headers (case-sensitive mapping with 'Content-Encoding' if any).
+    :return: a list of dictionaries.
+    """
+    encoding = headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'deflate':
+        body = zlib.decompress(body)
+    payload = loads(body)
+    if isinstance(payload, dict) and payload.get('format') == 'columns':
+        return from_columns(payload)
+    return payload
+
+
+def get_default_encoder():
+    """
+    Encoder configured in settings (UPLOAD_PAYLOAD_LAYOUT, UPLOAD_PAYLOAD_COMPRESSION).
+    :return: a PayloadEncoder, or None with default settings (plain json=... requests).
+    """
+    if UPLOAD_PAYLOAD_LAYOUT == 'records' and UPLOAD_PAYLOAD_COMPRESSION is None:
+        return None
+    return PayloadEncoder(UPLOAD_PAYLOAD_LAYOUT, UPLOAD_PAYLOAD_COMPRESSION)
@@ -0,0 +1,100 @@
+"""
+Reference indexes of the External DB API dimensions, for vectorised code lookups.
+
+A ReferenceIndex maps the values of one or more fields of a dimension (e.g. the ISO3 code of the areas,
+the id of the periods) to the code of the dimension. It is built once per dimension data (see
+get_reference_index()) and maps a whole column at once, each distinct value being looked up only once:
+
+    >>> df['area'] = map_area(df['area'])
+    >>> df['period'] = map_period(df['period'], convert=lambda period: int(period.replace('Q', '')))
+"""
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from iea_scraper.core.utils import get_dimension_db_data
+
+# {(dimension, key): (dimension data, ReferenceIndex)}: an index is built again when the dimension data changes
+_indexes = {}
+
+
+class ReferenceIndex:
+    """
+    Immutable index {key: code} of the rows of a dimension.
+    """
+
+    def __init__(self, rows, key, value='code'):
+        """
+        :param rows: the rows of the dimension (dictionaries).
+        :param key: the field of the rows to index, or a tuple of fields (the first ones win for a value found
+        in several fields). Rows with a missing key are skipped, and the first row wins for duplicated keys.
+        :param value: the field returned for a key.
+        """
+        mapping = {}
+        for field in (key,) if isinstance(key, str) else key:
+            for row in rows:
+                k = row.get(field)
+                if k is not None and k == k:
+                    mapping.setdefault(k, row.get(value))
+        self.mapping = MappingProxyType(mapping)
+        self._index = pd.Index(list(mapping), tupleize_cols=False)
+        # codes of the index positions, None for the values not found (position -1)
+        self._codes = np.array([*mapping.values(), None], dtype=object)
+        self._codes.flags.writeable = False
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def get(self, key, default=None):
+        return self.mapping.get(key, default)
+
+    def map(self, values, convert=None):
+        """
+        :param values: a pandas Series (possibly categorical), array or list of keys.
+        :param convert: optional function converting a value to its key (e.g. '2020Q1' -> 20201),
+        called once per distinct value.
+        :return: a Series of codes (None for missing or unknown keys), with the index of values if it is a Series.
+        """
+        index = values.index if isinstance(values, pd.Series) else None
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            positions, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            positions, uniques = pd.factorize(np.asarray(values, dtype=object) if isinstance(values, list) else values)
+        if convert is not None:
+            uniques = pd.Index([convert(unique) for unique in uniques], tupleize_cols=False)
+        # codes of the distinct values, then None for the missing values (position -1)
+        codes = np.append(self._codes[self._index.get_indexer(uniques)], None)
+        return pd.Series(codes[positions], index=index, dtype=object,
+                         name=values.name if index is not None else None)
+
+
+def get_reference_index(dimension, key, value='code'):
+    """
+    :return: the ReferenceIndex of a dimension, built once per dimension data.
+    """
+    data = get_dimension_db_data(dimension)
+    cached = _indexes.get((dimension, key, value))
+    if cached is None or cached[0] is not data:
+        cached = _indexes[(dimension, key, value)] = (data, ReferenceIndex(data, key, value))
+    return cached[1]
+
+
+def map_area(values, key='iso_alpha_3', convert=None):
+    """
+    :param values: area identifiers (e.g. ISO3 codes).
+    :param key: the field(s) of the area dimension matching values ('iso_alpha_3', 'iso_alpha_2', 'long_name'...).
+    :param convert: optional function converting a value to its key (see ReferenceIndex.map()).
+    :return: a Series of area codes (None for unknown values).
+    """
+    return get_reference_index('area', key).map(values, convert)
+
+
+def map_period(values, key='id', convert=None):
+    """
+    :param values: period identifiers (e.g. the id 20201 for 2020Q1).
+    :param key: the field(s) of the period dimension matching values.
+    :param convert: optional function converting a value to its key (see ReferenceIndex.map()).
+    :return: a Series of period codes (None for unknown values).
+    """
+    return get_reference_index('period', key).map(values, convert)
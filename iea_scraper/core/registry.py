@@ -0,0 +1,244 @@
+"""
+Registry of the scraper jobs, built from the source code of iea_scraper.jobs without importing it.
+
+Every job is keyed '<provider_code>.<source_code>' (its package and module under iea_scraper.jobs) with
+its module, class (<SourceCode>Job, or the only job class of the module), type (Edc, ExtDb, Dedicated or Base),
+title and schedule (the master scripts running it).
+
+The registry is cached in settings.JOB_REGISTRY_PATH and rebuilt when one of the scanned files changes.
+
+Usage: python -m iea_scraper.core.registry (rebuilds the registry and prints its size)
+"""
+import ast
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from iea_scraper.settings import JOB_REGISTRY_PATH
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = Path(__file__).absolute().parent.parent / 'jobs'
+SCRIPTS_PATH = Path(__file__).absolute().parent.parent / 'scripts'
+CORE_PATH = Path(__file__).absolute().parent
+SETTINGS_PATH = Path(__file__).absolute().parent.parent / 'settings.py'
+BASE_PACKAGE = 'iea_scraper.jobs'
+
+# job type of the job classes of core.job, inherited by their subclasses (the most specific one wins)
+JOB_TYPES = {'ExtDbApiDedicatedTableJob': 'Dedicated',
+             'ExtDbApiJob': 'ExtDb',
+             'ExtDbApiJobV2': 'ExtDb',
+             'EdcJob': 'Edc',
+             'BaseJob': 'Base'}
+
+
+def class_name(source_code):
+    """
+    Default job class name of a module, e.g. 'br_oil_prod' -> 'BrOilProdJob'.
+    """
+    return f"{source_code.replace('_', ' ').title().replace(' ', '')}Job"
+
+
+def _python_files(folder):
+    for root, folders, files in os.walk(folder):
+        folders[:] = [f for f in folders if f != '__pycache__']
+        for file in files:
+            if file.endswith('.py'):
+                yield Path(root) / file
+
+
+def fingerprint():
+    """
+    Size and modification time of the job modules, core modules, settings and scripts: the registry is rebuilt when it changes.
+    :return: a string.
+    """
+    stats = []
+    for path in sorted([*_python_files(JOBS_PATH), *SCRIPTS_PATH.glob('*.py'), *CORE_PATH.glob('*.py'), SETTINGS_PATH]):
+        stat = path.stat()
+        stats.append(f'{path.relative_to(JOBS_PATH.parent)}:{stat.st_size}:{stat.st_mtime_ns}')
+    return hashlib.md5('|'.join(stats).encode()).hexdigest()
+
+
+def _parse(path):
+    try:
+        return ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError) as e:
+        logger.warning(f'Cannot parse {path}: {e}')
+        return None
+
+
+def _classes(tree):
+    """
+    :return: dictionary {class name: (base names, title or None)} of the classes defined in a module.
+    """
+    classes = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = [base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', None) for base in node.bases]
+        title = None
+        for statement in node.body:
+            target = statement.target if isinstance(statement, ast.AnnAssign) else \
+                statement.targets[0] if isinstance(statement, ast.Assign) and len(statement.targets) == 1 else None
+            if isinstance(target, ast.Name) and target.id == 'title' and isinstance(statement.value, ast.Constant):
+                title = statement.value.value
+        classes[node.name] = ([base for base in bases if base], title)
+    return classes
+
+
+def _job_keys(node, variables=None):
+    """
+    :param node: an AST node.
+    :param variables: dictionary {name: job keys} of known variables, expanded when unpacked ({**NAME}).
+    :return: the keys of the jobs listed in node ({'provider_code': ..., 'source_code': ...} dictionaries).
+    """
+    keys = []
+    for child in ast.walk(node):
+        if not isinstance(child, ast.Dict):
+            continue
+        items = {key.value: value.value for key, value in zip(child.keys, child.values)
+                 if isinstance(key, ast.Constant) and isinstance(value, ast.Constant)}
+        if 'provider_code' in items and 'source_code' in items:
+            keys.append(f"{items['provider_code']}.{items['source_code']}")
+        for key, value in zip(child.keys, child.values):
+            if key is None and isinstance(value, ast.Name) and variables:
+                keys.extend(variables.get(value.id, []))
+    return keys
+
+
+def _schedules():
+    """
+    Jobs run by each master script: listed in the script, or in a job dictionary of settings it imports
+    (e.g. EDC_HOURLY_JOBS).
+    :return: dictionary {job key: names of the master scripts running the job}.
+    """
+    variables = {}
+    settings_tree = _parse(SETTINGS_PATH)
+    for node in settings_tree.body if settings_tree is not None else []:
+        if isinstance(node, ast.Assign):
+            keys = _job_keys(node.value, variables)
+            for target in node.targets:
+                if isinstance(target, ast.Name) and keys:
+                    variables[target.id] = keys
+    schedules = {}
+    for path in sorted(SCRIPTS_PATH.glob('*master*.py')):
+        tree = _parse(path)
+        if tree is None:
+            continue
+        keys = _job_keys(tree)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module == 'iea_scraper.settings':
+                keys += [key for alias in node.names for key in variables.get(alias.name, [])]
+        for key in keys:
+            if path.stem not in schedules.setdefault(key, []):
+                schedules[key].append(path.stem)
+    return schedules
+
+
+def build_registry():
+    """
+    Scans iea_scraper.jobs (without importing it) for job classes.
+    :return: dictionary {job key: {'module', 'class', 'type', 'title', 'schedule'}}, sorted by key.
+    """
+    modules = {}
+    for path in _python_files(JOBS_PATH):
+        relative = path.relative_to(JOBS_PATH)
+        if len(relative.parts) != 2 or path.stem in ('__init__', 'utils'):
+            continue
+        tree = _parse(path)
+        if tree is not None:
+            modules[f'{relative.parts[0]}.{path.stem}'] = _classes(tree)
+
+    # base job classes of core (job, japan_job...)
+    hierarchy = {}
+    for path in sorted(CORE_PATH.glob('*.py')):
+        tree = _parse(path)
+        if tree is not None:
+            hierarchy.update(_classes(tree))
+    hierarchy.update({name: (bases, title) for classes in modules.values() for name, (bases, title) in classes.items()})
+
+    def resolve(name, seen=()):
+        """:return: (job type, title) of a class, None for a class which is not a job."""
+        if name in JOB_TYPES:
+            return JOB_TYPES[name], None
+        if name not in hierarchy or name in seen:
+            return None
+        bases, title = hierarchy[name]
+        for base in bases:
+            resolved = resolve(base, (*seen, name))
+            if resolved is not None:
+                return resolved[0], title or resolved[1]
+        return None
+
+    schedules = _schedules()
+    registry = {}
+    for key, classes in sorted(modules.items()):
+        jobs = {name: resolve(name) for name in classes}
+        jobs = {name: resolved for name, resolved in jobs.items() if resolved is not None}
+        default = class_name(key.split('.')[1])
+        if default not in jobs:
+            if len(jobs) != 1:
+                continue
+            default = next(iter(jobs))
+        job_type, title = jobs[default]
+        registry[key] = {'module': f'{BASE_PACKAGE}.{key}',
+                         'class': default,
+                         'type': job_type,
+                         'title': title,
+                         'schedule': schedules.get(key, [])}
+    return registry
+
+
+def save_registry(path=JOB_REGISTRY_PATH):
+    """
+    Builds the registry and saves it in path, atomically: concurrent readers see either the former file
+    or the complete new one.
+    :return: the registry.
+    """
+    registry = build_registry()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'fingerprint': fingerprint(), 'jobs': registry}, f, indent=1)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    except OSError as e:
+        logger.warning(f'Cannot save the job registry in {path}: {e}')
+    return registry
+
+
+@lru_cache(maxsize=1)
+def get_registry(path=JOB_REGISTRY_PATH):
+    """
+    Job registry, read from its cache file or rebuilt if a scanned file changed since it was saved.
+    :return: dictionary {job key: {'module', 'class', 'type', 'title', 'schedule'}}.
+    """
+    try:
+        cached = json.loads(path.read_text())
+        if cached['fingerprint'] == fingerprint():
+            return cached['jobs']
+    except (OSError, ValueError, KeyError):
+        pass
+    logger.info('Building the job registry')
+    return save_registry(path)
+
+
+def list_jobs(job_type=None):
+    """
+    :param job_type: if given, only the jobs of this type ('Edc', 'ExtDb', 'Dedicated', 'Base').
+    :return: dictionary {job key: job entry} of the registry.
+    """
+    return {key: job for key, job in get_registry().items() if job_type is None or job['type'] == job_type}
+
+
+if __name__ == "__main__":
+    get_registry.cache_clear()
+    print(f'{len(save_registry())} jobs registered in {JOB_REGISTRY_PATH}')
@@ -0,0 +1,84 @@
+import logging
+import sqlite3
+import statistics
+from contextlib import closing
+from functools import lru_cache
+
+from iea_scraper.settings import RUN_HISTORY_PATH, RUN_HISTORY_WINDOW
+
+logger = logging.getLogger(__name__)
+
+
+class RunHistoryStore:
+    """
+    Local store (SQLite file) of the job runs: status and duration of each run,
+    with the duration and number of rows of each of its stages (see BaseJob.stage()).
+
+    One connection is opened per operation, so the store can be shared by jobs
+    running in separate processes.
+    """
+
+    def __init__(self, path=RUN_HISTORY_PATH):
+        self.path = path
+        with closing(self._connect()) as con, con:
+            con.execute("CREATE TABLE IF NOT EXISTS run ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, job TEXT, started TEXT, status TEXT, duration REAL)")
+            con.execute("CREATE INDEX IF NOT EXISTS run_job ON run (job, id)")
+            con.execute("CREATE TABLE IF NOT EXISTS run_stage ("
+                        "run_id INTEGER, stage TEXT, duration REAL, rows INTEGER, PRIMARY KEY (run_id, stage))")
+
+    def _connect(self):
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def record(self, job, started, status, duration, stages=None):
+        """
+        Saves a run.
+        :param job: the job name ('<provider_code>.<source_code>').
+        :param started: start of the run (datetime).
+        :param status: 'OK' or 'ERROR'.
+        :param duration: duration of the run in seconds.
+        :param stages: dictionary {stage: {'duration': seconds, 'rows': number or None}}.
+        :return: the id of the run.
+        """
+        with closing(self._connect()) as con, con:
+            run_id = con.execute("INSERT INTO run (job, started, status, duration) VALUES (?, ?, ?, ?)",
+                                 (job, started.isoformat(), status, duration)).lastrowid
+            con.executemany("INSERT INTO run_stage (run_id, stage, duration, rows) VALUES (?, ?, ?, ?)",
+                            [(run_id, stage, metrics.get('duration'), metrics.get('rows'))
+                             for stage, metrics in (stages or {}).items()])
+        return run_id
+
+    def last_runs(self, job, n=RUN_HISTORY_WINDOW, status='OK'):
+        """
+        Gets the latest runs of a job.
+        :return: a list of dictionaries (started, status, duration, stages), the latest first.
+        """
+        with closing(self._connect()) as con:
+            runs = con.execute("SELECT id, started, status, duration FROM run WHERE job = ? AND status = ? "
+                               "ORDER BY id DESC LIMIT ?", (job, status, n)).fetchall()
+            stages = con.execute(f"SELECT run_id, stage, duration, rows FROM run_stage "
+                                 f"WHERE run_id IN ({', '.join('?' * len(runs))})",
+                                 [run[0] for run in runs]).fetchall()
+        by_run = {}
+        for run_id, stage, duration, rows in stages:
+            by_run.setdefault(run_id, {})[stage] = {'duration': duration, 'rows': rows}
+        return [{'started': started, 'status': status, 'duration': duration, 'stages': by_run.get(run_id, {})}
+                for run_id, started, status, duration in runs]
+
+    def expected_duration(self, job, n=RUN_HISTORY_WINDOW):
+        """
+        Expected duration of a job: median duration of its latest n successful runs.
+        :return: seconds, None for a job without successful run.
+        """
+        durations = [run['duration'] for run in self.last_runs(job, n)]
+        return statistics.median(durations) if durations else None
+
+
+@lru_cache(maxsize=1)
+def get_run_history_store():
+    """
+    Shared run history store (created on first use in settings.RUN_HISTORY_PATH).
+    :return: a RunHistoryStore.
+    """
+    RUN_HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return RunHistoryStore()
@@ -0,0 +1,137 @@
+import collections
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from logging.handlers import QueueHandler, QueueListener
+
+from iea_scraper.core.db import dispose_engines
+from iea_scraper.settings import SCHEDULER_MAX_WORKERS, SCHEDULER_MAX_PER_PROVIDER
+
+logger = logging.getLogger(__name__)
+
+
+class _ParentLogHandler(logging.Handler):
+    """
+    Handles the records of the worker processes with the logger of the same name in this process.
+    """
+
+    def emit(self, record):
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+
+
+def init_worker(log_queue, level):
+    """
+    Initialises a worker process of schedule(): its log records are sent to log_queue, to be handled by
+    the loggers of the parent process, and the database engines inherited from the parent are dropped.
+    :param log_queue: the multiprocessing queue of the parent QueueListener.
+    :param level: the logging level of the parent process.
+    """
+    dispose_engines(close=False)
+    # every record goes to the queue once: the handlers inherited from the parent are dropped
+    root = logging.getLogger()
+    for named in [root, *root.manager.loggerDict.values()]:
+        if isinstance(named, logging.Logger):
+            for handler in list(named.handlers):
+                named.removeHandler(handler)
+            named.propagate = True
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+def check_order(tasks, after):
+    """
+    Checks that the ordering constraints only name known tasks and contain no cycle.
+    :param tasks: names of the tasks.
+    :param after: dictionary {name: names of the tasks it waits for}.
+    :raise ValueError: on an unknown task or a cycle.
+    """
+    for name, previous in after.items():
+        unknown = [n for n in [name, *previous] if n not in tasks]
+        if unknown:
+            raise ValueError(f'Unknown tasks in ordering constraints: {unknown}')
+    done = set()
+    remaining = list(tasks)
+    while remaining:
+        ready = [name for name in remaining if set(after.get(name, ())) <= done]
+        if not ready:
+            raise ValueError(f'Cycle in ordering constraints between {remaining}')
+        done.update(ready)
+        remaining = [name for name in remaining if name not in done]
+
+
+def schedule(tasks, function, after=None, max_workers=SCHEDULER_MAX_WORKERS,
+             max_per_provider=SCHEDULER_MAX_PER_PROVIDER, executor=None, priority=None):
+    """
+    Runs function(**params) for each task in a pool of processes.
+
+    A task starts once the tasks it waits for have finished (successfully or not), and no more than
+    max_per_provider tasks with the same params['provider_code'] run at a time. When several tasks
+    are ready, they start in the order of priority (for instance the longest first), else of tasks.
+
+    Example:
+        >>> futures = schedule({'a': {'provider_code': 'jp_tepco', 'source_code': '...'}, ...},
+        ...                    scrape_and_report, after={'all_japan': ['a', ...]})
+        >>> report = [future.result() for future in futures.values()]
+
+    :param tasks: dictionary {name: params}. function and params must be picklable.
+    :param function: the function to run.
+    :param after: dictionary {name: names of the tasks it waits for}.
+    :param max_workers: number of worker processes.
+    :param max_per_provider: maximum number of concurrent tasks per provider (None for no limit).
+    :param executor: an existing concurrent.futures executor to use instead of a new process pool.
+        The processes of a new pool log through the handlers of this process (see init_worker()).
+    :param priority: the task names in the order in which they should start.
+    :return: dictionary {name: future} in the order of tasks, every future being done.
+    """
+    after = after or {}
+    check_order(tasks, after)
+    pending = list(tasks) if priority is None else list(priority)
+    if sorted(pending) != sorted(tasks):
+        raise ValueError('priority must list every task once')
+    futures = {}
+    running = {}
+    finished = set()
+    providers = collections.Counter()
+
+    def can_start(name):
+        if not set(after.get(name, ())) <= finished:
+            return False
+        provider = tasks[name].get('provider_code')
+        return max_per_provider is None or providers[provider] < max_per_provider
+
+    listener = None
+    if executor is None:
+        root = logging.getLogger()
+        log_queue = multiprocessing.Queue()
+        listener = QueueListener(log_queue, _ParentLogHandler())
+        listener.start()
+        pool = ProcessPoolExecutor(max_workers, initializer=init_worker,
+                                   initargs=(log_queue, root.getEffectiveLevel()))
+    else:
+        pool = executor
+    try:
+        while pending or running:
+            for name in list(pending):
+                if len(running) >= max_workers:
+                    break
+                if not can_start(name):
+                    continue
+                logger.info(f'Starting {name}')
+                future = pool.submit(function, **tasks[name])
+                futures[name] = future
+                running[future] = name
+                providers[tasks[name].get('provider_code')] += 1
+                pending.remove(name)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                finished.add(name)
+                providers[tasks[name].get('provider_code')] -= 1
+                logger.info(f'{name} finished ({len(pending)} pending, {len(running)} running)')
+    finally:
+        if executor is None:
+            pool.shutdown()
+            listener.stop()
+    return {name: futures[name] for name in tasks}
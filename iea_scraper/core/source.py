@@ -1,4 +1,70 @@
+import logging
 import reprlib
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+
+from iea_scraper.settings import FILE_STORE_PATH, SOURCE_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class SourceStateStore:
+    """
+    Local store (SQLite file) of the HTTP validators sent by the server with each downloaded source:
+    ETag, Last-Modified and Content-Length, together with the checksum of the file written to the file store.
+
+    One connection is opened per operation, so the store can be shared by download threads
+    and by jobs running in separate processes.
+    """
+
+    columns = ('code', 'url', 'etag', 'last_modified', 'content_length', 'checksum', 'last_download')
+
+    def __init__(self, path=SOURCE_STATE_PATH):
+        self.path = path
+        with self._connect() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS source_state ("
+                        "code TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, "
+                        "content_length INTEGER, checksum TEXT, last_download TEXT)")
+
+    def _connect(self):
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def get(self, code):
+        """
+        Gets the state saved for a source.
+        :param code: the source code.
+        :return: a dictionary with the saved state, None if the source was never downloaded.
+        """
+        with closing(self._connect()) as con:
+            row = con.execute(f"SELECT {', '.join(self.columns)} FROM source_state WHERE code = ?",
+                              (code,)).fetchone()
+        return None if row is None else dict(zip(self.columns, row))
+
+    def set(self, code, **state):
+        """
+        Saves (replaces) the state of a source.
+        :param code: the source code.
+        :param state: values for the other columns of the store.
+        """
+        values = [code] + [state.get(col) for col in self.columns[1:]]
+        with closing(self._connect()) as con, con:
+            con.execute(f"INSERT OR REPLACE INTO source_state ({', '.join(self.columns)}) "
+                        f"VALUES ({', '.join('?' * len(self.columns))})", values)
+
+    def delete(self, code):
+        with closing(self._connect()) as con, con:
+            con.execute("DELETE FROM source_state WHERE code = ?", (code,))
+
+
+@lru_cache(maxsize=1)
+def get_source_state_store():
+    """
+    Shared source state store (created on first use in settings.SOURCE_STATE_PATH).
+    :return: a SourceStateStore.
+    """
+    SOURCE_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return SourceStateStore()
 
 
 class BaseSource:
@@ -13,3 +79,65 @@ class BaseSource:
         class_name = type(self).__name__
         string = f"{class_name}(code={self.code}, url={self.url}, path={self.path})"
         return reprlib.repr(string)
+
+    def get_saved_state(self, store=None):
+        """
+        Gets the state saved at the previous download of this source, if it is still valid:
+        same url, and the file in the file store still has the size announced by the server.
+        :param store: a SourceStateStore. Defaults to the shared store.
+        :return: a dictionary with the saved state or None.
+        """
+        if self.code is None or self.path is None:
+            return None
+        store = store or get_source_state_store()
+        state = store.get(self.code)
+        if state is None or state['url'] != self.url or not state['checksum']:
+            return None
+        file_path = FILE_STORE_PATH / self.path
+        if not file_path.is_file():
+            return None
+        if state['content_length'] is not None and file_path.stat().st_size != state['content_length']:
+            return None
+        return state
+
+    def conditional_headers(self, store=None):
+        """
+        Builds the headers for a conditional GET (If-None-Match / If-Modified-Since)
+        from the validators saved at the previous download.
+        :param store: a SourceStateStore. Defaults to the shared store.
+        :return: a dictionary of headers (empty if the source must be downloaded unconditionally).
+        """
+        state = self.get_saved_state(store)
+        headers = {}
+        if state is not None:
+            if state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def save_validators(self, response_headers, checksum, size, last_download, store=None):
+        """
+        Saves the validators sent by the server along with the downloaded file.
+        :param response_headers: headers of the HTTP response.
+        :param checksum: the checksum of the file written to the file store.
+        :param size: the number of bytes written to the file store.
+        :param last_download: the download timestamp.
+        :param store: a SourceStateStore. Defaults to the shared store.
+        """
+        if self.code is None:
+            return
+        store = store or get_source_state_store()
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if etag is None and last_modified is None:
+            # nothing to validate against next time
+            store.delete(self.code)
+            return
+        store.set(self.code,
+                  url=self.url,
+                  etag=etag,
+                  last_modified=last_modified,
+                  content_length=size,
+                  checksum=checksum,
+                  last_download=last_download)
@@ -4,35 +4,64 @@ import re
 
 from iea_scraper.core.utils import get_dimension_db_data
 
+# {dimension: (dimension data, VocabularyMatcher)}: a matcher is compiled again when the dimension data changes
+_matchers = {}
+
+
+def get_matcher(dimension, normalizer):
+    """
+    :return: the VocabularyMatcher of the vocabularies (see get_vocab_list()) of the codes of a dimension.
+    """
+    data = get_dimension_db_data(dimension)
+    cached = _matchers.get(dimension)
+    if cached is None or cached[0] is not data:
+        names = {x['code']: get_vocab_list(x, normalizer) for x in data
+                 if x['code'] != 'None'}
+        cached = _matchers[dimension] = (data, VocabularyMatcher(names))
+    return cached[1]
+
 
 def auto_mapping(mapped_dimension, text):
+    """
+    Maps a text to the dimensions: for each dimension, the last code (in the dimension order)
+    with a vocabulary found in the text.
+    """
     mapping = defaultdict(list)
     norma = Normalizer()
+    text = norma.normalize(text)
     for dimension in mapped_dimension:
-        data = get_dimension_db_data(dimension)
-        names = {x['code']: get_vocab_list(x, norma) for x in data
-                 if x['code'] != 'None'}
-        for code, vocabs in names.items():
-            for vocab in vocabs:
-                if vocab in norma.normalize(text):
-                    mapping[dimension] = code
+        code = get_matcher(dimension, norma).last(text)
+        if code is not None:
+            mapping[dimension] = code
     return mapping
 
 
 def mapping(texts, mapped_dimension):
+    """
+    Maps texts to the dimensions: for each dimension, the code with the earliest vocabulary found in the text
+    (see get_one_mapping()).
+    """
     normalizer = Normalizer()
-    texts = [normalizer.normalize(text) for text in texts]
-
-    maps = {}
-    for dimension in mapped_dimension:
-        data = get_dimension_db_data(dimension)
-        maps[dimension] = {x['code']: get_vocab_list(x, normalizer)
-                           for x in data if x['code'] != 'None'}
-    mappings = [get_one_mapping(text, maps) for text in texts]
+    matchers = {dimension: get_matcher(dimension, normalizer) for dimension in mapped_dimension}
+    mappings = []
+    for text in texts:
+        text = normalizer.normalize(text)
+        mapping = {}
+        for dimension, matcher in matchers.items():
+            code = matcher.earliest(text)
+            if code is not None:
+                mapping[dimension] = code
+        mappings.append(mapping)
     return mappings
 
 
 def get_one_mapping(text, maps):
+    """
+    Reference implementation of the mapping of a text, searching every vocabulary (see VocabularyMatcher).
+    :param text: a normalized text.
+    :param maps: dictionary {dimension: {code: vocabulary list}}.
+    :return: dictionary {dimension: code}.
+    """
     mapping = {}
     for dimension, dim_maps in maps.items():
         first_word = float('inf')
@@ -45,6 +74,114 @@ def get_one_mapping(text, maps):
     return mapping
 
 
+class VocabularyMatcher:
+    """
+    Aho-Corasick automaton over the vocabularies of the codes of a dimension: finds the codes
+    whose vocabulary occurs in a text in a single scan of the text.
+
+    The vocabulary entries are ranked in the order of the codes, then of the vocabulary of each code.
+    earliest() returns the same code as get_one_mapping() (the earliest occurrence, the lowest rank at the
+    same position) and last() the same as the former loop of auto_mapping() (the last code found).
+    """
+
+    def __init__(self, names):
+        """
+        :param names: dictionary {code: vocabulary list}, the vocabularies being normalized.
+        """
+        self.codes = list(names)
+        # trie: transitions, failure link, (length, rank) of the longest entry ending at the node
+        # and highest code index of the entries ending at the node
+        self._goto = [{}]
+        self._fail = [0]
+        self._longest = [None]
+        self._last = [-1]
+        self._empty = None
+        self._max_length = 0
+        rank = 0
+        for index, vocab_list in enumerate(names.values()):
+            for vocab in vocab_list:
+                self._add(vocab, rank, index)
+                rank += 1
+        self._link()
+
+    def _add(self, vocab, rank, index):
+        if not vocab:
+            # an empty entry is found at the start of any text
+            self._empty = min(self._empty or (rank, index), (rank, index))
+            self._last[0] = max(self._last[0], index)
+            return
+        node = 0
+        for char in vocab:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._longest.append(None)
+                self._last.append(-1)
+            node = child
+        if self._longest[node] is None or rank < self._longest[node][1]:
+            self._longest[node] = (len(vocab), rank, index)
+        self._last[node] = max(self._last[node], index)
+        self._max_length = max(self._max_length, len(vocab))
+
+    def _link(self):
+        """Sets the failure links (breadth first) and merges the entries ending at the failure node."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while char not in self._goto[fail] and fail:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                if self._longest[child] is None:
+                    self._longest[child] = self._longest[fail]
+                self._last[child] = max(self._last[child], self._last[fail])
+                queue.append(child)
+
+    def earliest(self, text):
+        """
+        :param text: a normalized text.
+        :return: the code of the earliest vocabulary entry found in text (the first ranked at the same position),
+        or None.
+        """
+        best_start, best_rank, best_index = (0, *self._empty) if self._empty else (len(text), None, None)
+        goto, fail, longest = self._goto, self._fail, self._longest
+        node = 0
+        for position, char in enumerate(text):
+            if position >= best_start + self._max_length:
+                # no entry can start at or before best_start any more
+                break
+            while char not in goto[node] and node:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = longest[node]
+            if found is not None:
+                length, rank, index = found
+                start = position - length + 1
+                if start < best_start or (start == best_start and (best_rank is None or rank < best_rank)):
+                    best_start, best_rank, best_index = start, rank, index
+        return None if best_index is None else self.codes[best_index]
+
+    def last(self, text):
+        """
+        :param text: a normalized text.
+        :return: the last code (in the order of the codes) with a vocabulary entry found in text, or None.
+        """
+        goto, fail, last = self._goto, self._fail, self._last
+        node = 0
+        index = last[0] if self._empty else -1
+        for char in text:
+            while char not in goto[node] and node:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if last[node] > index:
+                index = last[node]
+        return None if index < 0 else self.codes[index]
+
+
 class Normalizer:
     def __init__(self):
         pass
@@ -1,39 +1,66 @@
+import collections
+import copy
 from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
 import functools
 from functools import wraps, lru_cache
 import hashlib
-from itertools import islice
+from itertools import chain, islice
 import logging
 import logging.config
 import requests
-import smtplib
-import time
-import types
 import threading
+import time
 import _thread
 import sys
-import pycountry
+import tempfile
 import os
-import yaml
 import numpy as np
+import pandas as pd
 
 from iea_scraper import settings
+from iea_scraper.core import metrics
+from iea_scraper.core.dimension_cache import get_dimension_cache, dimension_of
+from iea_scraper.core.deadline import deadline, check_deadline, run_in_subprocess
+from iea_scraper.core.http_client import get_api_client
+from iea_scraper.core.payload import PayloadEncoder, get_default_encoder, is_columnar, iter_frame_batches
 from iea_scraper.settings import API_END_POINT, FILE_STORE_PATH, ROOT_PATH, \
-    EDC_TOLERATED_LISTS
+    get_edc_tolerated_lists, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, UPLOAD_MAX_IN_FLIGHT, \
+    SOURCE_BULK_UPDATE, TIMEOUT_INTERRUPT_GRACE
     
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def config_logging(conf):
     logging.config.dictConfig(conf)
 
 
-@functools.lru_cache(maxsize=4)
 def get_dimension_db_data(dimension, query_string=None):
     """
-    Gets dimension data from the API.
+    Gets dimension data from the API, through the dimension cache (see core.dimension_cache):
+    the same data is returned until the dimension expires or is written to.
+    :param dimension: the dimension to get data from.
+    :param query_string: A query string to add at the end of the request
+    :return: a json with the results
+    """
+    return get_dimension_cache().get(dimension, query_string, fetch_dimension_db_data, API_END_POINT)
+
+
+def _clear_dimension_cache():
+    # the snapshots are shared with the other processes: only the data of this process is dropped
+    get_dimension_cache().clear()
+
+
+# same interface as the functools cache this function used to have
+get_dimension_db_data.cache_clear = _clear_dimension_cache
+
+
+def fetch_dimension_db_data(dimension, query_string=None):
+    """
+    Gets dimension data from the API, without cache.
     :param dimension: the dimension to get data from.
     :param query_string: A query string to add at the end of the request
     :return: a json with the results
@@ -41,43 +68,134 @@ def get_dimension_db_data(dimension, query_string=None):
     query = f"{API_END_POINT}/dimension/{dimension}"
     if query_string is not None:
         query += f"?{query_string}"
-    r = requests.get(query)
+    r = get_api_client().get(query)
+    # an error is not cached
+    r.raise_for_status()
     try:
         return r.json()
     except Exception as e:
         raise EnvironmentError(f"Get result: {r.text}, \n url:{r.url} \n \n {e}")
 
 
-def batch_upload(data, api_endpoint, batch):
+def iter_batches(data, batch):
+    """
+    Splits data into successive lists of at most batch items.
+    The data is walked only once, so the cost is linear for lists and generators alike.
+    A DataFrame / Arrow table, or an iterable of them, is cut into DataFrames of at most batch rows instead.
+    :param data: an iterable (list, generator...), a DataFrame or an Arrow table.
+    :param batch: number of items per batch.
+    :return: yields lists of items (or DataFrames).
+    """
+    if is_columnar(data):
+        yield from iter_frame_batches([data], batch)
+        return
+    iterator = iter(data)
+    first = next(iterator, None)
+    if first is None:
+        return
+    iterator = chain([first], iterator)
+    if is_columnar(first):
+        yield from iter_frame_batches(iterator, batch)
+        return
+    while True:
+        batch_data = list(islice(iterator, batch))
+        if not batch_data:
+            return
+        yield batch_data
+
+
+def post_batch(api_endpoint, batch_data, batch_number=None, max_retries=HTTP_MAX_RETRIES,
+               backoff_factor=HTTP_BACKOFF_FACTOR, encoder=None):
+    """
+    Posts one batch of records to the given API endpoint, retrying with exponential backoff
+    on connection errors and server errors (5xx).
+    :param api_endpoint: the target API endpoint.
+    :param batch_data: a list of dictionaries to load.
+    :param batch_number: batch position, for error messages.
+    :param max_retries: number of retries.
+    :param backoff_factor: the n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
+    :param encoder: a payload.PayloadEncoder. If None, the batch is sent as plain JSON (json=batch_data).
+    :return: the number of records sent.
+    """
+    if encoder is None and is_columnar(batch_data):
+        encoder = PayloadEncoder()
+    if encoder is None:
+        request_kwargs = {'json': batch_data}
+    else:
+        body, headers = encoder.encode(batch_data)
+        request_kwargs = {'data': body, 'headers': headers}
+    for attempt in range(max_retries + 1):
+        try:
+            r = get_api_client().post(api_endpoint, **request_kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_retries:
+                raise IOError(f"Issue for batch {batch_number}: {e}") from e
+            logger.warning(f"Batch[{batch_number}]: {e}. Retrying.")
+        else:
+            if r.status_code == 201:
+                logger.debug(f"Sending data to IEA External DB - Batch[{batch_number}]: {len(batch_data)} rows")
+                return len(batch_data)
+            if r.status_code < 500 or attempt == max_retries:
+                raise IOError(f"Issue for batch {batch_number}: \n {r.text}")
+            logger.warning(f"Batch[{batch_number}]: status {r.status_code}. Retrying.")
+        time.sleep(backoff_factor * 2 ** attempt)
+
+
+def batch_upload(data, api_endpoint, batch, max_in_flight=UPLOAD_MAX_IN_FLIGHT, encoder=None,
+                 skip_batches=(), on_batch_done=None):
     """
     Performs a batch load into the given API endpoint.
-    :param data: a array of dictionaries to load (one dictionary per record).
+    Batches are cut while data is consumed and posted by a pool of max_in_flight workers:
+    no more than max_in_flight batches are held in memory or waiting for the API at a time.
+    Errors are reported in batch order: the first failing batch stops the load.
+    Loading into a dimension invalidates its cached data (see core.dimension_cache).
+    :param data: a array (or generator) of dictionaries to load (one dictionary per record),
+                 or a DataFrame / Arrow table (or a list or generator of them).
     :param api_endpoint: the target API endpoint.
     :param batch: number of records per batch.
-    :return: None
+    :param max_in_flight: maximum number of concurrent POST requests (1 for a sequential load).
+    :param encoder: a payload.PayloadEncoder. Defaults to the encoder configured in settings.
+    :param skip_batches: numbers (starting at 1) of the batches not to send, e.g. already loaded by a previous run.
+    :param on_batch_done: function called with the number of each batch accepted by the API, in batch order.
+    :return: the number of records processed by the API.
     """
-    i = 0
+    encoder = encoder or get_default_encoder()
     total_processed_rows = 0
-    while True:
-        if isinstance(data, types.GeneratorType):
-            i = 0
-        batch_data = list(islice(data, i * batch, (i + 1) * batch))
-        if len(batch_data) > 0:
-            i += 1
+    skipped = 0
+    in_flight = collections.deque()
+
+    def collect():
+        nonlocal total_processed_rows
+        i, future = in_flight.popleft()
+        total_processed_rows += future.result()
+        if on_batch_done is not None:
+            on_batch_done(i)
+
+    dimension = dimension_of(api_endpoint)
+    try:
+        with ThreadPoolExecutor(max_in_flight) as executor:
             try:
-                r = requests.post(url=api_endpoint, json=batch_data)
-                batch_rows = len(batch_data)
-                logging.debug(f"Sending data to IEA External DB - Batch[{i}]: {batch_rows} rows")
-                total_processed_rows += batch_rows
-            except ConnectionError:
-                r = requests.post(url=api_endpoint, json=batch_data)
-            if r.status_code != 201:
-                raise IOError(f"Issue for loop {i + 1}: \n {r._content}")
-        else:
-            break
+                for i, batch_data in enumerate(iter_batches(data, batch), start=1):
+                    if i in skip_batches:
+                        skipped += 1
+                        continue
+                    if len(in_flight) >= max_in_flight:
+                        collect()
+                    in_flight.append((i, executor.submit(post_batch, api_endpoint, batch_data, i, encoder=encoder)))
+                while in_flight:
+                    collect()
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+    finally:
+        if dimension is not None:
+            # the cached data of the dimension is outdated
+            get_dimension_cache().invalidate(dimension)
 
-    logging.info(f"{total_processed_rows} items sent to IEA External DB API instance at: {api_endpoint}")
-    return None
+    if skipped:
+        logger.info(f"{skipped} batches already loaded by a previous run were skipped")
+    logger.info(f"{total_processed_rows} items sent to IEA External DB API instance at: {api_endpoint}")
+    return total_processed_rows
 
 
 def parallelize(function, param_list, max_workers=5):
@@ -119,6 +237,8 @@ def send_message(subject: str, message=None, mail_to=settings.MAIL_RECIPIENT,
     else:
         msg.set_content(message)
 
+    import smtplib
+
     s = smtplib.SMTP(settings.MAIL_SERVER)
     s.starttls()
     s.send_message(msg)
@@ -133,13 +253,63 @@ def get_db_source_dict(source_code):
     :return: a JSON with source meta-data from database.
     """
     endpoint = f"{API_END_POINT}/dimension/source"
-    r = requests.get(f"{endpoint}?code={source_code}")
+    r = get_api_client().get(f"{endpoint}?code={source_code}")
     if r.status_code == 404:
         raise ValueError(f"No code: {source_code} in source!")
     source = r.json()[0]
     return source
 
 
+def get_db_source_index(source_codes, max_workers=5):
+    """
+    Get meta-data for several sources from database, the sources being fetched concurrently.
+    :param source_codes: the codes identifying the sources.
+    :param max_workers: maximum number of concurrent requests.
+    :return: a dictionary {source code: JSON with source meta-data from database}, without the unknown codes.
+    """
+    endpoint = f"{API_END_POINT}/dimension/source"
+
+    def get_one(source_code):
+        r = get_api_client().get(f"{endpoint}?code={source_code}")
+        if r.status_code == 404:
+            return []
+        r.raise_for_status()
+        return r.json()
+
+    source_codes = list(dict.fromkeys(source_codes))
+    if not source_codes:
+        return {}
+    return {source['code']: source
+            for sources in parallelize(get_one, source_codes, max_workers) for source in sources}
+
+
+def update_db_sources(data, max_workers=5, bulk=None):
+    """
+    Updates meta-data for several sources in database, with one PUT per source sent concurrently,
+    or a single bulk PUT on dimension/source (see settings.SOURCE_BULK_UPDATE).
+    :param data: a list of dictionaries with the 'id' of each source and the fields to update.
+    :param max_workers: maximum number of concurrent requests.
+    :param bulk: if True, send a single bulk PUT. Defaults to settings.SOURCE_BULK_UPDATE.
+    :return: the (last) response.
+    """
+    if not data:
+        return None
+    endpoint = f"{API_END_POINT}/dimension/source"
+    if SOURCE_BULK_UPDATE if bulk is None else bulk:
+        r = get_api_client().put(endpoint, json=data)
+        if r.status_code >= 300:
+            raise IOError(f"Issue for bulk update of {len(data)} sources: \n {r.text}")
+        return r
+
+    def update_one(item):
+        item = dict(item)
+        r = get_api_client().put(f"{endpoint}/{item.pop('id')}", json=item)
+        r.raise_for_status()
+        return r
+
+    return parallelize(update_one, data, max_workers)[-1]
+
+
 def calc_checksum_download(source):
     """
     Calculates the checksum based on file's content.
@@ -156,6 +326,35 @@ def calc_checksum_download(source):
     logger.info(f"Checksum calculated and appended to source with code '{source.code}'")
 
 
+def stream_to_file(response, file_path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Writes a streamed HTTP response to a file, calculating its checksum on the fly.
+    Chunks are written to a temporary file in the same folder, which is renamed
+    atomically to file_path once the whole body has been received: a failed download
+    never leaves a truncated file behind.
+    :param response: a requests.Response obtained with stream=True.
+    :param file_path: the Path of the target file.
+    :param chunk_size: number of bytes read per chunk.
+    :return: a tuple (MD5 checksum, number of bytes written).
+    """
+    md5 = hashlib.md5()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f'.{file_path.name}.', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                check_deadline()
+                f.write(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+        os.replace(tmp_name, file_path)
+        metrics.count('http_bytes_received', size)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return md5.hexdigest(), size
+
+
 def timeit(method):
     """
     Calculates the execution time of a function
@@ -174,38 +373,56 @@ def timeit(method):
     return timed
 
 
-def timeout(s):
+def timeout(s, isolate=False):
     """
     @param s: int: number of seconds to wait.
-    use as decorator to exit process if 
-    function takes longer than s seconds
+    @param isolate: run the function in a child process, killed after s seconds
+        (the function and its arguments must be picklable, see deadline.run_in_subprocess).
+    use as decorator to raise TimeoutError if
+    function takes longer than s seconds.
+    Without isolate, HTTP calls of the shared clients (self.http) and loops calling
+    deadline.check_deadline() stop at the deadline, and a function returning late still raises TimeoutError.
+    In the main thread, code ignoring the deadline (bare requests calls, selenium...) is also interrupted
+    TIMEOUT_INTERRUPT_GRACE seconds later, as soon as it runs Python code again. Nothing interrupts
+    it in other threads: there, use self.http or isolate.
     """
     def outer(fn):
-        def quit_function(fn_name):
-            # print to stderr, unbuffered in Python 2.
-            sys.stderr.flush() # Python 3 stderr is likely buffered.
-            _thread.interrupt_main() # raises KeyboardInterrupt
-
-        def new_func(*args, **kwargs):
-            timer = threading.Timer(s, quit_function, args=[fn.__name__])
-            timer.start()
-            try:
-                result = fn(*args, **kwargs)
-            finally:
-                timer.cancel()
-            return result
-
+        @wraps(fn)
         def inner(*args, **kwargs):
-            try:
-                new_func(*args, **kwargs)
-            except KeyboardInterrupt:
-                raise TimeoutError(f'{fn.__name__} took more than {s} seconds')
+            if isolate:
+                return run_in_subprocess(fn, *args, timeout=s, **kwargs)
+            expired = threading.Event()
+            watchdog = None
+            if threading.current_thread() is threading.main_thread():
+                def interrupt():
+                    expired.set()
+                    _thread.interrupt_main()  # raises KeyboardInterrupt in the main thread
+                watchdog = threading.Timer(s + TIMEOUT_INTERRUPT_GRACE, interrupt)
+                watchdog.daemon = True
+                watchdog.start()
+            with deadline(s):
+                try:
+                    try:
+                        result = fn(*args, **kwargs)
+                    finally:
+                        if watchdog is not None:
+                            watchdog.cancel()
+                except TimeoutError as e:
+                    raise TimeoutError(f'{fn.__name__} took more than {s} seconds') from e
+                except KeyboardInterrupt:
+                    if not expired.is_set():
+                        raise
+                    raise TimeoutError(f'{fn.__name__} took more than {s} seconds') from None
+                check_deadline()
+            return result
         return inner
     return outer
 
 
 @lru_cache(maxsize=1)
 def get_country_dict():
+    import pycountry
+
     country_list = list(pycountry.countries)
     country_name_dict = {country.name: country.alpha_3 for country in country_list}
     country_name_begin_dict = {country.name.split(',')[0]: country.alpha_3 for country in country_list}
@@ -231,18 +448,42 @@ def get_country_iso3(country_field):
             return country_mapping[country_field]
     return country_field
 
+
+def map_country_iso3(countries):
+    """
+    Same as countries.apply(get_country_iso3), looking up each distinct value only once.
+    :param countries: a pandas Series of country names or codes.
+    :return: a pandas Series of ISO3 codes (unknown values are kept as is).
+    """
+    codes, uniques = pd.factorize(countries)
+    iso3 = np.array([get_country_iso3(country) for country in uniques] + [None], dtype=object)
+    # missing values (code -1) are kept as they are
+    values = np.where(codes == -1, countries.to_numpy(dtype=object), iso3[codes])
+    return pd.Series(values, index=countries.index, name=countries.name).infer_objects()
+
 def load_config(config):
     """
     Will read the config.yml and create a config_dict
     Dynamic config elements are listed in dict_settings_exceptions
+    A configuration file is read once: its config_dict is cached and a copy of it is returned.
     """
     if type(config) == str:
-        filepath = os.path.join(ROOT_PATH / "iea_scraper" / "core" / "edc_config" / f"{config}.yml")
-        with open(filepath) as f:
-            conf = yaml.load(f, Loader=yaml.FullLoader)
-    elif type(config) == dict:
-        conf = config
-    dict_settings_exceptions = EDC_TOLERATED_LISTS
+        return copy.deepcopy(_load_config_file(config))
+    return _resolve_config(config)
+
+
+@lru_cache(maxsize=None)
+def _load_config_file(config):
+    import yaml
+
+    filepath = os.path.join(ROOT_PATH / "iea_scraper" / "core" / "edc_config" / f"{config}.yml")
+    with open(filepath) as f:
+        conf = yaml.load(f, Loader=yaml.FullLoader)
+    return _resolve_config(conf)
+
+
+def _resolve_config(conf):
+    dict_settings_exceptions = get_edc_tolerated_lists()
     for key, val in conf.items():
         if type(val) == str:
             if val in dict_settings_exceptions:
@@ -10,7 +10,6 @@ from datetime import datetime, timedelta
 import json
 import logging
 import sys
-import requests
 
 import numpy as np
 
@@ -41,16 +40,31 @@ class ArgentinaPowerStatsJob(EdcBulkJob):
         extracts generation data for yesterday from API url and updates input_df[metric]
         :return: DataFrame
         """
-        query = "?fechadesde=" + f'{date.strftime("%Y-%m-%d")}' + "T00%3A00%3A00.000-03%3A00&" + \
-                "&fechahasta=" + f'{date.strftime("%Y-%m-%d")}' + "T00%3A00%3A00.000-03%3A00&"
+        self.input_data.update(self.fetch_date(date))
+
+    def fetch_date(self, tdate):
+        """
+        Requests the prices and demand of one day (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {metric: DataFrame}
+        """
+        query = "?fechadesde=" + f'{tdate.strftime("%Y-%m-%d")}' + "T00%3A00%3A00.000-03%3A00&" + \
+                "&fechahasta=" + f'{tdate.strftime("%Y-%m-%d")}' + "T00%3A00%3A00.000-03%3A00&"
         url = self.url_prices_demand + query
-        r = requests.get(url, verify=False)
+        r = self.http.get(url, verify=False)
         json_data = json.loads(r.text.encode('utf8'))
         data = json_data[0]
-        self.input_data['prices'] = pd.json_normalize(data['detalle'])
-        self.input_data['demand'] = pd.json_normalize(data['detalleDemanda'])
+        input_data = {'prices': pd.json_normalize(data['detalle']),
+                      'demand': pd.json_normalize(data['detalleDemanda'])}
+        for metric in input_data:
+            input_data[metric]['local_date'] = data['fecha']
+        return input_data
+
+    def merge_date(self, tdate, payload):
+        self.input_data.update(payload)
         for metric in self.input_data:
-            self.input_data[metric]['local_date'] = data['fecha']
+            self.format_dfs(metric)
+            logger.info(f'Argentina- {metric} scraped for {tdate.strftime("%Y-%m-%d")}')
 
     def format_demand(self, df):
         df['local_datetime'] = df.apply(
@@ -99,10 +113,7 @@ class ArgentinaPowerStatsJob(EdcBulkJob):
         return df_dw
 
     def run_date(self, tdate):
-        self.get_json_data(tdate)
-        for metric in self.input_data:
-            self.format_dfs(metric)
-            logger.info(f'Argentina- {metric} scraped for {tdate.strftime("%Y-%m-%d")}')
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 
 if __name__ == '__main__':
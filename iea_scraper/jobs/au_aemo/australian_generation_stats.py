@@ -1,5 +1,4 @@
 import re
-import requests
 import pandas as pd
 import logging
 import sys
@@ -16,7 +15,6 @@ logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcJob, EdcBulkJob
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 REQUESTS_HEADER = {'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
                                   + ' AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -130,7 +128,7 @@ class AustralianGenerationStatsJob(EdcBulkJob):
         '''
 
         url = self.urls[doc_type]
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADER)
+        r = self.http.get(url, headers=REQUESTS_HEADER)
         soup = BeautifulSoup(r.content, 'html.parser')
         all_links = [elem['href'] for elem in soup.find_all('a', href=True)]
         filtered_links = [x for x in all_links if tdate.strftime("%Y%m%d") in x]
@@ -154,7 +152,7 @@ class AustralianGenerationStatsJob(EdcBulkJob):
             url = "/".join([self.urls[doc_type], str(tdate.year),
                             f'MMSDM_{tdate.year}_{tdate.month:02d}/MMSDM_Historical_Data_SQLLoader/DATA/'])
             try:
-                r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADER)
+                r = self.http.get(url, headers=REQUESTS_HEADER)
                 soup = BeautifulSoup(r.content, 'html.parser')
                 data_elem = soup.find(text=re.compile('PUBLIC_DVD_DISPATCH_UNIT_SCADA'))
                 zip_links = {tdate: "/".join([url, data_elem])}
@@ -174,7 +172,7 @@ class AustralianGenerationStatsJob(EdcBulkJob):
         '''
         for date in zip_links.keys():
             try:
-                r = requests.get(zip_links[date], verify=SSL_CERTIFICATE_PATH)
+                r = self.http.get(zip_links[date])
                 z = ZipFile(io.BytesIO(r.content))
                 file_name = z.infolist()[0].filename
                 df_csv = pd.read_csv(z.open(file_name), delimiter=',', header=1, encoding='unicode_escape')
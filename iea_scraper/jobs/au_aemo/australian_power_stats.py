@@ -13,7 +13,6 @@ from urllib.request import Request, urlopen
 import os
 import logging
 import numpy as np
-import requests
 import io
 
 logger = logging.getLogger(__name__)
@@ -55,7 +54,7 @@ class AustralianPowerStatsJob(EdcBulkJob):
         url = self.link + '_'.join([value for value in link.values()]) + '.csv'
         headers = {'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:77.0)'
                                    'Gecko/20100101 Firefox/77.0'}
-        r = requests.get(url, headers=headers, verify=False)
+        r = self.http.get(url, headers=headers, verify=False)
         s = r.content
         df = pd.read_csv(io.StringIO(s.decode('utf-8')))
         return df
@@ -84,8 +83,18 @@ class AustralianPowerStatsJob(EdcBulkJob):
         return df
 
     def get_day(self, tdate):
-        for region in self.region_mapping.keys():
-            output_df = self.get_csv(tdate, region)
+        self.merge_date(tdate, self.fetch_date(tdate))
+
+    def fetch_date(self, tdate):
+        """
+        Downloads the csv of each region for the month of tdate (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {region: DataFrame}
+        """
+        return {region: self.get_csv(tdate, region) for region in self.region_mapping.keys()}
+
+    def merge_date(self, tdate, payload):
+        for region, output_df in payload.items():
             output_df = self.format_df(output_df)
             output_df = output_df.loc[output_df['local_date'] == tdate.date()]
             self.output_all_dfs = pd.concat([self.output_all_dfs, output_df.copy()])
@@ -11,9 +11,7 @@ from datetime import datetime as datetime, timedelta
 import pandas as pd
 import logging
 import numpy as np
-import requests
 
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -52,7 +50,7 @@ class WestAustralianPowerStatsJob(EdcBulkJob):
     def get_csv(self, year, doc_type):
         """downloads csv from link and return Dataframe"""
         url = self.link + self.document_type_mapping[doc_type] + str(year) + '.csv'
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(url)
         df = pd.read_csv(io.BytesIO(r.content))
         df = self.format_df(df)
         return df
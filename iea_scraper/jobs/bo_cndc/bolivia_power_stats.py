@@ -5,6 +5,8 @@ Created on Mon Nov 16 19:39:37 2020
 @author: DAUGY_M
 """
 
+import io
+from copy import copy
 import pandas as pd
 import logging
 import sys
@@ -48,10 +50,12 @@ class BoliviaPowerStatsJob(EdcBulkJob):
         :return: DataFrame
         '''
         url = self.urls[metric] + str(tdate.strftime('%d%m%y')) + '.htm'
-        html = pd.read_html(url, skiprows=8)
+        r = self.http.get(url)
+        r.raise_for_status()
+        html = pd.read_html(io.StringIO(r.text), skiprows=8)
         test_point = html[0].iloc[2,2]   
         if '.' not in test_point:
-           html = pd.read_html(url, skiprows=8, decimal=',', thousands='.') 
+           html = pd.read_html(io.StringIO(r.text), skiprows=8, decimal=',', thousands='.') 
         df = pd.concat(html)
         df = df.rename(columns={df.columns[0]: 'Product'})
         df = df[df['Product'].notna()]
@@ -138,17 +142,31 @@ class BoliviaPowerStatsJob(EdcBulkJob):
         df_dw = pd.concat([self.df_demand, self.df_generation, self.df_prices])
         return df_dw
 
-    def run_date(self, tdate):
-        self.get_demand_data(tdate)
+    def fetch_date(self, tdate):
+        """
+        Collects the data of one day into a copy of the job (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {metric: DataFrame}
+        """
+        day = copy(self)
+        day.input_dfs = {}
+        day.get_demand_data(tdate)
         logger.info(f'Demand data scraped for {tdate}')
-        self.get_generation_data(tdate)
+        day.get_generation_data(tdate)
         logger.info(f'Generation data scraped for {tdate}')
-        self.get_prices_data(tdate)
+        day.get_prices_data(tdate)
         logger.info(f'Prices data scraped for {tdate}')
+        return day.input_dfs
+
+    def merge_date(self, tdate, payload):
+        self.input_dfs.update(payload)
         for metric in self.urls.keys():
             self.format_df(metric, tdate)
             logger.info(f'{metric} formatted')
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     folder = r'C:\Repos\world_electricity_scraper\csvs'
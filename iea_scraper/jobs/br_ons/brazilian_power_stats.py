@@ -4,7 +4,7 @@ Created on Mon Nov 16 19:39:37 2020
 ``
 @author: NGHIEM_A
 """
-import requests
+import io
 import pandas as pd
 from datetime import datetime, timedelta
 from lxml import html
@@ -51,7 +51,9 @@ class BrazilianPowerStatsJob(EdcBulkJob):
         """Gets yearly data, reformats it and adds it to self.yearly_data"""
         url = self.url_all.replace('{year}', str(year))
         try:
-            df_year = pd.read_csv(url, delimiter=';')
+            r = self.http.get(url)
+            r.raise_for_status()
+            df_year = pd.read_csv(io.BytesIO(r.content), delimiter=';')
         except:
             logger.warning(f'Could not load {year}')
             self.yearly_data[year] = None
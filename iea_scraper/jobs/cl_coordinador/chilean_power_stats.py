@@ -11,13 +11,11 @@ from datetime import datetime, timedelta
 import json
 import logging
 import sys
-import requests
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 from iea_scraper.core.exceptions import EdcJobError
 
 REQUEST_HEADERS = {
@@ -74,14 +72,14 @@ class ChileanPowerStatsJob(EdcBulkJob):
         url = self.urls[metric] + query
         if self.number_of_queries / ((self.time_since_start.seconds+0.1) / 3600) > 60:
             try:
-                r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=self.headers)
+                r = self.http.get(url, headers=self.headers)
                 self.number_of_queries += 1
             except:
                 logger.info("Number of queries to the API exceeded in an hour")
                 sleep(3601 - self.time_since_start.seconds % 3600)
                 self.number_of_queries = 0
         else:
-            r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=self.headers)
+            r = self.http.get(url, headers=self.headers)
             self.number_of_queries += 1
         if r.status_code == 504:
             data = []
@@ -9,7 +9,6 @@ from datetime import datetime, timedelta
 import logging
 import sys
 from pathlib import Path
-import requests
 import io
 
 
@@ -17,7 +16,6 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import  EdcBulkJob
-from iea_scraper.settings import PROXY_DICT
         
 class ColombianPowerStatsJob(EdcBulkJob):
     
@@ -40,18 +38,27 @@ class ColombianPowerStatsJob(EdcBulkJob):
     
     def scrape_generation(self, tdate):
         self.get_generation_per_plant(tdate)
+        self.add_generation(tdate)
+
+    def add_generation(self, tdate):
         self.map_generation_with_plant_mapping()
         self.format_generation()
         logger.info(f'{tdate} Colombian generation scraped')
-        
+
     def get_generation_per_plant(self, tdate):
+        self.df_generation_per_plant = self.download_generation_per_plant(tdate)
+
+    def download_generation_per_plant(self, tdate):
+        """
+        :return: the generation per plant of tdate (without changing the job state)
+        """
         url = tdate.strftime(self.url_generation)
-        s = requests.get(url, proxies=PROXY_DICT, verify=False).text
+        s = self.http.get(url, verify=False).text
         df_generation_per_plant = pd.read_csv(io.StringIO(s), encoding='latin1')
         df_generation_per_plant.columns = ['plant_name'] + list(range(24))
         df_generation_per_plant['local_date'] = tdate
         df_generation_per_plant = df_generation_per_plant.loc[df_generation_per_plant['plant_name']!='Total']
-        self.df_generation_per_plant = df_generation_per_plant
+        return df_generation_per_plant
     
     def map_generation_with_plant_mapping(self):
         df_generation_per_plant = self.df_generation_per_plant
@@ -79,20 +86,29 @@ class ColombianPowerStatsJob(EdcBulkJob):
         
     def scrape_demand(self, tdate):
         self.get_demand(tdate)
+        self.add_demand(tdate)
+
+    def add_demand(self, tdate):
         self.format_demand()
         logger.info(f'{tdate} Colombian demand scraped')
-     
+
     def get_demand(self, tdate):
+        self.df_demand = self.download_demand(tdate)
+
+    def download_demand(self, tdate):
+        """
+        :return: the demand of tdate (without changing the job state)
+        """
         start_week = tdate - timedelta(days=tdate.weekday())
         try:
             url = start_week.strftime(self.url_demand)
-            s = requests.get(url, proxies=PROXY_DICT, verify=False).text
+            s = self.http.get(url, verify=False).text
             df_week_demand = pd.read_csv(io.StringIO(s))
             df_week_demand.columns = ['hour'] + [start_week + timedelta(days=i) for i in range(7)]
         except:
             # Backup solution when first url doesn't work
             url = start_week.strftime(self.url_demand_bis)
-            s = requests.get(url, proxies=PROXY_DICT, verify=False).text
+            s = self.http.get(url, verify=False).text
             df_week_demand = pd.read_csv(io.StringIO(s))
             try:
                 df_week_demand.columns = ['na', 'hour'] + [start_week + timedelta(days=i) for i in range(7)]
@@ -102,7 +118,7 @@ class ColombianPowerStatsJob(EdcBulkJob):
                 
         df_week_demand = df_week_demand.melt(id_vars=['hour'], value_name='Value',
                                               var_name='local_date')
-        self.df_demand = df_week_demand.loc[df_week_demand['local_date']==tdate]
+        return df_week_demand.loc[df_week_demand['local_date']==tdate]
         
     def format_demand(self):
         df_demand = self.df_demand
@@ -128,9 +144,21 @@ class ColombianPowerStatsJob(EdcBulkJob):
         df_dw = pd.concat([self.df_generation_all, self.df_demand_all])
         return df_dw
         
+    def fetch_date(self, tdate):
+        """
+        Downloads the generation and demand of one day (without changing the job state)
+        :param tdate: datetime
+        :return: tuple (generation per plant, demand) DataFrames
+        """
+        return self.download_generation_per_plant(tdate), self.download_demand(tdate)
+
+    def merge_date(self, tdate, payload):
+        self.df_generation_per_plant, self.df_demand = payload
+        self.add_generation(tdate)
+        self.add_demand(tdate)
+
     def run_date(self, tdate):
-        self.scrape_generation(tdate)
-        self.scrape_demand(tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
         
 if __name__ == '__main__':
     folder = r'C:\Repos\world_electricity_scraper\csvs'
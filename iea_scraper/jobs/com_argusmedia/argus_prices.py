@@ -9,8 +9,8 @@ from typing import NoReturn
 import pandas as pd
 from pandas.errors import EmptyDataError
 from pyodbc import ProgrammingError
-from sqlalchemy import create_engine
 
+from iea_scraper.core.db import get_engine
 from iea_scraper.core.job import ExtDbApiJob
 from iea_scraper.settings import ARGUS_FTP_USERNAME, ARGUS_FTP_PASSWORD, FILE_STORE_PATH, EXT_DB_STR
 
@@ -137,7 +137,7 @@ class ArgusPricesJob(ExtDbApiJob):
                 df = df.drop(['Category0'], axis=1)
                 logger.debug(f"Columns in df after transformation: {','.join(df.columns)}")
 
-            engine = create_engine(EXT_DB_STR, fast_executemany=True)
+            engine = get_engine(EXT_DB_STR, fast_executemany=True)
 
             with engine.connect().execution_options(autocommit=True) as con:
 
@@ -176,7 +176,7 @@ class ArgusPricesJob(ExtDbApiJob):
                 continue
 
             logger.debug(f'Database: {EXT_DB_STR}')
-            engine = create_engine(EXT_DB_STR, fast_executemany=True)
+            engine = get_engine(EXT_DB_STR, fast_executemany=True)
             # engine.begin() starts a transaction
 
             if self.full_load:
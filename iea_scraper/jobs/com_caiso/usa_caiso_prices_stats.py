@@ -15,7 +15,7 @@ import logging
 import requests
 
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, BROWSERDRIVER_PATH
+from iea_scraper.settings import BROWSERDRIVER_PATH
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -72,7 +72,7 @@ class UsaCaisoPricesStatsJob(EdcBulkJob):
         successful_request = False
         retries = 0
         while not successful_request and retries < 10:
-            resp = requests.get(self.base_url, params=params, timeout=20, verify=SSL_CERTIFICATE_PATH)
+            resp = self.http.get(self.base_url, params=params, timeout=20)
             if resp.status_code == 200:
                 successful_request = True
             elif resp.status_code == 429:
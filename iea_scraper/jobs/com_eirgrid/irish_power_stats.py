@@ -12,7 +12,6 @@ from time import sleep
 import json
 import logging
 import sys
-import requests
 from pathlib import Path
 
 from iea_scraper.core.exceptions import EdcJobError
@@ -21,7 +20,6 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 
 class IrishPowerStatsJob(EdcBulkJob):
@@ -81,7 +79,7 @@ class IrishPowerStatsJob(EdcBulkJob):
         query_param = self.get_query_param(tdate, page_number, metric)
         url = self.main_url + query_param
 
-        r = requests.get(url, headers=self.headers, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url, headers=self.headers)
         json_data = json.loads(r.text)
         total_pages = json_data['pagination']['totalPages']
         json_items = json_data['items']
@@ -93,7 +91,7 @@ class IrishPowerStatsJob(EdcBulkJob):
             all_data_downloaded = False
             while i < total_pages + 1 and not all_data_downloaded:
                 url = self.main_url + self.get_query_param(tdate, page_number + i, metric)
-                r = requests.get(url, headers=self.headers, verify=SSL_CERTIFICATE_PATH)
+                r = self.http.get(url, headers=self.headers)
                 json_data = json.loads(r.text)['items']
                 json_items += json_data
                 if i == total_pages:
@@ -177,15 +175,25 @@ class IrishPowerStatsJob(EdcBulkJob):
                 df_dw = pd.concat([df_dw, self.output_data[metric]])
         return df_dw
 
-    def run_date(self, tdate):
-        for metric in self.output_data:
-            data = self.get_data_from_url(tdate, metric)
+    def fetch_date(self, tdate):
+        """
+        Downloads the data of every metric for one day (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {metric: DataFrame}
+        """
+        return {metric: self.get_data_from_url(tdate, metric) for metric in self.output_data}
+
+    def merge_date(self, tdate, payload):
+        for metric, data in payload.items():
             if not data.empty:
                 self.format_dfs(metric, data)
                 logger.info(f"Ireland: {metric} data scraped for {tdate.date()}")
             else:
                 logger.warning(f"Ireland: {metric} data not available for {tdate.date()}")
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     folder = r'C:\Repos\iea_scraper\iea_scraper\csvs'
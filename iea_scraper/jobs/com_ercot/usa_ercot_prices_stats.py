@@ -12,12 +12,11 @@ import pandas as pd
 from datetime import datetime, timedelta
 import sys
 import logging
-import requests
 import numpy as np
 from bs4 import BeautifulSoup
 
 from iea_scraper.core import factory
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, FILE_STORE_PATH, BROWSERDRIVER_PATH
+from iea_scraper.settings import FILE_STORE_PATH, BROWSERDRIVER_PATH
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -70,7 +69,7 @@ class UsaErcotPricesStatsJob(EdcBulkJob):
         if key not in ['live', 'bulk']:
             raise EdcJobError("Key has to be 'live' or 'bulk'")
         else:
-            r = requests.get(self.urls[key], verify=SSL_CERTIFICATE_PATH)
+            r = self.http.get(self.urls[key])
             html_data = r.text
             soup = BeautifulSoup(html_data, features='lxml')
             download_links = {}
@@ -121,7 +120,7 @@ class UsaErcotPricesStatsJob(EdcBulkJob):
             for hour in range(0, 24):
                 date = tdate.replace(hour=hour, minute=0, microsecond=0, second=0)
                 while not response == 200:
-                    resp = requests.get(self.all_zip_links[key][date], verify=SSL_CERTIFICATE_PATH)
+                    resp = self.http.get(self.all_zip_links[key][date])
                     response = resp.status_code
                     if response != 200:
                         sleep(10)
@@ -172,7 +171,7 @@ class UsaErcotPricesStatsJob(EdcBulkJob):
         tdate_available = self.check_last_date_in_df(tdate)
         if not self.bulk_downloaded or not tdate_available:
             while not response == 200:
-                resp = requests.get(self.all_zip_links[key][str(tdate.year)], verify=SSL_CERTIFICATE_PATH)
+                resp = self.http.get(self.all_zip_links[key][str(tdate.year)])
                 response = resp.status_code
                 if response != 200:
                     sleep(10)
@@ -10,7 +10,6 @@ import pandas as pd
 from datetime import datetime
 import sys
 import logging
-import requests
 
 from iea_scraper.core import factory
 
@@ -18,7 +17,7 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS, BROWSERDRIVER_PATH
+from iea_scraper.settings import BROWSERDRIVER_PATH
 
 sys.path.append(BROWSERDRIVER_PATH)
 
@@ -66,7 +65,7 @@ class UsaNyisoPricesStatsJob(EdcBulkJob):
         '''
         url = tdate.strftime(self.zip_url)
 
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(url)
         z = ZipFile(io.BytesIO(r.content))
         all_files = z.namelist()
         tdate_file = [file for file in all_files if tdate.strftime("%Y%m%d") in file][0]
@@ -93,11 +92,21 @@ class UsaNyisoPricesStatsJob(EdcBulkJob):
         df['Export Date'] = self.export_datetime
         self.df_prices = pd.concat([df, self.df_prices])
 
-    def run_date(self, tdate):
-        df = self.get_data_from_zip(tdate)
-        self.format_data(df)
+    def fetch_date(self, tdate):
+        """
+        Downloads the prices of one day (without changing the job state)
+        :param tdate: datetime
+        :return: DataFrame
+        """
+        return self.get_data_from_zip(tdate)
+
+    def merge_date(self, tdate, payload):
+        self.format_data(payload)
         logger.info(f'Prices scraped for {tdate.date()}')
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     usa_prices_stats = UsaNyisoPricesStatsJob()
@@ -10,7 +10,6 @@ import pandas as pd
 from datetime import datetime
 import sys
 import logging
-import requests
 import json
 
 from iea_scraper.core.exceptions import EdcJobError
@@ -20,7 +19,7 @@ logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcBulkJob
 
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, BROWSERDRIVER_PATH
+from iea_scraper.settings import BROWSERDRIVER_PATH
 
 sys.path.append(BROWSERDRIVER_PATH)
 
@@ -60,6 +59,9 @@ class UsaPjmPricesStatsJob(EdcBulkJob):
         return df_dw
 
     def get_data(self, tdate):
+        self.json_items = self.request_items(tdate)
+
+    def request_items(self, tdate):
         '''
         This method extracts the data from the PJM website using a GET request.
         We add the query string to the request_url. This query contains the columns we want in 'field' and the
@@ -77,10 +79,10 @@ class UsaPjmPricesStatsJob(EdcBulkJob):
                 "&Type=HUB" \
                 f"&datetime_beginning_ept={date_formatted}%2000:00to{date_formatted}%2023:59" \
                 f"&row_is_current=1"
-        r = requests.get(self.request_url + query, verify=SSL_CERTIFICATE_PATH, headers=self.headers)
+        r = self.http.get(self.request_url + query, headers=self.headers)
         if r.status_code == 200:
             json_data = json.loads(r.text)
-            self.json_items = json_data['items']
+            return json_data['items']
         else:
             raise EdcJobError(f"USA PJM: prices data not available for {tdate.date()}")
 
@@ -104,11 +106,22 @@ class UsaPjmPricesStatsJob(EdcBulkJob):
         df['Flow 2'] = 'USD'
         self.df_prices = pd.concat([df, self.df_prices])
 
-    def run_date(self, tdate):
-        self.get_data(tdate)
+    def fetch_date(self, tdate):
+        """
+        Downloads the prices of one day (without changing the job state)
+        :param tdate: datetime
+        :return: list of json items
+        """
+        return self.request_items(tdate)
+
+    def merge_date(self, tdate, payload):
+        self.json_items = payload
         self.format_data()
         logger.info(f'Prices scraped for {tdate.date()}')
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     usa_prices_stats = UsaPjmPricesStatsJob()
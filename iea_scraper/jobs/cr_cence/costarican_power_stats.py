@@ -4,7 +4,6 @@ Created on Mon Nov 16 19:39:37 2020
 ``
 @author: DAUGY_M
 """
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
@@ -15,7 +14,6 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcJob, EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 
 class CostaricanPowerStatsJob(EdcBulkJob):
@@ -67,7 +65,7 @@ class CostaricanPowerStatsJob(EdcBulkJob):
         :return: list (json_data)
         """
         url_json = self.get_url_metric(tdate, metric)
-        r = requests.get(url_json, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url_json)
         json_file = r.json()
         json_data = json_file['data']
         return json_data
@@ -134,13 +132,23 @@ class CostaricanPowerStatsJob(EdcBulkJob):
         df['utc_date'] = df['utc_datetime'].dt.date
         return df
 
-    def run_date(self, tdate):
-        for metric in self.urls:
-            json_data = self.get_json_data(tdate, metric)
+    def fetch_date(self, tdate):
+        """
+        Downloads the generation and demand jsons of one day (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {metric: json_data}
+        """
+        return {metric: self.get_json_data(tdate, metric) for metric in self.urls}
+
+    def merge_date(self, tdate, payload):
+        for metric, json_data in payload.items():
             all_data_points = self.get_all_data_points(metric, json_data)
             df = self.format_df(pd.DataFrame(all_data_points))
             self.output_df[metric] = pd.concat([self.output_df[metric], df])
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     folder = r'C:\Repos\world_electricity_scraper\csvs'
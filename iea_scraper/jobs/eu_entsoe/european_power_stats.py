@@ -6,7 +6,7 @@ Created on Mon Oct 19 17:46:03 2020
     DAUGY_M
     CHAMBEAU_L
 """
-import requests
+from copy import copy
 import pandas as pd
 import xml.etree.ElementTree as et
 from datetime import datetime, timedelta
@@ -18,7 +18,6 @@ sys.path.append(r'C:\Repos\scraper')
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 class EuropeanPowerStatsJob(EdcBulkJob):
     
@@ -194,6 +193,12 @@ class EuropeanPowerStatsJob(EdcBulkJob):
         }
         self.iso2_to_iso3 = self.get_iso2_to_iso3_mapping()
         self.countryname_to_iso3 = self.get_countryname_to_iso3_mapping()
+        self.init_data_points()
+
+    def init_data_points(self):
+        """
+        Empties the scraped data points and the missing data reports
+        """
         self.load_data_points = []
         self.load_all_data_points = []
         self.generation_data_points = []
@@ -233,7 +238,7 @@ class EuropeanPowerStatsJob(EdcBulkJob):
                    'PeriodStart': tdate.strftime('%Y%m%d0000'),
                    'PeriodEnd': (tdate + timedelta(days=1)).strftime('%Y%m%d0000')}
         url = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url)
         if r.status_code == 200:
             root = et.fromstring(r.content)
             space_name = root[0].tag[0:-4]
@@ -289,7 +294,7 @@ class EuropeanPowerStatsJob(EdcBulkJob):
                    'PeriodStart': tdate.strftime('%Y%m%d0000'),
                    'PeriodEnd': (tdate + timedelta(days=1)).strftime('%Y%m%d0000')}
         url = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url)
         if r.status_code == 200:
             root = et.fromstring(r.content)
             space_name = root[0].tag[0:-4]
@@ -338,7 +343,7 @@ class EuropeanPowerStatsJob(EdcBulkJob):
                    'PeriodStart': tdate.strftime('%Y%m%d0000'),
                    'PeriodEnd': (tdate + timedelta(days=1)).strftime('%Y%m%d0000')}
         url = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url)
         if r.status_code == 200:
             root = et.fromstring(r.content)
             space_name = root[0].tag[0:-4]
@@ -398,7 +403,7 @@ class EuropeanPowerStatsJob(EdcBulkJob):
                    'PeriodStart': tdate.strftime('%Y%m%d0000'),
                    'PeriodEnd': (tdate + timedelta(days=1)).strftime('%Y%m%d0000')}
         url = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url)
         if r.status_code == 200:
             root = et.fromstring(r.content)
             space_name = root[0].tag[0:-4]
@@ -450,7 +455,7 @@ class EuropeanPowerStatsJob(EdcBulkJob):
                    'PeriodStart': tdate.strftime('%Y%m%d0000'),
                    'PeriodEnd': (tdate + timedelta(days=1)).strftime('%Y%m%d0000')}
         url = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        r = requests.get(url, verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(url)
         if r.status_code == 200:
             root = et.fromstring(r.content)
             space_name = root[0].tag[0:-4]
@@ -565,11 +570,34 @@ class EuropeanPowerStatsJob(EdcBulkJob):
         self.print_missing_prices_report()
         self.to_csv(folder)
         
-    def run_date(self, tdate):
+    def scrape_date(self, tdate):
         self.scrape_loads(tdate)
         self.scrape_generations(tdate)
         self.scrape_prices(tdate)
 
+    def fetch_date(self, tdate):
+        """
+        Scrapes one day into a copy of the job with empty data points (without changing the job state)
+        :param tdate: datetime
+        :return: the copy of the job
+        """
+        day = copy(self)
+        day.init_data_points()
+        day.scrape_date(tdate)
+        return day
+
+    def merge_date(self, tdate, payload):
+        self.load_all_data_points += payload.load_all_data_points
+        self.generation_all_data_points += payload.generation_all_data_points
+        self.prices_all_data_points += payload.prices_all_data_points
+        for report, day_report in ((self.missing_country_report, payload.missing_country_report),
+                                   (self.missing_prices_report, payload.missing_prices_report)):
+            for key, missing in day_report.items():
+                report[key].update({data: value for data, value in missing.items() if value})
+
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 class EuropeanCountryPowerStatsJob(EuropeanPowerStatsJob):
     '''Scraper for just one country. Generation. Demand. Prices'''
     
@@ -580,7 +608,7 @@ class EuropeanCountryPowerStatsJob(EuropeanPowerStatsJob):
         self.associated_bidding_zones = [zone for zone in self.bidding_zone_mapping
                                          if zone[:2] == self.country_iso2]
     
-    def run_date(self, tdate):
+    def scrape_date(self, tdate):
         self.scrape_load(tdate, self.country)
         self.scrape_generation_all_fuels(tdate, self.country)
         self.scrape_prices(tdate, in_bzn=self.associated_bidding_zones)
@@ -9,7 +9,7 @@ European Gas Trade Flows, from ENTSO-G Transparency Platform
         - Location AND - Partner Location
         So that to enable reconciling imports and exports when analysing the data.
 """
-import requests
+import io
 import pandas as pd
 from datetime import datetime, timedelta
 import pycountry
@@ -20,7 +20,6 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 from iea_scraper.core.job import EdcGasBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 
 class EuropeanGasStatsJob(EdcGasBulkJob):
@@ -152,7 +151,9 @@ class EuropeanGasStatsJob(EdcGasBulkJob):
 
         """
 
-        data = pd.read_csv(self.get_url_points_direction(tdate))
+        r = self.http.get(self.get_url_points_direction(tdate))
+        r.raise_for_status()
+        data = pd.read_csv(io.BytesIO(r.content))
         self.data_points_directions = data[[
             'pointKey',
             'pointLabel',
@@ -252,9 +253,9 @@ class EuropeanGasStatsJob(EdcGasBulkJob):
             get_url_data()
         """
 
-        r = requests.get(self.get_url_data(tdate, id_type), verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(self.get_url_data(tdate, id_type))
         if r.status_code == 200:
-            data = pd.read_csv(self.get_url_data(tdate, id_type),
+            data = pd.read_csv(io.BytesIO(r.content),
                                 index_col=False, 
                                 usecols=[i for i in self.columns])
             data = data.loc[data['value'] != 0].dropna()
@@ -4,6 +4,7 @@ Created on Feb 2021
 ``
 @author: CHAMBEAU_L
 """
+import io
 import requests
 import pandas as pd
 import xml.etree.ElementTree as et
@@ -107,9 +108,41 @@ class GreatBritainPowerStatsJob(EdcBulkJob):
             run_date_prices()
         """
         
-        self.run_date_demand(tdate)
-        self.run_date_generation(tdate)
-        self.run_date_prices(tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
+
+    def fetch_date(self, tdate):
+        """
+         Description:
+            Collects the data of one day for each metric, without changing the job state.
+
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]
+
+        Output(s):
+            payload [Dict]: Dict with the DataFrame of each metric
+        """
+
+        return {'Demand': self.get_demand_to_df(tdate),
+                'Generation': self.get_generation_to_df(tdate),
+                'Prices': self.get_prices_to_df(tdate)}
+
+    def merge_date(self, tdate, payload):
+        """
+         Description:
+            Pre-formats the DataFrames collected by fetch_date() to fit the DW for each metric.
+
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]
+            payload [Dict]: the output of fetch_date()
+        """
+
+        self.format_demand(tdate, payload['Demand'])
+        self.format_generation(tdate, payload['Generation'])
+        self.format_prices(tdate, payload['Prices'])
 
 
     def run_date_demand(self, tdate):
@@ -182,6 +215,24 @@ class GreatBritainPowerStatsJob(EdcBulkJob):
         df = self.get_prices_to_df(tdate)
         self.format_prices(tdate, df)
 
+    def download(self, url):
+        """
+         Description:
+            Downloads a csv file of the API through self.http (limit per host, deadline of the day, proxy and
+            retries).
+
+        Called by get_demand_to_df(), get_generation_to_df() and get_prices_to_df()
+
+        Input(s):
+            url [str]
+
+        Output(s):
+            content [bytes]: content of the csv file
+        """
+        r = self.http.get(url)
+        r.raise_for_status()
+        return r.content
+
     def get_demand_to_df(self, tdate):
         """
          Description:
@@ -200,7 +251,7 @@ class GreatBritainPowerStatsJob(EdcBulkJob):
         settlement_date = tdate.strftime('%Y-%m-%d')
         input_url = f"{self.api_features['host_address']}/{self.metrics[metric]}/v1?APIKey={self.api_features['api_key']}&SettlementDate={settlement_date}&Period=*&ServiceType=csv"
 
-        df_demand = pd.read_csv(input_url, skiprows=4)
+        df_demand = pd.read_csv(io.BytesIO(self.download(input_url)), skiprows=4)
 
         return df_demand
 
@@ -222,7 +273,7 @@ class GreatBritainPowerStatsJob(EdcBulkJob):
         settlement_date = tdate.strftime('%Y-%m-%d')
         input_url = f"{self.api_features['host_address']}/{self.metrics[metric]}/v1?APIKey={self.api_features['api_key']}&SettlementDate={settlement_date}&Period=*&ServiceType=csv"
 
-        df_generation = pd.read_csv(input_url, skiprows=4)
+        df_generation = pd.read_csv(io.BytesIO(self.download(input_url)), skiprows=4)
 
         return df_generation
         
@@ -245,7 +296,7 @@ class GreatBritainPowerStatsJob(EdcBulkJob):
         settlement_date = tdate.strftime('%Y-%m-%d')
         input_url = f"{self.api_features['host_address']}/{self.metrics[metric]}/v1?APIKey={self.api_features['api_key']}&FromSettlementDate={settlement_date}&ToSettlementDate={settlement_date}&Period=*&ServiceType=csv"
 
-        df_prices = pd.read_csv(input_url, header=None,
+        df_prices = pd.read_csv(io.BytesIO(self.download(input_url)), header=None,
                                             names=['MID', 'Provider', 'Date', 'Period', 'GBP', 'Volume'],
                                             skiprows=1)
         return df_prices
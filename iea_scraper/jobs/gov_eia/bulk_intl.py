@@ -8,6 +8,7 @@ import zipfile
 
 from iea_scraper.settings import API_END_POINT,FILE_STORE_PATH
 from iea_scraper.core.job import ExtDbApiJob, BATCH_SIZE_DIM
+from iea_scraper.core import reference_index
 from iea_scraper.core.source import BaseSource
 from iea_scraper.core.ts import mapping
 from iea_scraper.core.utils import get_dimension_db_data, batch_upload
@@ -125,7 +126,6 @@ class BulkIntlJob(ExtDbApiJob):
         self.dynamic_dim['detail'] = data
         # TODO: replace this code after changing External DB API to use merge for details
         db_details = get_dimension_db_data('detail', f"category={category}")
-        get_dimension_db_data.cache_clear()
         db_details_code = [x['code'] for x in db_details]
         data_to_insert = [x for x in data if x['code'] not in db_details_code]
         data_to_update = [x for x in data if x['code'] in db_details_code]
@@ -142,7 +142,7 @@ class BulkIntlJob(ExtDbApiJob):
         :param data: the data array
         :param ts_batch: the batch size
         :param source: a Source object
-        :return: yelds batches of data.
+        :return: yields one DataFrame per batch of time series.
         """
 
         logger.debug(f"Data size: {len(data)} batch size: {ts_batch}  data//batch: {len(data) // ts_batch}")
@@ -168,7 +168,7 @@ class BulkIntlJob(ExtDbApiJob):
             df = (df.assign(provider=PROVIDER).
                 assign(original=ORIGINAL).
                 assign(source=source.code))
-            yield from df.to_dict('records')
+            yield df
 
 
 def _get_data_series(source):
@@ -289,11 +289,8 @@ def map_period(df):
     :param df: original data frame
     :return: data frame with period mapped
     """
-    df['period'] = df['period'].map(lambda x: int(x.replace('Q', '')))
-    db_periods = get_dimension_db_data('period')
-    db_periods = pd.DataFrame(db_periods)[['code', 'id']]
-    df = pd.merge(df, db_periods, left_on='period', right_on='id', how='left')
-    del df['id'], df['period']
-    df.loc[df['code'].isnull(), 'code'] = None
-    df.rename(columns={'code': 'period'}, inplace=True)
+    # the period id is the period without 'Q' (2020Q1 -> 20201)
+    periods = reference_index.map_period(df['period'], convert=lambda x: int(x.replace('Q', '')))
+    df = df.drop(columns='period')
+    df['period'] = periods
     return df
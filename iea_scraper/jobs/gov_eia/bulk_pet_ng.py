@@ -6,8 +6,8 @@ import zipfile
 
 from iea_scraper.settings import API_END_POINT, FILE_STORE_PATH
 from iea_scraper.core.job import ExtDbApiJob
+from iea_scraper.core import reference_index
 from iea_scraper.core.source import BaseSource
-from iea_scraper.core.utils import get_dimension_db_data
 from iea_scraper.jobs.utils import to_detail_format
 
 
@@ -66,7 +66,7 @@ class BulkPetNgJob(ExtDbApiJob):
             df = df.merge(ts_df, how='left', on='series_id')
             df['original'] = True
             del df['series_id']
-            self.data.extend(df.to_dict('records'))
+            self.data.append(df)
         self.remove_existing_dynamic_dim("provider")
         return None
 
@@ -104,11 +104,8 @@ def _get_df(data):
 
 
 def map_period(df):
-    df['period'] = df['period'].map(lambda x: int(x.replace('Q', '')))
-    db_periods = get_dimension_db_data('period')
-    db_periods = pd.DataFrame(db_periods)[['code', 'id']]
-    df = pd.merge(df, db_periods, left_on='period', right_on='id', how='left')
-    del df['id'], df['period']
-    df.loc[df['code'].isna(), 'code'] = None
-    df.rename(columns={'code': 'period'}, inplace=True)
+    # the period id is the period without 'Q' (2020Q1 -> 20201)
+    periods = reference_index.map_period(df['period'], convert=lambda x: int(x.replace('Q', '')))
+    df = df.drop(columns='period')
+    df['period'] = periods
     return df
\ No newline at end of file
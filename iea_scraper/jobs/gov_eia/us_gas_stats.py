@@ -6,7 +6,7 @@ weekly: supply, demand, trade and physical prices infromation; volumes are weekl
 monthly: production, demand, trade and some daily LNG trade flows.
 The overall scraper runs everyday, the date of the date determines if weekly and monthly scrapers should run.
  """
-import requests
+import io
 import pandas as pd
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -15,7 +15,6 @@ import sys
 sys.path.append(r"C:\Repos\iea_scraper")
 
 from iea_scraper.core.job import EdcGasBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 from iea_scraper.core.utils import get_country_iso3
 
 import logging
@@ -242,7 +241,7 @@ class UsGasStatsJob(EdcGasBulkJob):
             "api_key": self.api_key,
             "length": 100000}
 
-        df = pd.DataFrame(requests.get(self.url_daily, params=payload, verify=SSL_CERTIFICATE_PATH).json()['response']['data'])
+        df = pd.DataFrame(self.http.get(self.url_daily, params=payload).json()['response']['data'])
 
         self.df_daily_raw = df
         self.format_daily()
@@ -305,7 +304,9 @@ class UsGasStatsJob(EdcGasBulkJob):
         """
         if trigger:
             url = self.find_weekly_url(tdate)
-            tables = pd.read_html(url)
+            r = self.http.get(url)
+            r.raise_for_status()
+            tables = pd.read_html(io.StringIO(r.text))
 
             # weekly prices
             self.df_weekly_prices_raw = tables[0] 
@@ -591,9 +592,8 @@ class UsGasStatsJob(EdcGasBulkJob):
                     "api_key": self.api_key,
                     "length": 100000}
 
-            df = pd.DataFrame(requests.get(self.url_monthly, 
-                                            params=payload, 
-                                            verify=SSL_CERTIFICATE_PATH).json()['response']['data'])
+            df = pd.DataFrame(self.http.get(self.url_monthly, 
+                                            params=payload).json()['response']['data'])
 
             self.df_monthly_raw = df
             self.format_monthly()
@@ -684,9 +684,11 @@ class UsGasStatsJob(EdcGasBulkJob):
         - `get_url_monthly_lng(tdate)`
         """
         url = self.get_url_monthly_lng(tdate)
+        r = self.http.get(url)
+        r.raise_for_status()
 
         #Exports
-        df_lng_exports = pd.read_excel(url, sheet_name='LNG Exports - Repository', skiprows=9)
+        df_lng_exports = pd.read_excel(io.BytesIO(r.content), sheet_name='LNG Exports - Repository', skiprows=9)
         df_lng_exports = df_lng_exports.dropna(thresh=5)
         df_lng_exports = df_lng_exports[list([key for key in self.exports_columns.keys()])]
         df_lng_exports.rename(columns = self.exports_columns, inplace=True)
@@ -695,7 +697,7 @@ class UsGasStatsJob(EdcGasBulkJob):
         df_lng_exports['Flow 1'] = 'Exit'
 
         #Imports
-        df_lng_imports = pd.read_excel(url, sheet_name='LNG Imports', skiprows=9)
+        df_lng_imports = pd.read_excel(io.BytesIO(r.content), sheet_name='LNG Imports', skiprows=9)
         df_lng_imports = df_lng_imports.dropna(thresh=5).reset_index(drop=True)
         line = df_lng_imports['Date of Arrival'].str.find('Date of Arrival').dropna()
         df_lng_imports = df_lng_imports[list([key for key in self.imports_columns.keys()])]
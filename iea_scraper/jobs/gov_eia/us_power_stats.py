@@ -140,7 +140,7 @@ Notes:
         api_call = http://api.eia.gov/search/?search_term=name&search_value="crude oil"&rows_per_page=25&page_num=4
 
 """
-import requests
+from copy import copy
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
@@ -154,7 +154,6 @@ sys.path.append(r'C:\Repos\Scraper')
 
 from iea_scraper.core.job import EdcBulkJob
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.settings import PROXY_DICT, SSL_CERTIFICATE_PATH
 
 class UsPowerStatsJob(EdcBulkJob):
     title: str = "EIA - US electricity data"
@@ -218,7 +217,7 @@ class UsPowerStatsJob(EdcBulkJob):
                    'start': tdate.strftime('%Y%m%dT00Z'),
                    'end': tdate.strftime('%Y%m%dT23Z')}
         api_call = url_api + '&'.join([param + '=' + value for param, value in payload.items()])
-        json_file = requests.get(api_call, verify=SSL_CERTIFICATE_PATH, proxies=PROXY_DICT).json()
+        json_file = self.http.get(api_call).json()
         self.json_file = json_file
         data_points = [{
             'utc_datetime': datetime.strptime(tdatetimestr,'%Y%m%dT%HZ'),
@@ -241,7 +240,7 @@ class UsPowerStatsJob(EdcBulkJob):
         url_api = 'https://api.eia.gov/series/?'
         category_id = self.region_mapping_id[region]
         category_call = 'https://api.eia.gov/category/?api_key=' + key + '&category_id=' + category_id
-        json_file_cat = requests.get(category_call, verify=SSL_CERTIFICATE_PATH, proxies=PROXY_DICT).json()
+        json_file_cat = self.http.get(category_call).json()
         if 'data' in json_file_cat and 'error' in json_file_cat['data']:
             raise EdcJobError(json_file_cat['data']['error'])
         fuels = {element['series_id']: element['name'] for element in json_file_cat['category']['childseries'] if element['f'] == 'H'}
@@ -252,7 +251,7 @@ class UsPowerStatsJob(EdcBulkJob):
                 'start': tdate.strftime('%Y%m%dT00Z'),
                 'end': tdate.strftime('%Y%m%dT23Z')}
             api_call = url_api + '&'.join([param + '=' + value for param, value in payload_series.items()])
-            json_file = requests.get(api_call, verify=SSL_CERTIFICATE_PATH).json()    
+            json_file = self.http.get(api_call).json()    
             product_name = (fuels[fuel][fuels[fuel].find('from') + 5:fuels[fuel].find('for')]).title().strip()
             product_name = self.fuel_mapping[product_name] if product_name in self.fuel_mapping else product_name
             data_points = [{
@@ -312,9 +311,25 @@ class UsPowerStatsJob(EdcBulkJob):
         self.scrape_generation_usa(date_start, date_end)
         self.to_csv(folder)
     
+    def fetch_date(self, tdate):
+        """
+        Scrapes one day into a copy of the job (without changing the job state)
+        :param tdate: datetime
+        :return: tuple (load data points, generation data points)
+        """
+        day = copy(self)
+        day.load_all_data, day.generation_all_data = [], []
+        day.scrape_generation_usa(tdate, tdate)
+        day.scrape_load_usa(tdate, tdate)
+        return day.load_all_data, day.generation_all_data
+
+    def merge_date(self, tdate, payload):
+        load_data, generation_data = payload
+        self.load_all_data += load_data
+        self.generation_all_data += generation_data
+
     def run_date(self, tdate):
-        self.scrape_generation_usa(tdate, tdate)
-        self.scrape_load_usa(tdate, tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 if __name__ == '__main__':
     folder = r'C:\Repos\world_electricity_scraper\csvs'
@@ -387,7 +387,7 @@ class GsodJob(ExtDbApiJobV2):
             df = df.drop(columns=['code', '_merge'])
 
             # load results into self.data
-            self.data.extend(df.to_dict('records'))
+            self.data.append(df)
 
             del df, df_rej
             logger.debug('calling garbage collect explicitly')
@@ -4,7 +4,6 @@ Created on Mon Nov 16 19:39:37 2020
 ``
 @author: NGHIEM_A
 """
-import requests
 import pandas as pd
 import xml.etree.ElementTree as et
 from datetime import datetime, timedelta
@@ -41,7 +40,7 @@ class IndianHistoricalPowerStatsJob(EdcBulkJob):
         '''
         start_date = tdate.strftime('%Y-%m-%d')
         end_date = (tdate + timedelta(days=1)).strftime('%Y-%m-%d')
-        r = requests.get(self.url.replace('{start_date}', start_date).replace('{end_date}', end_date))
+        r = self.http.get(self.url.replace('{start_date}', start_date).replace('{end_date}', end_date))
         data_string = r.json()
         data_dict = json.loads(data_string)['timeseries_values']
         data = [{key: data_dict[key][i] for key in data_dict} for i in range(len(data_dict['timestamps']))]
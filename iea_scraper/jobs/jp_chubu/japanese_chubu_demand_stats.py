@@ -1,6 +1,5 @@
 from zipfile import ZipFile
 
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
@@ -8,7 +7,6 @@ import sys
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import REQUESTS_HEADERS, SSL_CERTIFICATE_PATH
 import io
 
 logger = logging.getLogger(__name__)
@@ -36,7 +34,7 @@ class JapaneseChubuDemandStatsJob(EdcJapanJob):
         @return: dictionary
         """
         date_url = tdate.strftime(self.url)
-        r = requests.get(date_url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(date_url)
         zip = ZipFile(io.BytesIO(r.content))
         for file in zip.namelist():
             self.all_demand_dict[file[-24:-16]] = pd.read_csv(zip.open(file), encoding='mskanji',  skiprows=13, nrows=24)
@@ -1,4 +1,3 @@
-import requests
 import pandas as pd
 from datetime import datetime
 import logging
@@ -7,7 +6,6 @@ import sys
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import REQUESTS_HEADERS, SSL_CERTIFICATE_PATH
 import io
 
 logger = logging.getLogger(__name__)
@@ -46,7 +44,7 @@ class JapaneseChubuGenerationStatsJob(EdcJapanJob):
         csv_year = tdate.year if tdate.month >= 4 else tdate.year - 1
         if self.year_df_generation[csv_year] is None:
             link = self.url.format(year=csv_year)
-            r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(link)
             if r.status_code == 200:
                 self.year_df_generation[csv_year] = pd.read_csv(io.StringIO(r.content.decode('mskanji')), skiprows=4)
             else:
@@ -9,12 +9,10 @@ import pandas as pd
 from datetime import datetime
 import logging
 import sys
-import requests
 
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -42,7 +40,7 @@ class JapaneseChugokuDemandStatsJob(EdcJapanJob):
         csv_year = tdate.year if tdate.month >= 4 else tdate.year - 1
         if self.year_df_demand[csv_year] is None:
             link = self.url.format(year=csv_year)
-            r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(link)
             self.year_df_demand[csv_year] = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=1)
 
     def format_df(self, date):
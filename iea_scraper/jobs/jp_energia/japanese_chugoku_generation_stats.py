@@ -10,11 +10,9 @@ from datetime import datetime
 import logging
 from bs4 import BeautifulSoup
 import sys
-import requests
 
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -51,7 +49,7 @@ class JapaneseChugokuGenerationStatsJob(EdcJapanJob):
         This method extract allcsv links from webpage and stores them in a list
         :return: list
         """
-        r = requests.get(self.main_page_url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(self.main_page_url)
         soup = BeautifulSoup(r.content, 'html.parser')
         csv_available = [elem['href'] for elem in soup.find_all('a', href=True) if ".csv" in elem['href']]
         return csv_available
@@ -64,14 +62,14 @@ class JapaneseChugokuGenerationStatsJob(EdcJapanJob):
         if self.year_df_generation[csv_year] is None:
             csv_links = [csv for csv in self.csvs_available if str(csv_year) in csv]
             if not csv_links:
-                r = requests.get(self.current_data_url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+                r = self.http.get(self.current_data_url)
                 df_current_data = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=2)
                 first_date_in_current = pd.to_datetime(df_current_data.iloc[1, 0])
                 for year in range(first_date_in_current.year, self.last_available_date.year + 1):
                     self.year_df_generation[year] = df_current_data
             else:
                 url = self.bulk_base_url + csv_links[0]
-                r = requests.get(url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+                r = self.http.get(url)
                 self.year_df_generation[csv_year] = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=2)
 
     def format_df(self, tdate):
@@ -10,13 +10,11 @@ import pandas as pd
 from datetime import datetime
 import logging
 import sys
-import requests
 from bs4 import BeautifulSoup
 
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -42,7 +40,7 @@ class JapaneseHokkaidoDemandStatsJob(EdcJapanJob):
         gets all zip_links and stores them in a list
         :return: list
         """
-        r = requests.get(self.url_demand, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(self.url_demand)
         soup = BeautifulSoup(r.content, 'html.parser')
         zip_links = [self.base_url + elem['href'] for elem in soup.find_all('a', href=True) if ".zip" in elem['href']]
         return zip_links
@@ -61,7 +59,7 @@ class JapaneseHokkaidoDemandStatsJob(EdcJapanJob):
                             4: '10-12'}
         quarter_zip_link = [zip for zip in self.all_zip_links if
                             quarter_str_dict[pd.Timestamp(tdate).quarter] in zip and str(tdate.year) in zip]
-        r = requests.get(quarter_zip_link[0], verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(quarter_zip_link[0])
         zip_file = ZipFile(io.BytesIO(r.content))
         csv_file = [csv for csv in zip_file.namelist() if tdate.strftime("%Y%m%d") in csv]
         if csv_file:
@@ -5,7 +5,6 @@ Created on Mon Nov 16 19:39:37 2020
 @author: DAUGY_M
 """
 
-import requests
 import pandas as pd
 from datetime import datetime
 import logging
@@ -16,7 +15,6 @@ from bs4 import BeautifulSoup
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -52,7 +50,7 @@ class JapaneseHokkaidoGenerationStatsJob(EdcJapanJob):
         get all csv links from webpage
         :return: list
         """
-        r = requests.get(self.main_url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(self.main_url)
         soup = BeautifulSoup(r.content, 'html.parser')
         all_links = [self.base_url + elem['href'] for elem in soup.find_all('a', href=True) if
                      ".csv" in elem['href'] or '.xls' in elem['href']]
@@ -69,7 +67,7 @@ class JapaneseHokkaidoGenerationStatsJob(EdcJapanJob):
             df_year = pd.DataFrame()
             all_year_csvs = [link for link in self.all_links if str(csv_year) in link]
             for link in all_year_csvs:
-                r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+                r = self.http.get(link)
                 try:
                     df_link = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=2)
                     df_link = df_link.drop(df_link.index[0])
@@ -9,10 +9,8 @@ from datetime import datetime
 import logging
 import sys
 from zipfile import ZipFile
-import requests
 
 from iea_scraper.core.japan_job import EdcJapanJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -40,7 +38,7 @@ class JapaneseKansaiDemandStatsJob(EdcJapanJob):
         """
         if tdate.strftime("%Y%m%d") not in self.all_demand_dict:
             link = tdate.strftime(self.url)
-            r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(link)
             zip = ZipFile(io.BytesIO(r.content))
             for file in zip.namelist():
                 df = pd.DataFrame()
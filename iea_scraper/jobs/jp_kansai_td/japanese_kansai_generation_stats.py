@@ -8,12 +8,10 @@ import io
 import pandas as pd
 import logging
 import sys
-import requests
 
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -53,7 +51,7 @@ class JapaneseKansaiGenerationStatsJob(EdcJapanJob):
         csv_year = tdate.year if tdate.month >= 4 else tdate.year - 1
         if self.year_df_generation[csv_year] is None:
             link = self.main_page_url.format(year=csv_year)
-            r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(link)
             if r.status_code == 200:
                 df_year = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=1)
                 first_row_found = False
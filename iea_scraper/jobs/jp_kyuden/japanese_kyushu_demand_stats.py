@@ -11,11 +11,8 @@ from datetime import datetime
 import logging
 import sys
 
-import requests
-
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -41,8 +38,18 @@ class JapaneseKyushuDemandStatsJob(EdcJapanJob):
         :param date: datetime
         :return: DataFrame
         """
+        df_demand = self.fetch_date(tdate)
+        if df_demand is not None:
+            self.df_demand = df_demand
+
+    def fetch_date(self, tdate):
+        """
+        Downloads the demand csv of one day (without changing the job state)
+        :param tdate: datetime
+        :return: DataFrame, None if the file is not available
+        """
         link = tdate.strftime(self.url)
-        r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(link)
         if r.status_code == 200:
             df = pd.DataFrame()
             j = 1
@@ -51,7 +58,19 @@ class JapaneseKyushuDemandStatsJob(EdcJapanJob):
                     df = pd.read_csv(io.StringIO(r.content.decode('mskanji')), skiprows=j, index_col=False, usecols=[0,1,2,3])
                 except:
                     j += 1
-            self.df_demand = self.find_first_row_of_data(df)
+            return self.find_first_row_of_data(df)
+        return None
+
+    def merge_date(self, tdate, payload):
+        if payload is not None:
+            self.df_demand = payload
+        self.format_df(tdate)
+        if not self.output_df.empty:
+            self.format_all_df()
+            self.check_japan_attributes()
+
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
 
     def format_df(self, tdate):
         if self.df_demand is None:
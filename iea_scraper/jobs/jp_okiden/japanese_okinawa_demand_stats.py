@@ -10,12 +10,10 @@ from datetime import datetime
 import logging
 import sys
 
-import requests
 
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import  EdcJapanJob
 from iea_scraper.core.job import EdcBulkJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -43,13 +41,34 @@ class JapaneseOkinawaDemandStatsJob(EdcJapanJob):
         :return: DataFrame
         """
 
+        df_demand = self.fetch_date(tdate)
+        if df_demand is not None:
+            self.df_demand = df_demand
+
+    def fetch_date(self, tdate):
+        """
+        Downloads the demand csv of one day (without changing the job state)
+        :param tdate: datetime
+        :return: DataFrame, None if the file is not available
+        """
         link = tdate.strftime(self.url)
-        r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(link)
         if r.status_code == 200:
             df = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=1, index_col=False, usecols=[0,1,2,3])
-            self.df_demand = self.find_first_row_of_data(df)
-        else:
-            logger.warning(f"Japan Okinawa: demand data not available on {tdate.date()}")
+            return self.find_first_row_of_data(df)
+        logger.warning(f"Japan Okinawa: demand data not available on {tdate.date()}")
+        return None
+
+    def merge_date(self, tdate, payload):
+        if payload is not None:
+            self.df_demand = payload
+        self.format_df(tdate)
+        if not self.output_df.empty:
+            self.format_all_df()
+            self.check_japan_attributes()
+
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
 
     def format_df(self, tdate):
         if self.df_demand.empty:
@@ -12,11 +12,9 @@ import logging
 from bs4 import BeautifulSoup
 import sys
 
-import requests
 
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.japan_job import EdcJapanJob
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -57,7 +55,7 @@ class JapaneseOkinawaGenerationStatsJob(EdcJapanJob):
         csv_year = tdate.year if tdate.month >= 4 else tdate.year - 1
         if self.year_df_generation[csv_year] is None:
             link = self.url.format(year=csv_year)
-            r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(link)
             if r.status_code == 200:
                 df_link = pd.read_csv(io.StringIO(r.content.decode('mskanji')), header=3)
                 for col in df_link.columns:
@@ -12,10 +12,8 @@ import logging
 from bs4 import BeautifulSoup
 import sys
 
-import requests
 
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -52,7 +50,7 @@ class JapaneseTohokuGenerationStatsJob(EdcJapanJob):
         This method extract allcsv links from webpage and stores them in a list
         :return: list
         """
-        r = requests.get(self.url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(self.url)
         soup = BeautifulSoup(r.content, 'html.parser')
         csv_links = [self.base_url + elem['href'] for elem in soup.find_all('a', href=True) if "Q.csv" in elem['href']]
         return csv_links
@@ -71,7 +69,7 @@ class JapaneseTohokuGenerationStatsJob(EdcJapanJob):
             all_year_csvs = [link for link in self.csv_links if str(csv_year) in link]
             if all_year_csvs:
                 for link in all_year_csvs:
-                    r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+                    r = self.http.get(link)
                     df_link = pd.read_csv(io.StringIO(r.content.decode('mskanji')))
                     df_year = pd.concat([df_year, df_link])
                     df_year = df_year.loc[~df_year['DATE_TIME'].isnull()]
@@ -98,11 +98,38 @@ class MoldovaPowerStatsJob(EdcBulkJob):
             get_df_demand()
         """
        
-        data_generation = self.get_data_generation(tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
+        self.df_dw
+
+    def fetch_date(self, tdate):
+        """
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]: date to be collected
+
+        Output(s):
+            [Tuple]: generation and demand data collected.
+
+        Description:
+            - Requests the data of one day without changing the job state
+        """
+        return self.get_data_generation(tdate), self.get_data_demand(tdate)
+
+    def merge_date(self, tdate, payload):
+        """
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]: date to be collected
+            payload [Tuple]: generation and demand data collected by fetch_date()
+
+        Description:
+            - Parses the data of one day into the generation and demand DataFrames
+        """
+        data_generation, data_demand = payload
         self.get_df_generation(data_generation)
-        data_demand = self.get_data_demand(tdate)
         self.get_df_demand(data_demand)
-        self.df_dw
 
     def get_url(self, metric, tdate):
         """
@@ -146,7 +173,7 @@ class MoldovaPowerStatsJob(EdcBulkJob):
         
         url_generation = self.get_url('Generation', tdate)
 
-        rep = requests.get(url_generation, verify=False).json()
+        rep = self.http.get(url_generation, verify=False).json()
 
         return rep['result']
 
@@ -167,7 +194,7 @@ class MoldovaPowerStatsJob(EdcBulkJob):
 
         url_demand = self.get_url('Demand', tdate)
 
-        rep = requests.get(url_demand, verify=False).json()
+        rep = self.http.get(url_demand, verify=False).json()
 
         return rep['result']
 
@@ -4,6 +4,8 @@ Created on Mon Nov 23 14:14:49 2020
 
 @author: TAV_M
 """
+import io
+
 import pandas as pd
 import sys
 sys.path.append(r'C:\Repos\scraper')
@@ -55,10 +57,23 @@ class JapanesePricesStatsJob(EdcBulkJob):
             self.scrape_jepx_csv(date)
         
     def scrape_jepx_csv(self, date):
-        csv_url = 'http://www.jepx.org/data/'+date.strftime('%Y%m%d')+'.csv'
-        self.df_prices_day = pd.read_csv(csv_url)
+        self.merge_date(date, self.fetch_date(date))
+
+    def fetch_date(self, tdate):
+        """
+        Downloads the prices csv of one day (without changing the job state)
+        :param tdate: datetime
+        :return: DataFrame
+        """
+        csv_url = 'http://www.jepx.org/data/'+tdate.strftime('%Y%m%d')+'.csv'
+        r = self.http.get(csv_url)
+        r.raise_for_status()
+        return pd.read_csv(io.BytesIO(r.content))
+
+    def merge_date(self, tdate, payload):
+        self.df_prices_day = payload
         self.format_df()
-        logger.info(f'{date.date()} was scraped')
+        logger.info(f'{tdate.date()} was scraped')
 
     @property
     def offset_now(self):
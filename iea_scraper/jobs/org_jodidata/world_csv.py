@@ -76,7 +76,7 @@ class WorldCsvJob(ExtDbApiJobV2):
                          source=source.code,
                          frequency=self.frequency,
                          original=True))
-            self.data.extend(df.to_dict('records'))
+            self.data.append(df)
             logger.debug("data transformation complete.")
 
     @staticmethod
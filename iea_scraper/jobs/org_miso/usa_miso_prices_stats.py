@@ -5,7 +5,6 @@ Created on Mon Nov 16 19:39:37 2020
 @author: NGHIEM_A
 """
 import io
-import requests
 from datetime import datetime
 import pandas as pd
 from datetime import datetime, timedelta
@@ -15,7 +14,7 @@ import xlrd
 import numpy as np
 
 
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS, FILE_STORE_PATH
+from iea_scraper.settings import FILE_STORE_PATH
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -84,10 +83,11 @@ class UsaMisoPricesStatsJob(EdcBulkJob):
     def get_prices(self, tdate):
         '''
         This method creates the xls url using the date in parameter and downloads the data from the Excel file
+        (one file per day, so that several days can be downloaded at the same time)
         '''
         link = tdate.strftime(format=self.miso_url)
-        r = requests.get(link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
-        with open(FILE_STORE_PATH / 'miso_data.xls' , 'wb') as output:
+        r = self.http.get(link)
+        with open(FILE_STORE_PATH / tdate.strftime('miso_data_%Y%m%d.xls'), 'wb') as output:
             output.write(r.content)
             df = pd.DataFrame(self.get_data_from_excel(output.name))
             output.close()
@@ -115,9 +115,19 @@ class UsaMisoPricesStatsJob(EdcBulkJob):
         df = df.drop(columns=['Hour'])
         self.output_df = pd.concat([df, self.output_df])
 
+    def fetch_date(self, tdate):
+        """
+        Downloads the prices of one day (without changing the job state)
+        :param tdate: datetime
+        :return: DataFrame
+        """
+        return self.get_prices(tdate)
+
+    def merge_date(self, tdate, payload):
+        self.format_df(payload, tdate)
+
     def run_date(self, tdate):
-        df = self.get_prices(tdate)
-        self.format_df(df, tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 
 if __name__ == '__main__':
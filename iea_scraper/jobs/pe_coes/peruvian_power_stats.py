@@ -4,13 +4,11 @@ Created on Mon Nov 16 19:39:37 2020
 ``
 @author: DAUGY_M
 """
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
 import sys
 
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -50,18 +48,16 @@ class PeruvianPowerStatsJob(EdcBulkJob):
         :return: json
         """
 
-        r = requests.session()
-        r.verify = SSL_CERTIFICATE_PATH
         json_data = {}
         if metric == 'Generation':
-            response_url = r.post(self.urls[metric], data={
+            response_url = self.http.post(self.urls[metric], data={
                 'fechaInicial': tdate.strftime("%d/%m/%Y"),
                 'fechaFinal': tdate.strftime("%d/%m/%Y"),
                 'indicador': 0
             })
             json_data = response_url.json()['GraficoTipoCombustible']['Series']
         elif metric == 'Demand':
-            response_url = r.post(self.urls[metric], data={
+            response_url = self.http.post(self.urls[metric], data={
                 'fechaInicial': (tdate - timedelta(days=1)).strftime("%d/%m/%Y"),
                 'fechaFinal': tdate.strftime("%d/%m/%Y"),
             })
@@ -113,12 +109,22 @@ class PeruvianPowerStatsJob(EdcBulkJob):
         df_dw = pd.concat([self.output_df['Generation'], self.output_df['Demand']], sort=True)
         return df_dw
 
-    def run_date(self, tdate):
-        for metric in self.urls:
-            json_data = self.get_json_data(tdate, metric)
-            self.output_df[metric] = pd.concat([self.output_df[metric], 
+    def fetch_date(self, tdate):
+        """
+        Downloads the generation and demand jsons of one day (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {metric: json}
+        """
+        return {metric: self.get_json_data(tdate, metric) for metric in self.urls}
+
+    def merge_date(self, tdate, payload):
+        for metric, json_data in payload.items():
+            self.output_df[metric] = pd.concat([self.output_df[metric],
                                                 self.format_data(json_data, metric)])
 
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
 
 if __name__ == '__main__':
     folder = r'C:\Repos\world_electricity_scraper\csvs'
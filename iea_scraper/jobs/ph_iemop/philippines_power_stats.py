@@ -4,7 +4,6 @@ Created on Mon Nov 16 19:39:37 2020
 ``
 @author: NGHIEM_A
 """
-import requests
 import pandas as pd
 import xml.etree.ElementTree as et
 from datetime import datetime, timedelta
@@ -53,8 +52,8 @@ class PhilippinesPowerStatsJob(EdcBulkJob):
              'sort': '',
              'page': '1',
              'post_id': '5754'}
-        r = requests.post('https://www.iemop.ph/wp-admin/admin-ajax.php', 
-                          data=form_data, verify=False)
+        r = self.http.post('https://www.iemop.ph/wp-admin/admin-ajax.php', 
+                           data=form_data, verify=False)
         key_to_files_dict = eval(r.text)['data']
         datetime_to_key = {datetime.strptime(value['date'], '%d %B %Y %H:%M'): 
                            {'key': key, 'filename': value['filename']}
@@ -84,7 +83,7 @@ class PhilippinesPowerStatsJob(EdcBulkJob):
         url : string
         Converts url into zip into csv and eventually returns dataframe
         '''   
-        r = requests.get(url, verify=False)
+        r = self.http.get(url, verify=False)
         zip_file = ZipFile(io.BytesIO(r.content))
         filename = zip_file.namelist()[0]
         df = pd.read_csv(zip_file.open(filename))
@@ -24,6 +24,8 @@
     - ВИЭ: Renewables?
 """
 
+import io
+from copy import copy
 import pandas as pd
 from datetime import  timedelta
 import logging
@@ -115,11 +117,47 @@ class RussianPowerStatsUpsJob(EdcBulkJob):
             get_data_generation()
 
         """
-        self.get_data_prices(tdate)
-        self.get_data_demand(tdate)
-        self.get_data_generation(tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
+
+    def fetch_date(self, tdate):
+        """
+        Collects the data of one day into a copy of the job (without changing the job state)
+
+        Input(s):
+            tdate [datetime]: date to be collected
+
+        Output(s):
+            data_dict [Dict]: dictionary with the DataFrame of the day assigned as a value to the metric key
+        """
+        day = copy(self)
+        day.data_dict = {metric: pd.DataFrame() for metric in self.metrics}
+        day.get_data_prices(tdate)
+        day.get_data_demand(tdate)
+        day.get_data_generation(tdate)
+        return day.data_dict
+
+    def merge_date(self, tdate, payload):
+        for metric, df in payload.items():
+            self.data_dict[metric] = pd.concat([self.data_dict[metric], df])
         self.df_dw
 
+    def download(self, url):
+        """
+        Called by get_data_prices(), get_data_demand() and get_data_generation()
+
+        Input(s):
+            url [Str]: url of the *.xml file
+
+        Output(s):
+            [Bytes]: content of the file
+
+        Description:
+            - downloads the file through self.http (limit per host, deadline of the day, proxy and retries)
+        """
+        r = self.http.get(url)
+        r.raise_for_status()
+        return r.content
+
     def get_data_prices(self, tdate):
         """
         Called by run_date()
@@ -141,7 +179,7 @@ class RussianPowerStatsUpsJob(EdcBulkJob):
         ]
         url =  ''.join(url_components)
 
-        df_prices_raw = pd.read_xml(url)
+        df_prices_raw = pd.read_xml(io.BytesIO(self.download(url)))
         
         df_prices_raw['Region'] = df_prices_raw['POWER_SYS_ID'].map(self.power_systems_mapping)
         df_prices_raw['Value'] = df_prices_raw['AVERAGE_PRICE']
@@ -173,7 +211,7 @@ class RussianPowerStatsUpsJob(EdcBulkJob):
         ]
         url =  ''.join(url_components)
 
-        df_demand_raw = pd.read_xml(url)
+        df_demand_raw = pd.read_xml(io.BytesIO(self.download(url)))
         df_demand_raw = df_demand_raw.rename(
             columns={
                 'E_USE_FACT': 'Actual',
@@ -231,7 +269,7 @@ class RussianPowerStatsUpsJob(EdcBulkJob):
         '&territoriesIds=-1:null,1:null,2:null,null:530000,null:550000,null:600000,null:610000,null:630000,null:840000&notCheckedColumnsNames='
         ]
         url =  ''.join(url_components)
-        df_gen_raw = pd.read_xml(url)
+        df_gen_raw = pd.read_xml(io.BytesIO(self.download(url)))
         df_gen_raw['local_datetime'] = tdate + timedelta(hours=1) * (df_gen_raw['INTERVAL'])
 
         df_gen = pd.melt(df_gen_raw, 
@@ -1,3 +1,5 @@
+import io
+from copy import copy
 import pandas as pd
 from datetime import date, datetime, timedelta
 import numpy as np
@@ -38,7 +40,9 @@ class SingaporePowerStatsJob(EdcBulkJob):
         url = f"https://www.emcsg.com/marketdata/{endpoint}"
         #output can be checked against: https://www.emcsg.com/PriceInformation#download
         
-        df_final_prices_table = pd.read_html(url)
+        r = self.http.get(url)
+        r.raise_for_status()
+        df_final_prices_table = pd.read_html(io.StringIO(r.text))
         numberTables = df_final_prices_table.__len__()
         df_load_prices = df_final_prices_table[numberTables - 1]
 
@@ -126,9 +130,24 @@ class SingaporePowerStatsJob(EdcBulkJob):
         #self.scrape_generation(date_start, date_end)
         self.to_csv(folder)
 
+    def fetch_date(self, tdate):
+        """
+        Scrapes the prices and load of one day into a copy of the job (without changing the job state)
+        :param tdate: datetime
+        :return: tuple (load, prices) DataFrames
+        """
+        day = copy(self)
+        day.scrape_load_price_daily(tdate)
+        return day.df_load_daily, day.df_prices_daily
+
+    def merge_date(self, tdate, payload):
+        self.df_load_daily, self.df_prices_daily = payload
+        self.df_load = pd.concat([self.df_load, self.df_load_daily], axis=0)
+        self.df_prices = pd.concat([self.df_prices, self.df_prices_daily], axis=0)
+
     def run_date(self, tdate):        
         #self.scrape_generation_period(scrap_day, scrap_day)
-        self.scrape_load_price_period(tdate, tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 if __name__ == '__main__':
     folder =r'C:\Repos\world_electricity_scraper\csvs'
@@ -1,7 +1,6 @@
 import json
 from datetime import datetime as dt, timedelta
 import pandas as pd
-import requests
 from pandas import json_normalize
 import os
 import logging
@@ -54,20 +53,34 @@ class TurkishPowerStatsJob(EdcBulkJob):
     def offset_now(self):
         return 1
 
-    def get_request_result(self, query):
+    def request_json(self, query):
+        """
+        Requests the service (without changing the job state)
+        :param query: str
+        :return: the body of the JSON answer
+        """
         url = self.link + query
-        response = requests.request("GET", url)
+        response = self.http.get(url)
         json_data = json.loads(response.text.encode('utf8'))
         keys_list = list(json_data['body'].keys())
         key_name = keys_list[0]
-        self.json_data = json_data['body'][f'{key_name}']
+        return json_data['body'][f'{key_name}']
 
-    def get_data(self, date_start, date_end, data_type):
+    def get_request_result(self, query):
+        self.json_data = self.request_json(query)
+
+    def request_data(self, date_start, date_end, data_type):
         if data_type not in ['Generation', 'Demand', 'Prices']:
             raise KeyError("data_type has to  be in ['Generation', 'Demand', 'Prices']")
         query = self.data_types[data_type] + "?startDate=" + f'{date_start.strftime("%Y-%m-%d")}' + \
                 "&endDate=" + f'{date_end.strftime("%Y-%m-%d")}'
-        self.get_request_result(query)
+        return self.request_json(query)
+
+    def get_data(self, date_start, date_end, data_type):
+        self.add_data(date_start, date_end, data_type, self.request_data(date_start, date_end, data_type))
+
+    def add_data(self, date_start, date_end, data_type, json_data):
+        self.json_data = json_data
         self.output_dfs[data_type] = json_normalize(self.json_data)
         self.format_data_type[data_type]()
         self.output_all_dfs[data_type] = pd.concat([self.output_dfs[data_type].copy(), self.output_all_dfs[data_type]])
@@ -137,9 +150,20 @@ class TurkishPowerStatsJob(EdcBulkJob):
         df_dw = pd.concat(self.output_all_dfs.values(), axis=0)
         return df_dw
 
+    def fetch_date(self, tdate):
+        """
+        Requests the data of one day (without changing the job state)
+        :param tdate: datetime
+        :return: dictionary {data type: JSON data}
+        """
+        return {data_type: self.request_data(tdate, tdate, data_type) for data_type in self.data_types}
+
+    def merge_date(self, tdate, payload):
+        for data_type, json_data in payload.items():
+            self.add_data(tdate, tdate, data_type, json_data)
+
     def run_date(self, tdate):
-        for data_type in self.data_types:
-            self.get_data(tdate, tdate, data_type)
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ Created on Mon Nov 16 19:39:37 2020
 @author: NGHIEM_A
 """
 
+import io
 import pandas as pd
 import logging
 from datetime import datetime
@@ -47,7 +48,9 @@ class TaiwanesePowerStatsJob(EdcBulkJob):
 
     def get_column_names(self):
         '''Get column names from html to use in the csv import'''
-        df_lst = pd.read_html(self.url)
+        r = self.http.get(self.url)
+        r.raise_for_status()
+        df_lst = pd.read_html(io.StringIO(r.text))
         first_lst = [df_lst[0].iloc[i,0] for i in range(len(df_lst[0]))]
         df2 = df_lst[1]
         df2 = df2.loc[~((df2['Power generation (MW)']=='Nuclear') & (df2['Power generation (MW).1'].isnull()))]
@@ -58,7 +61,9 @@ class TaiwanesePowerStatsJob(EdcBulkJob):
         return ['local_date']+ first_lst + [''] + second_lst    
 
     def retrieve_csv(self):
-        df = pd.read_csv(self.url_csv, header=None)
+        r = self.http.get(self.url_csv)
+        r.raise_for_status()
+        df = pd.read_csv(io.BytesIO(r.content), header=None)
         # df = df.iloc[:, :-1] #remove last column
         df.columns = self.get_column_names()
         df['local_date'] = pd.to_datetime(df['local_date'], format='%Y%m%d')
@@ -8,7 +8,6 @@ Ukrainian power data:
 - Power Demand
 
 """
-import requests
 import pandas as pd
 from datetime import timedelta
 import logging
@@ -22,7 +21,6 @@ logger.setLevel(logging.DEBUG)
 sys.path.append(r'C:\Repos\scraper')
 from iea_scraper.core.job import EdcBulkJob
 from iea_scraper.core import factory
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 
 class UkrainianPowerStatsJob(EdcBulkJob):
@@ -92,7 +90,34 @@ class UkrainianPowerStatsJob(EdcBulkJob):
             transform_to_df()
         """
 
-        data_json = self.request_data(tdate)
+        self.merge_date(tdate, self.fetch_date(tdate))
+
+    def fetch_date(self, tdate):
+        """
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]: date to be collected
+
+        Output(s):
+            data_json [Dict]: Dictionary with data collected.
+
+        Description:
+            - Requests the data of one day without changing the job state
+        """
+        return self.request_data(tdate)
+
+    def merge_date(self, tdate, data_json):
+        """
+        Called by run_date() and EdcBulkJob.run_dates()
+
+        Input(s):
+            tdate [datetime]: date to be collected
+            data_json [Dict]: dictionary with data collected from the request
+
+        Description:
+            - Formats the data of one day and adds it to the output DataFrame
+        """
         if len(data_json):
             self.transform_to_df(tdate, data_json)
             logger.info(f'UKREnergo: data collected for {tdate.date()}')
@@ -114,17 +139,13 @@ class UkrainianPowerStatsJob(EdcBulkJob):
             - Requests the data for both generation and demand at the same time
         """
 
-        self.postdata = {
+        postdata = {
             'action': 'get_data_oes',
             'report_date': tdate.strftime("%d.%m.%Y"),
             'type': 'day'
         }
 
-        response = requests.post(
-            self.url,
-            self.postdata,
-            headers=REQUESTS_HEADERS,
-            verify=SSL_CERTIFICATE_PATH)
+        response = self.http.post(self.url, postdata)
         if response.status_code != 200:
             raise EdcJobError(f'UKR ENERGO: request data not available on {tdate.date()}')
         else:
@@ -5,20 +5,25 @@ import time
 import enum
 import traceback
 from calendar import monthrange
-from typing import List, Dict, NoReturn
+from pathlib import Path
+from typing import List, Dict, NoReturn, TYPE_CHECKING
 from unittest.mock import patch
-from sqlalchemy import create_engine
 
 import pandas as pd
 import requests
-from selenium import webdriver
-from selenium.webdriver.remote.webdriver import BaseWebDriver
 
-from iea_scraper.core import factory
+from iea_scraper.core import factory, metrics
+from iea_scraper.core.db import get_engine
+from iea_scraper.core.reference_index import map_area
+from iea_scraper.core.run_history import get_run_history_store
+from iea_scraper.core.scheduler import schedule
 from iea_scraper.core.ts import mapping
-from iea_scraper.core.utils import get_dimension_db_data, send_message
+from iea_scraper.core.utils import get_dimension_db_data, send_message, stream_to_file
 from iea_scraper.settings import WEBDRIVER_PATH, FILE_STORE_PATH, MAIL_RECIPIENT, EXT_DB_STR, MAIL_DEFAULT_SENDER
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import BaseWebDriver
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +33,8 @@ def scrape_and_report(provider_code: str,
                       mail_to=MAIL_RECIPIENT) -> Dict[str, object]:
     """
     Run the scraper and report the result.
+    The run is saved in the run history (see core.run_history) with the duration of each stage of the job,
+    and the metrics of its stages are exported (see core.metrics) and summarised in the returned status.
 
     :param provider_code: the provider code. It should correspond to the package name of the scraper job.
     :param source_code: the source code. It should correspond to the module name of the scraper job.
@@ -36,6 +43,9 @@ def scrape_and_report(provider_code: str,
     :return: a dictionary with information about the job execution.
     """
     status = dict()
+    job = None
+    # a worker process runs several jobs: each one starts from fresh dimension data (or the shared snapshots)
+    get_dimension_db_data.cache_clear()
     try:
         # The factory will load the module and instantiate scraper class accordingly
         ts_begin = datetime.datetime.now()
@@ -64,9 +74,86 @@ def scrape_and_report(provider_code: str,
         send_message(f"{process.upper()} ERROR", exception_description, 
                      mail_to=mail_to,  mail_from=mail_from)
     finally:
+        stages = getattr(job, "stages", None)
+        status["stages"] = metrics.summarize(stages)
+        record_run(f"{provider_code}.{source_code}", ts_begin, status.get("status", "ERROR"),
+                   (datetime.datetime.now() - ts_begin).total_seconds(), stages)
         return status
 
 
+def record_run(job_name: str, started: datetime.datetime, status: str, duration: float, stages=None) -> NoReturn:
+    """
+    Saves a run in the run history and exports its stage metrics (see core.metrics),
+    logging (but not raising) errors: neither must ever fail a job.
+    """
+    try:
+        get_run_history_store().record(job_name, started, status, duration, stages)
+    except Exception:
+        logger.exception(f"Could not save the run of {job_name} in the run history")
+    metrics.export(job_name, started, status, duration, stages)
+
+
+def format_seconds(seconds) -> str:
+    """Formats a number of seconds like the durations of the reports, None if unknown."""
+    return None if seconds is None else str(datetime.timedelta(seconds=round(seconds)))
+
+
+def scrape_and_report_all(jobs,
+                          after: Dict[str, List[str]] = None,
+                          **kwargs) -> List[Dict[str, object]]:
+    """
+    Runs scrape_and_report() for several jobs in parallel processes (see core.scheduler.schedule).
+    Jobs start from the longest expected (median duration of their latest runs in the run history),
+    jobs never run successfully before starting first: so that a long job does not start last.
+
+    :param jobs: a list of job parameters (provider_code, source_code and optionally mail_from, mail_to),
+                 or a dictionary {name: job parameters}. Jobs of a list are named '<provider_code>.<source_code>'.
+    :param after: ordering constraints {name: names of the jobs to run before}.
+    :param kwargs: forwarded to schedule() (max_workers, max_per_provider).
+    :return: the report rows, in the order of jobs, with the expected duration of each job.
+    """
+    if not isinstance(jobs, dict):
+        names = [f"{params['provider_code']}.{params['source_code']}" for params in jobs]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Jobs listed more than once: {sorted(duplicates)}")
+        jobs = dict(zip(names, jobs))
+    expected = expected_durations(jobs)
+    priority = sorted(jobs, key=lambda name: -float('inf') if expected[name] is None else -expected[name])
+    logger.info(f"Job start order: {priority}")
+    futures = schedule(jobs, scrape_and_report, after=after, priority=priority, **kwargs)
+    report = []
+    for name, future in futures.items():
+        try:
+            status = future.result()
+        except Exception:
+            # the worker process died before scrape_and_report() could report
+            logger.exception(f"Error when running scraper {name}")
+            params = jobs[name]
+            status = {"timestamp": datetime.datetime.now().isoformat(),
+                      "process": f"{params['provider_code']} - {params['source_code']}",
+                      "status": "ERROR",
+                      "duration": None}
+        status["expected_duration"] = format_seconds(expected[name])
+        report.append(status)
+    return report
+
+
+def expected_durations(jobs: Dict[str, Dict[str, object]]) -> Dict[str, float]:
+    """
+    Expected duration of each job from the run history.
+    :param jobs: dictionary {name: job parameters}.
+    :return: dictionary {name: seconds or None if unknown}.
+    """
+    try:
+        store = get_run_history_store()
+        return {name: store.expected_duration(f"{params['provider_code']}.{params['source_code']}")
+                for name, params in jobs.items()}
+    except Exception:
+        logger.exception("Could not read the run history")
+        return {name: None for name in jobs}
+
+
 def send_report(report: List[Dict[str, object]],
                 mail_subject: str,
                 html_template: str,
@@ -82,7 +169,9 @@ def send_report(report: List[Dict[str, object]],
     :return: NoReturn
     """
     df = pd.DataFrame(report)
-    df = df[["timestamp", "process", "status", "duration"]]
+    columns = ["timestamp", "process", "status", "duration"]
+    columns += [column for column in ("expected_duration", "stages") if column in df.columns]
+    df = df[columns]
     table = df.to_html(index=False)
     html_content = html_template.replace("@@@TABLE@@@", table)
     send_message(subject=mail_subject,
@@ -109,15 +198,18 @@ class BrowserType(enum.Enum):
     Firefox = 2
 
 
-def get_driver(headless=True, browser=BrowserType.Chrome) -> BaseWebDriver:
+def get_driver(headless=True, browser=BrowserType.Chrome) -> 'BaseWebDriver':
     """
     :param: headless: if True (default), browser opened in background without visible windows.
     :param: browser: defines the browser to use . Options are listed in BrowserType enumeration.
                      BrowserType.Chrome is the default.
     :return: an instance of selenium Chrome webdriver.
     """
+    # selenium is only imported by the jobs driving a browser
+    from selenium import webdriver
+
     logger.debug(f'headless: {headless} browser choice: {browser} ')
-    driver: BaseWebDriver = None
+    driver: 'BaseWebDriver' = None
 
     if browser == BrowserType.Chrome:
         chrome_options = webdriver.chrome.options.Options()
@@ -283,15 +375,17 @@ def map_and_scale_unit(df, current, code, scale=1):
 
 
 def convert_area_to_code(df, iso='iso_alpha_3', to_area=False):
+    """
+    Replaces the area (or to_area) column of df by the area codes (None for unknown areas),
+    moved to the last column.
+    :param iso: the field of the area dimension matching the column.
+    """
     column = 'area'
     if to_area:
         column = 'to_area'
-    areas = get_dimension_db_data('area')
-    areas = pd.DataFrame(areas)[['code', iso]]
-    df = pd.merge(df, areas, left_on=column, right_on=iso, how='left')
-    del df[iso], df[column]
-    df.loc[df['code'].isnull(), 'code'] = None
-    df.rename(columns={'code': column}, inplace=True)
+    codes = map_area(df[column], iso)
+    df = df.drop(columns=column)
+    df[column] = codes
     return df
 
 
@@ -334,14 +428,13 @@ def ftp_fetch_file_through_http_proxy(host, user, password, remote_filepath, htt
             return request.url
 
     logger.debug(f'downloading {url} through HTTP proxy {http_proxy}')
-    with open(output_filepath, 'w+b') as output_file, patch('requests.packages.urllib3.poolmanager.parse_url',
-                                                            new=parse_url_mock):
+    with patch('requests.packages.urllib3.poolmanager.parse_url', new=parse_url_mock):
         session = requests.session()
         session.mount('ftp://', FTPWrappedInFTPAdapter())
-        response = session.get(url)
-        response.raise_for_status()
-        output_file.write(response.content)
-        logger.debug(f'download of {url} completed')
+        with session.get(url, stream=True) as response:
+            response.raise_for_status()
+            _, size = stream_to_file(response, Path(output_filepath))
+        logger.debug(f'download of {url} completed ({size} bytes)')
         return response.headers['last-modified']
 
 
@@ -471,7 +564,7 @@ def reorganize_cci(db_schema: str, table_name: str) -> NoReturn:
     logger.info(f'Reorganizing index {cci_index}...')
     cci_query = f'ALTER INDEX {cci_index} ON {db_schema}.{table_name} REORGANIZE;'
     logger.debug(f'Reorganize index statement: {cci_query}')
-    engine = create_engine(EXT_DB_STR)
+    engine = get_engine(EXT_DB_STR)
     logger.debug(f'Opening connection: {EXT_DB_STR}')
     with engine.begin() as con:
         con.execute(cci_query)
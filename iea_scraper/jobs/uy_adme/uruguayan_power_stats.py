@@ -10,8 +10,8 @@ Uruguayan power data:
 
 """
 import io
+from copy import copy
 
-import requests
 import pandas as pd
 from datetime import timedelta
 import logging
@@ -28,7 +28,6 @@ sys.path.append(r'C:\Repos\iea_scraper')
 from iea_scraper.core.exceptions import EdcJobError
 from iea_scraper.core.job import EdcBulkJob
 from iea_scraper.core import factory
-from iea_scraper.settings import SSL_CERTIFICATE_PATH, REQUESTS_HEADERS
 
 
 class UruguayanPowerStatsJob(EdcBulkJob):
@@ -67,7 +66,7 @@ class UruguayanPowerStatsJob(EdcBulkJob):
                                                             year=next_day.year)
         link = self.url_gen_dem + date_format \
                + "&fecha_fin=" + next_day_format + "&send=MOSTRAR"
-        r = requests.get(url=link, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+        r = self.http.get(link)
         soup = BeautifulSoup(r.content, 'html.parser')
         href_tags = soup.find_all('a', href=True)
         for tag in href_tags:
@@ -88,7 +87,7 @@ class UruguayanPowerStatsJob(EdcBulkJob):
         """
         self.get_data_url(tdate)
         if self.data_url is not None:
-            r = requests.get(url=self.data_url, verify=SSL_CERTIFICATE_PATH, headers=REQUESTS_HEADERS)
+            r = self.http.get(self.data_url)
             if r.status_code == 200:
                 df_data = pd.read_excel(io.BytesIO(r.content), engine='odf', header=2)
                 self.input_df = df_data
@@ -125,7 +124,7 @@ class UruguayanPowerStatsJob(EdcBulkJob):
         @return: pd.DataFrame or warning
         '''
 
-        r = requests.get(self.url_prices.format(year=tdate.year, month=tdate.month))
+        r = self.http.get(self.url_prices.format(year=tdate.year, month=tdate.month))
         if r.status_code == 200 and "failed" not in r.text:
             soup = BeautifulSoup(r.content, 'html.parser')
             table = soup.find(attrs={'class': 'table'})
@@ -158,10 +157,25 @@ class UruguayanPowerStatsJob(EdcBulkJob):
     def df_dw(self):
         return pd.concat([self.df_gen_dem, self.df_prices])
 
-    def run_date(self, tdate):
-        self.get_demand_generation_data_from_url(tdate)
+    def fetch_date(self, tdate):
+        """
+        Downloads the demand, generation and prices of one day (without changing the job state)
+        @param tdate: datetime
+        @return: tuple (demand and generation DataFrame or None, prices DataFrame)
+        """
+        day = copy(self)
+        day.input_df, day.data_url, day.df_prices = None, None, pd.DataFrame()
+        day.get_demand_generation_data_from_url(tdate)
+        day.get_prices_data(tdate)
+        return day.input_df, day.df_prices
+
+    def merge_date(self, tdate, payload):
+        self.input_df, df_prices = payload
         self.format_demand_generation_data()
-        self.get_prices_data(tdate)
+        self.df_prices = pd.concat([self.df_prices, df_prices])
+
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
 
 if __name__ == '__main__':
 
@@ -7,7 +7,6 @@ Created on Mon Nov 16 19:39:37 2020
 import io
 
 import numpy as np
-import requests
 import pandas as pd
 from datetime import datetime
 import logging
@@ -15,7 +14,6 @@ import sys
 
 from iea_scraper.core import factory
 from iea_scraper.core.exceptions import EdcJobError
-from iea_scraper.settings import SSL_CERTIFICATE_PATH
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -83,7 +81,7 @@ class SouthAfricanPowerStatsJob(EdcBulkJob):
         @param metric: str (demand or generation)
         @param tdate: datetime
         """
-        r = requests.get(tdate.strftime(self.urls[metric]), verify=SSL_CERTIFICATE_PATH)
+        r = self.http.get(tdate.strftime(self.urls[metric]))
         if r.status_code == 404:
             raise EdcJobError(f"South Africa: {metric} data not available for {tdate.date()}")
         else:
@@ -1,6 +1,6 @@
 from iea_scraper.core.utils import config_logging
 from iea_scraper.settings import (LOGGING_DAILY)
-from iea_scraper.jobs.utils import scrape_and_report, send_report, reorganize_cci
+from iea_scraper.jobs.utils import scrape_and_report_all, send_report, reorganize_cci
 import logging
 config_logging(LOGGING_DAILY)
 logger = logging.getLogger()
@@ -89,14 +89,13 @@ tr:nth-child(even){background-color: #f2f2f2}
 
 
 def main():
-    # '**job_parameter' fills the parameters of scrape_and_report()
-    # with entries from job_parameter dict (provider_code, source_code)
-    report = [scrape_and_report(**job_parameter) for job_parameter in job_list]
+    # jobs run in parallel processes (see settings.SCHEDULER_*), report rows keep the list order
+    report = scrape_and_report_all(job_list)
 
     # send report based on list of status
     send_report(report, "[IEA-External-DB] Daily Extractions Report", html_report)
 
-    # reorganize CCI of FACT_datapoint
+    # reorganize CCI of FACT_datapoint, once all the jobs loading it have finished
     reorganize_cci('main', 'FACT_datapoint')
 
 
@@ -1,6 +1,6 @@
 from iea_scraper.core.utils import config_logging
 from iea_scraper.settings import (LOGGING_EDC_GAS_DAILY, EDC_MAILING_LIST, EDC_DAILY_JOBS_BATCH_GAS_OTHERS, MAIL_EDC_SENDER)
-from iea_scraper.jobs.utils import scrape_and_report, send_report
+from iea_scraper.jobs.utils import scrape_and_report_all, send_report
 
 import logging
 
@@ -55,10 +55,8 @@ def main():
     for d in job_list:
         d.update({'mail_to': EDC_MAILING_LIST})
 
-    # '**job_parameter' fills the parameters of scrape_and_report()
-    # with entries from job_parameter dict (provider_code, source_code, mail_to)
-    # where mail_to is optional and defaults to settings.MAIL_RECIPIENT if not present.
-    report = [scrape_and_report(**job_parameter) for job_parameter in job_list]
+    # jobs run in parallel processes (see settings.SCHEDULER_*), report rows keep the list order
+    report = scrape_and_report_all(job_list)
 
     # send report based on list of status
     send_report(report=report,
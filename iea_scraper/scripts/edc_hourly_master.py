@@ -1,6 +1,6 @@
 from iea_scraper.core.utils import config_logging
 from iea_scraper.settings import LOGGING_EDC_HOURLY, EDC_MAILING_LIST, EDC_HOURLY_JOBS
-from iea_scraper.jobs.utils import scrape_and_report, send_report
+from iea_scraper.jobs.utils import scrape_and_report_all, send_report
 from datetime import datetime
 
 import logging
@@ -54,9 +54,8 @@ def main():
     for d in EDC_HOURLY_JOBS.values():
         d.update({'mail_to': EDC_MAILING_LIST})
 
-    # '**job_parameter' fills the parameters of scrape_and_report()
-    # with entries from job_parameter dict (provider_code, source_code)
-    report = [scrape_and_report(**job_parameter) for job_parameter in EDC_HOURLY_JOBS.values()]
+    # jobs run in parallel processes (see settings.SCHEDULER_*), report rows keep the list order
+    report = scrape_and_report_all(EDC_HOURLY_JOBS)
     now = datetime.now()
     if now.hour == 1:
         # send report based on list of status
@@ -82,7 +82,8 @@ def populate_db_by_date(start_date=None, end_date=None, db_str=None, folder=None
                     logger.warning(f'{job} stopped after {error_tolerance} consecutive errors')
 
 def populate_db_by_batch(start_date=None, end_date=None, db_str=None, folder=None,
-                         batch_days=20, error_tolerance=7, jobs=EDC_ALL_DAILY_JOBS.values()):
+                         batch_days=20, error_tolerance=7, jobs=EDC_ALL_DAILY_JOBS.values(),
+                         checkpoint_folder=None):
     '''
     Parameters
     ----------
@@ -98,32 +99,26 @@ def populate_db_by_batch(start_date=None, end_date=None, db_str=None, folder=Non
         Number of days per batch. The default is 20.
     error_tolerance : int, optional
         Number of consecutive errors before the scraper stops. The default is 7.
+    checkpoint_folder : str, optional
+        Folder of the checkpoint files (one per job) used to resume an interrupted run.
+        If None, no checkpoint. The default is None.
 
     '''
-    start_date = datetime(1900,1,1) if start_date is None else start_date
-    end_date = datetime(2500,1,1) if end_date is None else end_date
-    
     for job_params in jobs:
+        job = None
         try:
-            errors=0
             job = factory.get_scraper_job(**job_params)
             logger.warning(f'Launching {job} at {datetime.now()}')
-            end_date_batch = min(job.last_available_date, end_date)
-            start_date_batch = end_date_batch - timedelta(days=batch_days - 1)
-            while end_date_batch >= start_date and errors < error_tolerance:
-                job = factory.get_scraper_job(**job_params)
-                if job.bulk:
-                    job.bulk_run(start_date=start_date_batch, end_date=end_date_batch, 
-                                 db_str=db_str, error_tolerance=error_tolerance)
-                    if folder is not None:
-                        job.df_dw_processed.to_csv(os.path.join(folder, f'{job.name}_{start_date.date()}_{end_date.date()}.csv'))
-                    errors = (job.earliest_available_date - start_date_batch).days
-                    logger.warning(f'{job} completed batch between {start_date_batch.date()} and {end_date_batch.date()} with {errors} errors')
-                    end_date_batch = start_date_batch - timedelta(days=1)
-                    start_date_batch = end_date_batch - timedelta(days=batch_days - 1)
-                    logger.warning(f'{job} completed with earliest date {job.earliest_available_date.date()}')
+            if job.bulk:
+                checkpoint = None if checkpoint_folder is None \
+                    else os.path.join(checkpoint_folder, f'{job.name}.checkpoint')
+                job.bulk_run_by_batches(batch_days, start_date=start_date, end_date=end_date,
+                                        error_tolerance=error_tolerance, db_str=db_str, folder=folder,
+                                        checkpoint=checkpoint)
+                logger.warning(f'{job} completed with earliest date {job.earliest_available_date.date()}')
         except Exception as e:
-            logger.warning(f'{job} failed with earliest scraped date {job.earliest_available_date}. Error: {e}')
+            logger.warning(f'{job} failed with earliest scraped date '
+                           f'{getattr(job, "earliest_available_date", None)}. Error: {e}')
 
 def run_many_years_and_countries(start_end_countries, db_str=EXT_DB_STR, 
                                  folder=None, parallelise=None, job_type=None):
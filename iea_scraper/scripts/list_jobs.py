@@ -1,20 +1,32 @@
-from pathlib import Path
+import argparse
 
+from iea_scraper.core import registry
 
-def list_jobs():
+
+def list_jobs(job_type=None, rebuild=False):
     """
-    List existing jobs.
+    List existing jobs, from the job registry (see core.registry).
+    :param job_type: if given, only the jobs of this type ('Edc', 'ExtDb', 'Dedicated', 'Base').
+    :param rebuild: if True, rebuild the registry first.
     :return: NoReturn
     """
+    if rebuild:
+        registry.get_registry.cache_clear()
+        registry.save_registry()
+    jobs = registry.list_jobs(job_type)
+    print(f'Currently {len(jobs)} jobs are available:')
 
-    path = Path('iea_scraper') / 'jobs'
-
-    job_list = [f for f in path.glob("**/*.py") if f.stem not in ['__init__', 'utils']]
-    print(f'Currently {len(job_list)} jobs are available:')
-
-    for f in job_list:
-        print(f' provider_code: {f.parent.name}, scraper_name: {f.stem}')
+    for key, job in jobs.items():
+        provider_code, source_code = key.split('.')
+        schedule = f", schedule: {', '.join(job['schedule'])}" if job['schedule'] else ''
+        print(f" provider_code: {provider_code}, scraper_name: {source_code}, type: {job['type']}, "
+              f"title: {job['title']}{schedule}")
 
 
 if __name__ == "__main__":
-    list_jobs()
+    parser = argparse.ArgumentParser(description="List the scraper jobs.")
+    parser.add_argument("--type", choices=sorted(set(registry.JOB_TYPES.values())),
+                        help="Only list the jobs of this type.")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the job registry.")
+    args = parser.parse_args()
+    list_jobs(args.type, args.rebuild)
@@ -1,7 +1,7 @@
 import logging
 from typing import List, Dict, NoReturn
-from sqlalchemy import create_engine
 
+from iea_scraper.core.db import get_engine
 from iea_scraper.core.utils import config_logging
 from iea_scraper.settings import (EXT_DB_STR,
                                   LOGGING_DAILY)
@@ -30,7 +30,7 @@ def rebuild_cci(db_schema: str, table_name: str) -> NoReturn:
     logger.info(f'Rebuilding index {cci_index}...')
     cci_query = f'ALTER INDEX {cci_index} ON {db_schema}.{table_name} REBUILD;'
     logger.debug(f'Rebuild index statement: {cci_query}')
-    engine = create_engine(EXT_DB_STR)
+    engine = get_engine(EXT_DB_STR)
     logger.debug(f'Opening connection: {EXT_DB_STR}')
     with engine.begin() as con:
         con.execute(cci_query)
@@ -4,6 +4,7 @@ import argparse
 from iea_scraper.settings import LOGGING_DAILY
 from iea_scraper.core.utils import config_logging
 from iea_scraper.core import factory
+from iea_scraper.core.job import ExtDbApiJob, ExtDbApiJobV2
 
 config_logging(LOGGING_DAILY)
 logger = logging.getLogger()
@@ -28,6 +29,14 @@ def parse_arguments():
     parser.add_argument("--sequential_download", action="store_true",
                         help='Download files sequentially. '
                              'Without this option, it will typically download in parallel.')
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume the latest failed run of the scraper: skip the stages it completed "
+                             "and continue the upload from the first batch not loaded. "
+                             "Only the runs started with --checkpoint (or settings.RUN_CHECKPOINTS) "
+                             "can be resumed. External DB API jobs only.")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Record the progress of the run, so that it can be resumed with --resume if it fails "
+                             "(see settings.RUN_CHECKPOINTS). External DB API jobs only.")
     parser.add_argument("--verbose", action="store_true",
                         help="Shows more detailed information.")
     return parser.parse_args()
@@ -44,6 +53,15 @@ def main():
     logger.info(f'Loading scraper scraper.jobs.{args.provider_code}.{args.scraper_code} '
                 f'{"in full load mode" if args.full_load else "in incremental mode"}.')
     job = factory.get_scraper_job(args.provider_code, args.scraper_code, full_load=args.full_load)
+    if (args.resume or args.checkpoint) and not isinstance(job, (ExtDbApiJob, ExtDbApiJobV2)):
+        raise SystemExit(f"--resume and --checkpoint are only supported by External DB API jobs, "
+                         f"not by {type(job).__name__}.")
+    if args.resume and not job.can_resume():
+        raise SystemExit(f"No failed run of {type(job).__name__} to resume: its last run finished, "
+                         f"or did not record its progress. Start the run with --checkpoint "
+                         f"(or settings.RUN_CHECKPOINTS) to be able to resume it.")
+    if args.checkpoint:
+        job.checkpoints = True
 
     download: bool = not args.no_download
     parallel_download: bool = not args.sequential_download
@@ -52,7 +70,10 @@ def main():
         log_msg += f'{"(sequential download)" if args.sequential_download else "(parallel download)"}.'
     logger.info(log_msg)
 
-    job.run(download=download, parallel_download=parallel_download)
+    if args.resume:
+        job.run(download=download, parallel_download=parallel_download, resume=True)
+    else:
+        job.run(download=download, parallel_download=parallel_download)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,10 @@
 from iea_scraper.core.utils import send_message, config_logging
 from iea_scraper.core import factory
+from iea_scraper.core.db import get_engine
 from iea_scraper.settings import EXT_DB_STR, NEW_DATA_WEEKLY_RECIPIENT, LOGGING_WEEKLY
 
 import datetime
 import pandas as pd
-from sqlalchemy import create_engine
 
 import logging
 
@@ -122,7 +122,7 @@ def scrape_and_report(provider_code, source_code):
 
 
 def alert_upon_new_data():
-    engine = create_engine(EXT_DB_STR)
+    engine = get_engine(EXT_DB_STR)
     stmt = """select s.long_name as [source], d.period_fk as [period], d.[affected rows]
     from 
     (select source_fk, period_fk, count(*) [affected rows]
@@ -3,14 +3,40 @@ from iea_scraper.instance import *
 from iea_scraper.instance import EXT_DB_STR
 import pathlib
 import platform
-import pycountry
-import numpy as np
+from functools import lru_cache
 
 # Refinitive APP Key
 REFINITIVE_APP_KEY = f'0b32d069a93849488b1f24f70342382cf1e26523'
 
 ROOT_PATH = pathlib.Path(__file__).absolute().parent.parent
 FILE_STORE_PATH = ROOT_PATH / 'filestore'
+# HTTP validators (ETag, Last-Modified) of downloaded sources, for conditional downloads
+SOURCE_STATE_PATH = FILE_STORE_PATH / 'source_state.db'
+# durations and row counts of past job runs, used to start the longest jobs first in the master scripts
+RUN_HISTORY_PATH = ROOT_PATH / 'logs' / 'run_history.db'
+# number of latest successful runs from which the expected duration of a job is estimated
+RUN_HISTORY_WINDOW = 10
+# metrics of every stage of the job runs (wall and CPU time, rows, HTTP bytes, peak RSS), one JSON line per stage
+# (None to disable)
+METRICS_JSON_PATH = ROOT_PATH / 'logs' / 'metrics.jsonl'
+# folder read by the node-exporter textfile collector, where the metrics of the last run of each job are written
+# (None to disable)
+METRICS_TEXTFILE_PATH = ROOT_PATH / 'logs' / 'textfile_collector'
+# completed stages, acknowledged upload batches and spilled transform output of job runs, to resume a failed run
+RUN_CHECKPOINT_PATH = FILE_STORE_PATH / 'checkpoints' / 'checkpoints.db'
+# if True, External DB API jobs record checkpoints of every run (and spill their transform output), so that any
+# failed run can be resumed; else only the runs started with resume (run_job.py --resume or --checkpoint) do
+RUN_CHECKPOINTS = False
+# the checkpoints and spilled data of the runs started more than this number of days ago are deleted
+RUN_CHECKPOINT_RETENTION_DAYS = 7
+# index of the scraper jobs (module, class, type, title, schedule), generated by core.registry
+JOB_REGISTRY_PATH = FILE_STORE_PATH / 'job_registry.json'
+# snapshots of the External DB API dimensions, shared by the jobs of a master process (see core.dimension_cache)
+DIMENSION_CACHE_PATH = FILE_STORE_PATH / 'dimension_cache'
+# time to live (seconds) of the snapshots of each dimension; the other dimensions are only cached in memory by each job
+DIMENSION_CACHE_TTL = {'area': 12 * 3600, 'period': 12 * 3600, 'product': 12 * 3600, 'flow': 12 * 3600}
+# time to live (seconds) in memory of the other dimensions, so that a long-lived process does not keep stale data
+DIMENSION_MEMORY_TTL = 300
 SSL_CERTIFICATE_PATH = ROOT_PATH / 'ssl_cert' / 'ssl_verify.crt'
 
 # Mail configuration
@@ -61,6 +87,24 @@ PROXY_DICT = {"http": "http://proxy.iea.org:8080",
               "https": "http://proxy.iea.org:8080",
               "ftp": "ftp://proxy.iea.org:8080"}
 
+# HTTP client (connection pools and retries, see iea_scraper.core.http_client)
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+HTTP_POOL_MAXSIZE = 15
+# maximum number of concurrent requests sent to the same host by the shared HTTP clients
+HTTP_MAX_PER_HOST = 8
+# number of concurrent POST requests in batch uploads to the External DB API
+UPLOAD_MAX_IN_FLIGHT = 4
+# payload encoding of batch uploads (see iea_scraper.core.payload):
+# layout 'records' (list of dictionaries) or 'columns' (column-dictionary), compression None, 'gzip' or 'deflate'.
+# The defaults send plain JSON, as accepted by every External DB API instance.
+UPLOAD_PAYLOAD_LAYOUT = 'records'
+UPLOAD_PAYLOAD_COMPRESSION = None
+# update the sources meta-data with a single bulk PUT on dimension/source (only for the External DB API
+# instances accepting a list of sources), instead of one PUT per source
+SOURCE_BULK_UPDATE = False
+
 # Browser driver path for selenium
 PLATFORM = platform.system()
 CHROME_DRIVER = f"chromedriver{'.exe' if PLATFORM == 'Windows' else ''}"
@@ -281,6 +325,13 @@ LOGGING_EDC_POPULATE_DB = {
 
 
 EDC_TIMEOUT = 1000  # time out for runs
+# seconds after a timeout before the main thread is interrupted if the timed code did not stop by itself
+TIMEOUT_INTERRUPT_GRACE = 5
+# master scripts: number of jobs run in parallel processes, and at most per provider (None for no limit)
+SCHEDULER_MAX_WORKERS = 4
+SCHEDULER_MAX_PER_PROVIDER = 2
+# number of days fetched concurrently by EdcBulkJob subclasses implementing fetch_date() (1 to fetch one at a time)
+EDC_DATE_WORKERS = 6
 
 EDC_DAILY_ELECTRICITY_JOBS = {'Filestore': {'provider_code': 'elec_filestore', 'source_code': 'electricity_filestore'},
                               'Nigeria': {'provider_code': 'org_niggrid','source_code': 'nigerian_daily_generation_stats'},
@@ -402,14 +453,37 @@ REQUESTS_HEADERS = {'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
                                    + ' AppleWebKit/537.36 (KHTML, like Gecko) '
                                    + 'Chrome/80.0.3987.87 Safari/537.36')}
 
-EDC_TOLERATED_LISTS = {
-        'country_list': [country.alpha_3 for country in pycountry.countries],
-        'gas_country_partner_list': [country.alpha_3 for country in pycountry.countries] + ['LNG Partner'],
-        'gas_trade_location_list': ['Remich ITP-00072', 'Hora Svaté Kateřiny (CZ) / Deutschneudorf (Sayda) (DE) ITP-00015', 'Waidhaus ITP-00139', 'Lanžhot ITP-00051', 'Brandov STEGAL (CZ) / Stegal (DE) ITP-00123', 'Olbernhau (DE) / Hora Svaté Kateřiny (CZ) ITP-00150', 'Cieszyn (PL) / Český Těšín (CZ) ITP-00158', 'Deutschneudorf EUGAL Brandov  ITP-00535', 'VIP PIRINEOS ITP-00304', 'Bocholtz (Fluxys TENP) ITP-00068', 'Eynatten (BE) // Lichtenbusch / Raeren (DE) (Fluxys TENP) ITP-00057', 'Überackern ABG (AT) / Überackern (DE) ITP-00019', 'Überackern SUDAL (AT) / Überackern 2 (DE) ITP-00007', 'VIP Kiefersfelden-Pfronten ITP-00291', 'RC Lindau ITP-00227', 'BALTICCONNECTOR ITP-00550', 'Tarvisio (IT) / Arnoldstein (AT) ITP-00040', 'Gorizia (IT) /Šempeter (SI) ITP-00049', 'Melendugno - IT / TAP ITP-00008', 'VIP France - Germany ITP-00540', 'Medelsheim (DE) / Obergailbach (FR) (GRTgaz D) ITP-00083', 'Oberkappel (GRTgaz D) ITP-00056', 'Waidhaus (GRTgaz D) ITP-00073', 'Mallnow ITP-00096', 'VIP Brandov ITP-00537', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GASCADE) ITP-00076', 'Eynatten 1 (BE) // Lichtenbusch / Raeren (DE) ITP-00112', 'Brandov / OPAL ITP-00452', 'Kulata (BG) / Sidirokastron (GR) ITP-00128', 'Nea Mesimvria ITP-00427', 'VIP DK-THE ITP-10011', 'GCP GAZ-SYSTEM/ONTRAS ITP-00497', 'VIP IBERICO ITP-00286', 'Balassagyarmat (HU) / Velké Zlievce (SK) ITP-00027', 'Baumgarten ITP-00168', 'Kiemenai ITP-00054', 'Murfeld (AT) / Ceršak (SI) ITP-00079', 'Rogatec ITP-00042', 'Baumgarten (TAG) ITP-00037', 'Negru Voda II, III (RO) / Kardam (BG) ITP-00059', 'Bacton (BBL) ITP-00207', 'Zelzate (Zebra Pijpleiding) ITP-00110', 'Zevenaar ITP-00259', 'Winterswijk ITP-00078', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GUD) ITP-00102', 'Bunde (DE) / Oude Statenzijl (L) (NL) (GUD) ITP-00107', 'Bunde (DE) / Oude Statenzijl (L) (NL) (GTG Nord) ITP-00118', 'Vlieghuis ITP-00151', 'Bocholtz-Vetschau ITP-00025', 'Dinxperlo ITP-00305', 'VIP-BENE ITP-00555', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GTG Nord) ITP-00507', 'Zandvliet H-gas ITP-00088', 'Tegelen ITP-00244', "'s Gravenvoeren Dilsen (BE) // 's Gravenvoeren/Obbicht (NL) ITP-00258", 'Hilvarenbeek ITP-00038', 'VIP TTF-NCG H ITP-00551', 'Zelzate ITP-00101', 'Bunde (DE) / Oude Statenzijl (H) (NL) I (OGE) ITP-00103', 'Haanrade ITP-00071', 'VIP TTF-GASPOOL H ITP-00554', 'VIP TTF-THE-L ITP-10010', 'Bocholtz ITP-00169', 'Dravaszerdahely ITP-00011', 'Csanadpalota ITP-00032', 'Mosonmagyarovar ITP-00043', 'VIRTUALYS ITP-00526', 'Zeebrugge IZT ITP-00061', 'Blaregnies L (BE) / Taisnières B (FR) ITP-00115', 'VIP Belgium - NCG ITP-00542', 'Obergailbach (FR) / Medelsheim (DE) ITP-00137', 'Ellund (GUD) ITP-00109', 'Zevenaar (Thyssengas) ITP-00026', 'Baumgarten (WAG) ITP-00162', 'Petrzalka ITP-00255', 'Oberkappel ITP-00140', 'Baumgarten (Gas Connect Austria) ITP-00062', 'South North CSEP ITP-00222', 'VIP Waidhaus ITP-00538', 'Bacton (IUK) ITP-00005', 'Bacton IPs ITP-00492', 'Moffat ITP-00090', 'Zevenaar (OGE) ITP-00060', 'Bocholtz (OGE) ITP-00066', 'VIP Oberkappel ITP-00539', 'Waidhaus (OGE) ITP-00069', 'Ellund (OGE) ITP-00031', 'Medelsheim (DE) / Obergailbach (FR) (OGE) ITP-00047', 'Oberkappel (OGE) ITP-00006', 'Negru Voda I (RO) / Kardam (BG) ITP-00058', 'Ruse (BG) / Giurgiu (RO) ITP-00153', 'Lubmin II ITP-00501', 'Greifswald / Fluxys Deutschland ITP-00297', 'Värska ITP-00187', 'Narva ITP-00243', 'Gela ITP-00074', 'Mazara del Vallo ITP-00093', 'Greifswald / OPAL ITP-00251', 'Greifswald / NEL ITP-00247', 'Greifswald / LBTG ITP-00454', 'Kipi (TR) / Kipi (GR) ITP-00046', 'Tarifa ITP-00082', 'Almería ITP-00048', 'Uzhgorod (UA) - Velké Kapušany (SK) ITP-00117', 'Kotlovka ITP-00085', 'Kipoi ITP-00274', 'Strandzha 2 (BG) / Malkoclar (TR) ITP-00549', 'Emden (EPT1) (GTS) ITP-00160', 'VIP Bereg (HU) / VIP Bereg (UA) ITP-10006', 'Zeebrugge ZPT ITP-00106', 'Kondratki ITP-00104', 'Wysokoje ITP-00092', 'GCP GAZ-SYSTEM/UA TSO ITP-10008', 'Tieterowka ITP-00094', 'Dunkerque ITP-00045', 'Emden (EPT1) (GUD) ITP-00081', 'Greifswald / GUD ITP-00491', 'Dornum / NETRA (GUD) ITP-00188', 'Emden (EPT1) (Thyssengas) ITP-00105', 'Emden (EPT1) (OGE) ITP-00080', 'Dornum / NETRA (OGE) ITP-00126', 'Dornum GASPOOL ITP-00525', 'Imatra ITP-00024', 'Panigaglia LNG-00019', 'OLT LNG / Livorno LNG-00004', 'Cavarzere (Porto Levante / Adriatic LNG) LNG-00015', 'Klaipeda (LNG) LNG-00030', 'Gate Terminal (I) LNG-00027', 'Zeebrugge LNG LNG-00017', 'Swinoujscie LNG-00006', 'Sines LNG-00026', 'Wallbach ITP-00294', 'VIP Germany-CH ITP-00544', 'Griespass (CH) / Passo Gries (IT) ITP-00136', 'Bizzarone ITP-00278', 'Budince ITP-00421', 'Sakiai ITP-00050', 'Kyustendil (BG) / Zidilovo (MK) ITP-00036', 'Kireevo (BG) / Zaychar (RS) ITP-00529', 'Kiskundorozsma-2 (HU) / Horgos (RS) ITP-10013', 'Kiskundorozsma (HU>RS) ITP-00055', 'Oltingue (FR) / Rodersdorf (CH) ITP-00039', 'RC Basel ITP-00228', 'RC Thayngen-Fallentor ITP-00229', 'Strandzha (BG) / Malkoclar (TR) ITP-00041','Dornum', 'Emden', 'Dunkerque', 'Zeebrugge', 'Easington', 'St.Fergus', 'Fields Delivering into SEGAL', 'Other Exit Nominations'],
-        'gas_unit_list': ['kWh/h', 'Bcm', 'Bcf', 'TJ', 'MSm3'],
-        'price_node_list':[np.nan,
-                           'Illinois', 'Michigan', 'Minnesota', 'Indiana', 'Arkansas', 'Louisiana', 'Texas', 'Mississippi', 'Houston Area', 'North Area', 'Panhandle Area', 'South Area', 'West Area',
-                           'California Oregon Intertie', 'Palo Verde Intertie', 'ZP26- Central Generation Area', 'NP15- San Francisco Area', 'SP15- Los Angeles Area',
-                           'Capital Area', 'Central Area', 'Dunwoodie', 'Genesee', 'Hydro Quebec Intertie', 'Hudson Valley', 'Long Island', 'Mohawk Valley', 'Millwood', 'New York City', 'ISO-NE Intertie', 'IESO Intertie', 'PJM Intertie',
-                           'East Pennsylvnaia', 'West Pennsylvania', 'New Jersey', 'Chicago', 'North Illinois', 'American Electric Power', 'American Electric Power Dayton', 'Ohio', 'Virginia', 'American Transmission System Inc.']
-        }
+# lists of the values tolerated by the EDC checks, named in edc_config/*.yml (see get_edc_tolerated_lists())
+EDC_GAS_TRADE_LOCATIONS = ['Remich ITP-00072', 'Hora Svaté Kateřiny (CZ) / Deutschneudorf (Sayda) (DE) ITP-00015', 'Waidhaus ITP-00139', 'Lanžhot ITP-00051', 'Brandov STEGAL (CZ) / Stegal (DE) ITP-00123', 'Olbernhau (DE) / Hora Svaté Kateřiny (CZ) ITP-00150', 'Cieszyn (PL) / Český Těšín (CZ) ITP-00158', 'Deutschneudorf EUGAL Brandov  ITP-00535', 'VIP PIRINEOS ITP-00304', 'Bocholtz (Fluxys TENP) ITP-00068', 'Eynatten (BE) // Lichtenbusch / Raeren (DE) (Fluxys TENP) ITP-00057', 'Überackern ABG (AT) / Überackern (DE) ITP-00019', 'Überackern SUDAL (AT) / Überackern 2 (DE) ITP-00007', 'VIP Kiefersfelden-Pfronten ITP-00291', 'RC Lindau ITP-00227', 'BALTICCONNECTOR ITP-00550', 'Tarvisio (IT) / Arnoldstein (AT) ITP-00040', 'Gorizia (IT) /Šempeter (SI) ITP-00049', 'Melendugno - IT / TAP ITP-00008', 'VIP France - Germany ITP-00540', 'Medelsheim (DE) / Obergailbach (FR) (GRTgaz D) ITP-00083', 'Oberkappel (GRTgaz D) ITP-00056', 'Waidhaus (GRTgaz D) ITP-00073', 'Mallnow ITP-00096', 'VIP Brandov ITP-00537', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GASCADE) ITP-00076', 'Eynatten 1 (BE) // Lichtenbusch / Raeren (DE) ITP-00112', 'Brandov / OPAL ITP-00452', 'Kulata (BG) / Sidirokastron (GR) ITP-00128', 'Nea Mesimvria ITP-00427', 'VIP DK-THE ITP-10011', 'GCP GAZ-SYSTEM/ONTRAS ITP-00497', 'VIP IBERICO ITP-00286', 'Balassagyarmat (HU) / Velké Zlievce (SK) ITP-00027', 'Baumgarten ITP-00168', 'Kiemenai ITP-00054', 'Murfeld (AT) / Ceršak (SI) ITP-00079', 'Rogatec ITP-00042', 'Baumgarten (TAG) ITP-00037', 'Negru Voda II, III (RO) / Kardam (BG) ITP-00059', 'Bacton (BBL) ITP-00207', 'Zelzate (Zebra Pijpleiding) ITP-00110', 'Zevenaar ITP-00259', 'Winterswijk ITP-00078', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GUD) ITP-00102', 'Bunde (DE) / Oude Statenzijl (L) (NL) (GUD) ITP-00107', 'Bunde (DE) / Oude Statenzijl (L) (NL) (GTG Nord) ITP-00118', 'Vlieghuis ITP-00151', 'Bocholtz-Vetschau ITP-00025', 'Dinxperlo ITP-00305', 'VIP-BENE ITP-00555', 'Bunde (DE) / Oude Statenzijl (H) (NL) (GTG Nord) ITP-00507', 'Zandvliet H-gas ITP-00088', 'Tegelen ITP-00244', "'s Gravenvoeren Dilsen (BE) // 's Gravenvoeren/Obbicht (NL) ITP-00258", 'Hilvarenbeek ITP-00038', 'VIP TTF-NCG H ITP-00551', 'Zelzate ITP-00101', 'Bunde (DE) / Oude Statenzijl (H) (NL) I (OGE) ITP-00103', 'Haanrade ITP-00071', 'VIP TTF-GASPOOL H ITP-00554', 'VIP TTF-THE-L ITP-10010', 'Bocholtz ITP-00169', 'Dravaszerdahely ITP-00011', 'Csanadpalota ITP-00032', 'Mosonmagyarovar ITP-00043', 'VIRTUALYS ITP-00526', 'Zeebrugge IZT ITP-00061', 'Blaregnies L (BE) / Taisnières B (FR) ITP-00115', 'VIP Belgium - NCG ITP-00542', 'Obergailbach (FR) / Medelsheim (DE) ITP-00137', 'Ellund (GUD) ITP-00109', 'Zevenaar (Thyssengas) ITP-00026', 'Baumgarten (WAG) ITP-00162', 'Petrzalka ITP-00255', 'Oberkappel ITP-00140', 'Baumgarten (Gas Connect Austria) ITP-00062', 'South North CSEP ITP-00222', 'VIP Waidhaus ITP-00538', 'Bacton (IUK) ITP-00005', 'Bacton IPs ITP-00492', 'Moffat ITP-00090', 'Zevenaar (OGE) ITP-00060', 'Bocholtz (OGE) ITP-00066', 'VIP Oberkappel ITP-00539', 'Waidhaus (OGE) ITP-00069', 'Ellund (OGE) ITP-00031', 'Medelsheim (DE) / Obergailbach (FR) (OGE) ITP-00047', 'Oberkappel (OGE) ITP-00006', 'Negru Voda I (RO) / Kardam (BG) ITP-00058', 'Ruse (BG) / Giurgiu (RO) ITP-00153', 'Lubmin II ITP-00501', 'Greifswald / Fluxys Deutschland ITP-00297', 'Värska ITP-00187', 'Narva ITP-00243', 'Gela ITP-00074', 'Mazara del Vallo ITP-00093', 'Greifswald / OPAL ITP-00251', 'Greifswald / NEL ITP-00247', 'Greifswald / LBTG ITP-00454', 'Kipi (TR) / Kipi (GR) ITP-00046', 'Tarifa ITP-00082', 'Almería ITP-00048', 'Uzhgorod (UA) - Velké Kapušany (SK) ITP-00117', 'Kotlovka ITP-00085', 'Kipoi ITP-00274', 'Strandzha 2 (BG) / Malkoclar (TR) ITP-00549', 'Emden (EPT1) (GTS) ITP-00160', 'VIP Bereg (HU) / VIP Bereg (UA) ITP-10006', 'Zeebrugge ZPT ITP-00106', 'Kondratki ITP-00104', 'Wysokoje ITP-00092', 'GCP GAZ-SYSTEM/UA TSO ITP-10008', 'Tieterowka ITP-00094', 'Dunkerque ITP-00045', 'Emden (EPT1) (GUD) ITP-00081', 'Greifswald / GUD ITP-00491', 'Dornum / NETRA (GUD) ITP-00188', 'Emden (EPT1) (Thyssengas) ITP-00105', 'Emden (EPT1) (OGE) ITP-00080', 'Dornum / NETRA (OGE) ITP-00126', 'Dornum GASPOOL ITP-00525', 'Imatra ITP-00024', 'Panigaglia LNG-00019', 'OLT LNG / Livorno LNG-00004', 'Cavarzere (Porto Levante / Adriatic LNG) LNG-00015', 'Klaipeda (LNG) LNG-00030', 'Gate Terminal (I) LNG-00027', 'Zeebrugge LNG LNG-00017', 'Swinoujscie LNG-00006', 'Sines LNG-00026', 'Wallbach ITP-00294', 'VIP Germany-CH ITP-00544', 'Griespass (CH) / Passo Gries (IT) ITP-00136', 'Bizzarone ITP-00278', 'Budince ITP-00421', 'Sakiai ITP-00050', 'Kyustendil (BG) / Zidilovo (MK) ITP-00036', 'Kireevo (BG) / Zaychar (RS) ITP-00529', 'Kiskundorozsma-2 (HU) / Horgos (RS) ITP-10013', 'Kiskundorozsma (HU>RS) ITP-00055', 'Oltingue (FR) / Rodersdorf (CH) ITP-00039', 'RC Basel ITP-00228', 'RC Thayngen-Fallentor ITP-00229', 'Strandzha (BG) / Malkoclar (TR) ITP-00041','Dornum', 'Emden', 'Dunkerque', 'Zeebrugge', 'Easington', 'St.Fergus', 'Fields Delivering into SEGAL', 'Other Exit Nominations']
+EDC_GAS_UNITS = ['kWh/h', 'Bcm', 'Bcf', 'TJ', 'MSm3']
+# besides missing values
+EDC_PRICE_NODES = [
+    'Illinois', 'Michigan', 'Minnesota', 'Indiana', 'Arkansas', 'Louisiana', 'Texas', 'Mississippi', 'Houston Area', 'North Area', 'Panhandle Area', 'South Area', 'West Area',
+    'California Oregon Intertie', 'Palo Verde Intertie', 'ZP26- Central Generation Area', 'NP15- San Francisco Area', 'SP15- Los Angeles Area',
+    'Capital Area', 'Central Area', 'Dunwoodie', 'Genesee', 'Hydro Quebec Intertie', 'Hudson Valley', 'Long Island', 'Mohawk Valley', 'Millwood', 'New York City', 'ISO-NE Intertie', 'IESO Intertie', 'PJM Intertie',
+    'East Pennsylvnaia', 'West Pennsylvania', 'New Jersey', 'Chicago', 'North Illinois', 'American Electric Power', 'American Electric Power Dayton', 'Ohio', 'Virginia', 'American Transmission System Inc.']
+
+
+@lru_cache(maxsize=1)
+def get_edc_tolerated_lists():
+    """
+    Lists of the values tolerated by the EDC checks, computed on first use since the country lists
+    load the pycountry database.
+    :return: dictionary {list name: list of values}.
+    """
+    import numpy as np
+    import pycountry
+
+    countries = [country.alpha_3 for country in pycountry.countries]
+    return {'country_list': countries,
+            'gas_country_partner_list': countries + ['LNG Partner'],
+            'gas_trade_location_list': EDC_GAS_TRADE_LOCATIONS,
+            'gas_unit_list': EDC_GAS_UNITS,
+            'price_node_list': [np.nan, *EDC_PRICE_NODES]}
+
+
+def __getattr__(name):
+    # EDC_TOLERATED_LISTS is kept for the code importing it, but only built when it is used
+    if name == 'EDC_TOLERATED_LISTS':
+        return get_edc_tolerated_lists()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from benchmarks.fake_api import FakeApi
+from benchmarks.upload_load_test import run
+from iea_scraper.core import utils
+from iea_scraper.core.http_client import get_api_client
+from iea_scraper.core.payload import PayloadEncoder
+
+
+class TestFakeApi(TestCase):
+
+    def test_dimensions(self):
+        with FakeApi() as api:
+            http = get_api_client()
+            r = http.post(f'{api.url}/dimension/area', json=[{'code': 'FRA', 'category': 'country'},
+                                                             {'code': 'EU', 'category': 'region'}])
+            self.assertEqual(r.status_code, 201)
+            http.post(f'{api.url}/dimension/area', json=[{'code': 'FRA', 'category': 'country', 'name': 'France'}])
+            self.assertEqual(api.count('dimension', 'area'), 2)
+            self.assertEqual([row['code'] for row in http.get(f'{api.url}/dimension/area?category=country').json()],
+                             ['FRA'])
+            self.assertEqual(http.get(f'{api.url}/dimension/area?code=FRA').json()[0]['name'], 'France')
+            self.assertEqual(http.get(f'{api.url}/dimension/area?code=DEU').status_code, 404)
+            row_id = http.get(f'{api.url}/dimension/area?code=EU').json()[0]['id']
+            self.assertEqual(http.put(f'{api.url}/dimension/area', json=[{'id': row_id, 'name': 'Europe'}]).status_code,
+                             200)
+            self.assertEqual(http.put(f'{api.url}/dimension/area/999', json={'name': 'x'}).status_code, 404)
+            self.assertEqual(http.get(f'{api.url}/dimension/area?code=EU').json()[0]['name'], 'Europe')
+
+    def test_datapoints_upserted(self):
+        data = [{'area': 'FRA', 'period': '2022-01-01', 'value': 1.0},
+                {'area': 'FRA', 'period': '2022-01-01', 'value': 2.0},
+                {'area': 'DEU', 'period': '2022-01-01', 'value': 3.0}]
+        with FakeApi() as api:
+            utils.batch_upload(data, f'{api.url}/main/datapoint', 2, max_in_flight=1,
+                               encoder=PayloadEncoder('columns', 'gzip'))
+            self.assertEqual(api.count('datapoint'), 2)
+            self.assertEqual(api.counters['datapoint'], 3)
+
+    def test_load_test(self):
+        results = run(0.0, rows=100, batch=30, dims=10, sources=5, max_in_flight=2)
+        self.assertEqual(results['batch_upload'][0], 100)
+        self.assertEqual(list(results), ['batch_upload', 'insert_new_dynamic_dim', 'update_sources_metadata'])
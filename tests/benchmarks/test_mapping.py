@@ -0,0 +1,11 @@
+from unittest import TestCase
+
+from benchmarks.mapping import run, make_texts
+
+
+class TestMappingBenchmark(TestCase):
+
+    def test_run(self):
+        results = run(make_texts(50), codes=20, dimensions=2)
+        self.assertEqual(list(results), ['get_one_mapping', 'VocabularyMatcher (with compilation)',
+                                         'VocabularyMatcher compilation'])
@@ -0,0 +1,9 @@
+from unittest import TestCase
+
+from benchmarks.reference_index import run
+
+
+class TestReferenceIndexBenchmark(TestCase):
+
+    def test_run(self):
+        self.assertEqual(list(run(1000)), ['area', 'period'])
@@ -0,0 +1,64 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+import requests
+
+from benchmarks.replay import record, benchmark, compare, file_store
+from iea_scraper import settings
+from iea_scraper.core import job as core_job
+from iea_scraper.core.job import ExtDbApiJob
+from iea_scraper.core.source import BaseSource
+from iea_scraper.core.utils import get_dimension_db_data
+
+
+class DummyReplayJob(ExtDbApiJob):
+
+    def get_sources(self):
+        self.sources = [BaseSource(code='dummy', url='http://dummy', path='dummy/dummy.csv')]
+
+    def download_and_get_checksum(self, download=True, parallel_download=True):
+        path = core_job.FILE_STORE_PATH / 'dummy' / 'dummy.csv'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('1\n2\n3\n')
+
+    def transform(self):
+        areas = {area['code'] for area in get_dimension_db_data('area', 'category=country')}
+        lines = (core_job.FILE_STORE_PATH / self.sources[0].path).read_text().split()
+        self.data = ({'area': area, 'value': value} for area in sorted(areas) for value in lines)
+
+
+class TestReplay(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_record_and_replay(self):
+        live = requests.Response()
+        live.status_code, live._content, live.url = 200, b'[{"code": "FRA"}, {"code": "DEU"}]', 'http://api'
+        with mock.patch('benchmarks.replay.get_job', side_effect=lambda name, **kwargs: DummyReplayJob()), \
+                mock.patch('iea_scraper.core.utils.API_END_POINT', 'http://api'):
+            with mock.patch.object(requests.Session, 'request', return_value=live) as request, \
+                    file_store(self.path / 'live'):
+                record('dummy.replay', {}, fixtures=self.path / 'fixtures')
+            self.assertEqual(request.call_count, 1)
+            assert (self.path / 'fixtures' / 'dummy.replay' / 'files' / 'dummy' / 'dummy.csv').is_file()
+            result = benchmark('dummy.replay', repeat=2, fixtures=self.path / 'fixtures')
+        self.assertEqual(result['rows'], 6)
+        assert result['peak_memory'] > 0
+        assert core_job.FILE_STORE_PATH == settings.FILE_STORE_PATH
+
+    def test_unrecorded_request_fails(self):
+        from benchmarks.replay import replay_responses
+        with replay_responses({}):
+            self.assertRaises(requests.ConnectionError, requests.get, 'http://api/dimension/area')
+
+    def test_compare(self):
+        baseline = {'a': {'median': 1.0, 'peak_memory': 100}}
+        self.assertEqual(compare({'a': {'median': 1.1, 'peak_memory': 100}}, baseline, 0.2), [])
+        self.assertEqual(compare({'a': {'median': 1.5, 'peak_memory': 100}, 'b': {'median': 1, 'peak_memory': 1}},
+                                 baseline, 0.2), [('a', 'median', 1.5)])
@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+from benchmarks.startup import LAZY_MODULES, parse_importtime, import_time, compare
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:        50 |         50 | iea_scraper
+import time:       300 |        300 |   pandas
+import time:       200 |        700 | iea_scraper.core
+import time:      1000 |       2000 | iea_scraper.core.job
+"""
+
+
+class TestStartup(TestCase):
+
+    def test_parse_importtime(self):
+        seconds, imported = parse_importtime(OUTPUT, 'iea_scraper.core.job')
+        self.assertAlmostEqual(seconds, 0.00275)
+        self.assertEqual(imported, ['encodings', 'iea_scraper', 'pandas', 'iea_scraper.core', 'iea_scraper.core.job'])
+
+    def test_compare(self):
+        self.assertEqual(compare({'a': {'seconds': 1.5}, 'b': {'seconds': 1.1}},
+                                 {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0}}, 0.2), [('a', 1.5)])
+
+    def test_lazy_modules_not_imported(self):
+        for module in ('iea_scraper.settings', 'iea_scraper.jobs.utils'):
+            self.assertEqual(import_time(module, repeat=1)['lazy'], [], module)
+
+    def test_core_job_lazy_modules(self):
+        code = 'import sys, json, iea_scraper.core.job; print(json.dumps(sorted(sys.modules)))'
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        imported = {name.split('.')[0] for name in json.loads(process.stdout.splitlines()[-1])}
+        self.assertEqual(imported & set(LAZY_MODULES), set())
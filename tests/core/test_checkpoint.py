@@ -0,0 +1,134 @@
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from iea_scraper.core.checkpoint import RunCheckpointStore, RunCheckpoint
+from iea_scraper.core.job import ExtDbApiJob
+from iea_scraper.core.source import BaseSource
+
+
+class DummyApiJob(ExtDbApiJob):
+    checkpoints = True
+    transforms = 0
+
+    def get_sources(self):
+        self.sources = [BaseSource(code='dummy', url='http://dummy', path='dummy.csv', checksum='x')]
+
+    def transform(self):
+        DummyApiJob.transforms += 1
+        self.dynamic_dim['entity'] = []
+        self.data = ({'value': x} for x in range(7))
+
+
+class TestRunCheckpoint(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = RunCheckpointStore(Path(self.folder.name) / 'checkpoints.db')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_resume_latest_unfinished_run(self):
+        first = RunCheckpoint.open('job', store=self.store)
+        first.complete('transform')
+        first.upload_progress('datapoint')['on_batch_done'](1)
+        resumed = RunCheckpoint.open('job', resume=True, store=self.store)
+        self.assertEqual(resumed.run_id, first.run_id)
+        assert resumed.done('transform')
+        self.assertEqual(resumed.upload_progress('datapoint')['skip_batches'], {1})
+        self.assertEqual(resumed.upload_progress('dimension')['skip_batches'], set())
+        resumed.finish()
+        assert RunCheckpoint.open('job', resume=True, store=self.store).run_id != first.run_id
+
+    def test_spill(self):
+        checkpoint = RunCheckpoint.open('job', store=self.store)
+        df = pd.DataFrame({'value': [1.0, 2.0]})
+        pd.testing.assert_frame_equal(checkpoint.spill('df', df), df)
+        pd.testing.assert_frame_equal(checkpoint.load('df'), df)
+        with mock.patch('iea_scraper.core.checkpoint.SPILL_CHUNK', 2):
+            data = checkpoint.spill('data', (x for x in range(5)))
+        self.assertEqual(list(data), list(range(5)))
+        self.assertEqual(list(checkpoint.load('data')), list(range(5)))
+        checkpoint.finish()
+        assert not self.store.spill_folder(checkpoint.run_id).exists()
+
+    def test_new_run_deletes_unfinished_runs(self):
+        first = RunCheckpoint.open('job', store=self.store)
+        first.spill('data', [1])
+        other = RunCheckpoint.open('other job', store=self.store)
+        second = RunCheckpoint.open('job', store=self.store)
+        assert not self.store.spill_folder(first.run_id).exists()
+        self.assertEqual(self.store.last_unfinished_run('job'), second.run_id)
+        self.assertEqual(self.store.last_unfinished_run('other job'), other.run_id)
+
+    def test_prune(self):
+        old = RunCheckpoint.open('job', store=self.store)
+        old.spill('data', [1])
+        with sqlite3.connect(str(self.store.path)) as con:
+            con.execute("UPDATE run SET started = ? WHERE run_id = ?",
+                        ((datetime.now() - timedelta(days=8)).isoformat(), old.run_id))
+        recent = RunCheckpoint.open('other job', store=self.store)
+        self.assertEqual(self.store.prune(days=7), 1)
+        assert not self.store.spill_folder(old.run_id).exists()
+        self.assertIsNone(self.store.last_unfinished_run('job'))
+        self.assertEqual(self.store.last_unfinished_run('other job'), recent.run_id)
+
+    def test_no_store(self):
+        checkpoint = RunCheckpoint(None)
+        data = iter([1])
+        assert checkpoint.spill('data', data) is data
+        self.assertEqual(checkpoint.upload_progress('datapoint'), {})
+        checkpoint.complete('transform')
+        assert not checkpoint.done('transform')
+
+    def test_job_resume(self):
+        posted = []
+        failures = [3]
+
+        def post(url, json, **kwargs):
+            values = [row['value'] for row in json]
+            posted.append(values)
+            if failures and failures[0] in values:
+                failures.pop()
+                return mock.Mock(status_code=400, text='bad')
+            return mock.Mock(status_code=201, json=lambda: {'processed_rows': len(values)})
+
+        with mock.patch('iea_scraper.core.checkpoint.get_run_checkpoint_store', return_value=self.store), \
+                mock.patch('iea_scraper.core.job.BATCH_SIZE', 3), \
+                mock.patch('iea_scraper.core.utils.get_api_client') as client, \
+                mock.patch.multiple(DummyApiJob, rm_sources_up_to_date=mock.DEFAULT,
+                                    update_sources_metadata=mock.DEFAULT):
+            client.return_value.post.side_effect = post
+            self.assertRaises(IOError, DummyApiJob().run, download=False)
+            assert DummyApiJob().can_resume()
+            self.assertEqual(DummyApiJob.transforms, 1)
+            assert [0, 1, 2] in posted
+            posted.clear()
+            job = DummyApiJob()
+            job.run(download=False, resume=True)
+            self.assertEqual(DummyApiJob.transforms, 1)
+            self.assertEqual(sorted(posted), [[3, 4, 5], [6]])
+            self.assertEqual(job.sources[0].code, 'dummy')
+            assert not job.can_resume()
+            assert self.store.last_unfinished_run(f'{DummyApiJob.__module__}.DummyApiJob') is None
+
+    def test_job_without_checkpoints(self):
+        job = DummyApiJob()
+        job.checkpoints = False
+        with mock.patch('iea_scraper.core.checkpoint.get_run_checkpoint_store', return_value=self.store):
+            checkpoint = job.open_checkpoint()
+            self.assertIsNone(checkpoint.store)
+            # nothing to resume after a run without checkpoints
+            assert not job.can_resume()
+            job.transform()
+            data = job.data
+            job.spill('data')
+            # the generator is not spilled
+            assert job.data is data
+            # a resumed run records its progress
+            self.assertIsNotNone(job.open_checkpoint(resume=True).store)
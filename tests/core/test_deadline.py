@@ -0,0 +1,75 @@
+import threading
+import time
+from unittest import TestCase, mock
+
+from iea_scraper.core.deadline import deadline, check_deadline, remaining_time, run_in_subprocess
+from iea_scraper.core.http_client import HttpClient
+from iea_scraper.core.utils import timeout
+
+
+def slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestDeadline(TestCase):
+
+    def test_nested_deadline_cannot_extend(self):
+        with deadline(1):
+            with deadline(100):
+                assert remaining_time() <= 1
+            with deadline(0.01):
+                time.sleep(0.02)
+                self.assertRaises(TimeoutError, check_deadline)
+        assert remaining_time() is None
+
+    def test_timeout_only_in_its_thread(self):
+        @timeout(0.05)
+        def loop():
+            while True:
+                check_deadline()
+                time.sleep(0.01)
+
+        errors = []
+
+        def run():
+            try:
+                loop()
+            except TimeoutError as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        worker.join()
+        self.assertEqual(len(errors), 1)
+        # the main thread is not interrupted
+        self.assertEqual(slow(0.1), 0.1)
+
+    def test_late_function_raises(self):
+        self.assertRaises(TimeoutError, timeout(0.01)(slow), 0.02)
+        self.assertEqual(timeout(1)(slow)(0), 0)
+
+    def test_main_thread_interrupted(self):
+        @timeout(0.05)
+        def loop():
+            # ignores the deadline, like a bare requests call
+            while True:
+                time.sleep(0.01)
+
+        with mock.patch('iea_scraper.core.utils.TIMEOUT_INTERRUPT_GRACE', 0):
+            self.assertRaises(TimeoutError, loop)
+        self.assertEqual(slow(0.1), 0.1)
+
+    def test_http_timeout_capped(self):
+        http = HttpClient()
+        with mock.patch('requests.Session.request') as request:
+            with deadline(5):
+                http.get('https://api.eia.gov/', timeout=30)
+            assert request.call_args.kwargs['timeout'] <= 5
+            with deadline(0):
+                self.assertRaises(TimeoutError, http.get, 'https://api.eia.gov/')
+
+    def test_run_in_subprocess(self):
+        self.assertEqual(run_in_subprocess(slow, 0), 0)
+        self.assertRaises(TimeoutError, run_in_subprocess, slow, 10, timeout=0.5)
+        self.assertRaises(TypeError, run_in_subprocess, slow, 'a')
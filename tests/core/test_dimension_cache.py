@@ -0,0 +1,87 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from iea_scraper.core.dimension_cache import DimensionCache, dimension_of
+from iea_scraper.core.utils import batch_upload
+
+
+class TestDimensionCache(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+        self.calls = []
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def fetch(self, dimension, query_string):
+        self.calls.append((dimension, query_string))
+        return [{'code': f'{dimension}_{len(self.calls)}'}]
+
+    def test_memory(self):
+        cache = DimensionCache(self.path, ttl={})
+        first = cache.get('detail', 'category=EIA_INTL', self.fetch)
+        self.assertIs(cache.get('detail', 'category=EIA_INTL', self.fetch), first)
+        cache.get('detail', None, self.fetch)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(list(self.path.iterdir()), [])
+
+    def test_memory_expired_and_cleared(self):
+        cache = DimensionCache(self.path, ttl={}, memory_ttl=60)
+        cache.get('detail', None, self.fetch)
+        with mock.patch('iea_scraper.core.dimension_cache.time.time', return_value=time.time() + 61):
+            cache.get('detail', None, self.fetch)
+        cache.clear()
+        cache.get('detail', None, self.fetch)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_clear_keeps_snapshots(self):
+        cache = DimensionCache(self.path, ttl={'area': 60})
+        cache.get('area', None, self.fetch)
+        cache.clear()
+        cache.get('area', None, self.fetch)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_snapshot_shared_and_expired(self):
+        ttl = {'area': 60}
+        data = DimensionCache(self.path, ttl).get('area', None, self.fetch)
+        # another process reads the snapshot
+        self.assertEqual(DimensionCache(self.path, ttl).get('area', None, self.fetch), data)
+        self.assertEqual(len(self.calls), 1)
+        # and the snapshot of another API is not used
+        DimensionCache(self.path, ttl).get('area', None, self.fetch, api='http://other')
+        self.assertEqual(len(self.calls), 2)
+        with mock.patch('iea_scraper.core.dimension_cache.time.time', return_value=time.time() + 61):
+            self.assertNotEqual(DimensionCache(self.path, ttl).get('area', None, self.fetch), data)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_invalidate(self):
+        ttl = {'area': 60}
+        cache, other = DimensionCache(self.path, ttl), DimensionCache(self.path, ttl)
+        cache.get('area', None, self.fetch)
+        cache.get('period', None, self.fetch)
+        other.get('area', None, self.fetch)
+        cache.invalidate('area')
+        # the other process sees the invalidation
+        other.get('area', None, self.fetch)
+        cache.get('period', None, self.fetch)
+        self.assertEqual(self.calls, [('area', None), ('period', None), ('area', None)])
+
+    def test_batch_upload_invalidates(self):
+        cache = DimensionCache(self.path, {})
+        with mock.patch('iea_scraper.core.utils.get_dimension_cache', return_value=cache), \
+                mock.patch('iea_scraper.core.utils.post_batch', side_effect=lambda endpoint, data, i, encoder: len(data)):
+            cache.get('entity', None, self.fetch)
+            batch_upload([{'code': 'X'}], 'http://api/main/datapoint', 10)
+            cache.get('entity', None, self.fetch)
+            batch_upload([{'code': 'X'}], 'http://api/dimension/entity', 10)
+            cache.get('entity', None, self.fetch)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_dimension_of(self):
+        self.assertEqual(dimension_of('http://api/dimension/area?code=FRA'), 'area')
+        self.assertEqual(dimension_of('http://api/dimension/source/12'), 'source')
+        self.assertIsNone(dimension_of('http://api/main/datapoint'))
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from iea_scraper.core.edc_rules import EdcRules
+from iea_scraper.core.exceptions import EdcJobError
+from iea_scraper.core.utils import load_config
+
+
+def make_df_dw(rows=1000):
+    return pd.DataFrame({'Country': 'FRA',
+                         'Metric': np.resize(['Demand', 'Generation', 'Prices'], rows),
+                         'Product': np.resize(['ELE', 'Solar', 'ELE'], rows),
+                         'Source': 'TEST',
+                         'Flow 2': np.resize([np.nan, np.nan, 'EUR'], rows),
+                         'Value': 1.0})
+
+
+class TestEdcRules(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        conf = load_config('electricity')
+        cls.rules = EdcRules(conf['tolerated_columns'], conf['mandatory_columns'],
+                             conf['tolerated_metrics'], conf['tolerated_flows'])
+
+    def test_valid(self):
+        report = self.rules.check(make_df_dw())
+        assert report, list(report)
+
+    def test_all_violations_reported(self):
+        df = make_df_dw()
+        df.loc[0, 'Product'] = 'Coal'
+        df.loc[1, 'Product'] = 'Uranium'
+        df.loc[2, 'Flow 2'] = 'XXX'
+        df.loc[3, 'Metric'] = 'Stocks'
+        df['Extra'] = 1
+        report = self.rules.check(df)
+        self.assertEqual([v.rule for v in report],
+                         ['tolerated_columns', 'tolerated_metrics'] + ['tolerated_flows'] * 3)
+        self.assertEqual(sorted(v.metric or '' for v in report), ['', '', 'Demand', 'Generation', 'Prices'])
+        with self.assertRaises(EdcJobError):
+            report.raise_if_errors()
+
+    def test_mandatory_flow(self):
+        df = make_df_dw()
+        del df['Flow 2']
+        report = self.rules.check(df)
+        self.assertEqual([(v.rule, v.column, v.metric) for v in report], [('mandatory_flows', 'Flow 2', 'Prices')])
+
+    def test_empty(self):
+        self.assertEqual([v.rule for v in self.rules.check(pd.DataFrame())], ['empty'])
@@ -0,0 +1,63 @@
+import threading
+import time
+from unittest import TestCase, mock
+
+import requests
+
+from iea_scraper.core.http_client import HttpClient
+from iea_scraper.settings import PROXY_DICT, HTTP_MAX_RETRIES
+
+
+class TestHttpClient(TestCase):
+
+    def setUp(self):
+        self.http = HttpClient()
+
+    def tearDown(self):
+        self.http.close()
+
+    def test_one_session_per_host(self):
+        s1 = self.http.session('https://api.eia.gov/series/?a=1')
+        s2 = self.http.session('https://api.eia.gov/category/?b=2')
+        s3 = self.http.session('https://transparency.entsoe.eu/api?c=3')
+        assert s1 is s2
+        assert s1 is not s3
+
+    def test_session_defaults(self):
+        session = self.http.session('https://api.eia.gov')
+        self.assertEqual(session.proxies, PROXY_DICT)
+        adapter = session.get_adapter('https://api.eia.gov')
+        self.assertEqual(adapter.max_retries.total, HTTP_MAX_RETRIES)
+
+    def test_no_proxy(self):
+        session = HttpClient(proxies=None).session('http://localhost')
+        self.assertEqual(session.proxies, {})
+
+    def test_max_per_host(self):
+        http = HttpClient(max_per_host=2)
+        running, peak = [], []
+        lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            with lock:
+                running.append(url)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(url)
+            response = requests.Response()
+            response.status_code, response._content = 200, b'{}'
+            return response
+
+        with mock.patch('requests.Session.request', side_effect=request):
+            threads = [threading.Thread(target=http.get, args=('https://api.eia.gov/',)) for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(max(peak), 2)
+
+    def test_count_bytes_without_response(self):
+        HttpClient._count_bytes(None, stream=False)
+        HttpClient._count_bytes(mock.Mock(request=None, content=mock.Mock()), stream=False)
+
@@ -1,8 +1,19 @@
 from unittest import mock, TestCase
+import copy
 import datetime
+import threading
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
 from .utils import JobTest, TEST_FILE_STORE
-from iea_scraper.core.utils import calc_checksum_download, get_db_source_dict
-from iea_scraper.settings import PROXY_DICT
+from iea_scraper.core.deadline import deadline, check_deadline
+from iea_scraper.core.job import EdcJob, EdcBulkJob
+from iea_scraper.core.source import BaseSource, SourceStateStore
+from iea_scraper.core.utils import calc_checksum_download, get_db_source_dict, get_country_iso3
 
 
 
@@ -40,9 +51,271 @@ class TestDownloadSource(TestCase):
     def setUp(self):
         self.job = JobTest()
         self.job.get_sources()
+        self.folder = tempfile.TemporaryDirectory()
+        folder = Path(self.folder.name)
+        self.patches = [mock.patch('iea_scraper.core.job.get_http_client'),
+                        mock.patch('iea_scraper.core.job.FILE_STORE_PATH', folder),
+                        mock.patch('iea_scraper.core.source.FILE_STORE_PATH', folder),
+                        mock.patch('iea_scraper.core.source.get_source_state_store',
+                                   return_value=SourceStateStore(folder / 'source_state.db'))]
+        self.client = self.patches[0].start()
+        for p in self.patches[1:]:
+            p.start()
+        self.response = self.client.return_value.get.return_value.__enter__.return_value
+        self.response.status_code = 200
+        self.response.headers = {'ETag': '"v1"'}
+        self.response.iter_content.return_value = [b'abc']
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.folder.cleanup()
 
     def test_launch_download(self):
-        with mock.patch('requests.get') as req:
-            self.job.download_source(self.job.sources[0])
-            req.assert_called_once_with('http://b', proxies=PROXY_DICT) 
+        source = self.job.sources[0]
+        self.job.download_source(source)
+        self.client.return_value.get.assert_called_once_with('http://b', headers=None, stream=True)
+        self.assertEqual(source.checksum, "900150983cd24fb0d6963f7d28e17f72")
+        self.assertEqual((Path(self.folder.name) / 'c').read_bytes(), b'abc')
+
+    def test_conditional_download_not_modified(self):
+        self.job.download_source(self.job.sources[0])
+        self.response.status_code = 304
+        self.response.iter_content.return_value = []
+        source = BaseSource('a', 'http://b', 'c')
+        self.job.download_source(source)
+        self.client.return_value.get.assert_called_with('http://b', headers={'If-None-Match': '"v1"'},
+                                                        stream=True)
+        self.assertTrue(source.not_modified)
+        self.assertEqual(source.checksum, "900150983cd24fb0d6963f7d28e17f72")
+        self.assertEqual((Path(self.folder.name) / 'c').read_bytes(), b'abc')
+
+
+class DummyEdcJob(EdcJob):
+
+    def __init__(self, df, **kwargs):
+        super().__init__(**kwargs)
+        self._df = df
+        self.builds = 0
+
+    @property
+    def df_dw(self):
+        self.builds += 1
+        return self._df.copy()
+
+    def pre_run(self, df=None):
+        if df is not None:
+            self._df = df
+            # read while the data changes: not memoised
+            assert self.df_dw is not None
+
+
+def process_df_dw_reference(df_dw_p, export_datetime):
+    """Row by row implementation of EdcJob.process_df_dw() (dates and countries), for comparison."""
+    df_dw_p = df_dw_p[~df_dw_p['Value'].isnull()].copy()
+    df_dw_p['Value'] = df_dw_p['Value'].astype(float)
+    for col in ('local_datetime', 'utc_datetime'):
+        df_dw_p[col] = pd.to_datetime(df_dw_p[col])
+        date_col = col.replace('datetime', 'date')
+        not_null = ~df_dw_p[col].isnull()
+        df_dw_p.loc[not_null, date_col] = df_dw_p.loc[not_null, col].apply(lambda x: x.date())
+        df_dw_p[col] = df_dw_p[col].apply(lambda x: x.replace(tzinfo=None))
+    df_dw_p = df_dw_p.drop_duplicates()
+    attribute_cols = [col for col in df_dw_p.columns if col != 'Value']
+    df_dw_p = df_dw_p.groupby(attribute_cols, dropna=False).sum().reset_index()
+    df_dw_p['Export Date'] = export_datetime
+    df_dw_p['Country'] = df_dw_p['Country'].apply(get_country_iso3)
+    return df_dw_p
+
+
+class TestProcessDfDw(TestCase):
+
+    def test_same_output_as_row_by_row(self):
+        local = pd.Series(pd.date_range('2021-03-27 20:00', periods=48, freq='h', tz='Europe/Paris'))
+        df = pd.DataFrame({'Country': np.resize(['France', 'DE', 'Italy'], 96),
+                           'Metric': 'Demand',
+                           'Product': 'ELE',
+                           'Source': 'TEST',
+                           'Flow 1': np.resize([np.nan, 'Estimate'], 96),
+                           'local_datetime': pd.concat([local, local], ignore_index=True),
+                           'utc_datetime': pd.concat([local, local], ignore_index=True).dt.tz_convert('UTC'),
+                           'Value': np.resize([1.5, np.nan, 2.0, 3.25], 96)})
+        job = DummyEdcJob(df)
+        expected = process_df_dw_reference(df, job.export_datetime)
+        pd.testing.assert_frame_equal(job.process_df_dw(), expected)
+
+
+class TestStages(TestCase):
+
+    def test_stage_durations_add_up(self):
+        job = DummyEdcJob(pd.DataFrame())
+        for _ in range(2):
+            with job.stage('scrape') as scrape:
+                time.sleep(0.01)
+                scrape['rows'] = 3
+        self.assertGreaterEqual(job.stages['scrape']['duration'], 0.02)
+        self.assertEqual(job.stages['scrape']['rows'], 3)
+
+
+class TestDfDwCache(TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({'Country': 'France', 'Metric': 'Demand', 'Product': 'ELE', 'Source': 'TEST',
+                                'Value': [1.0, 2.0]})
+
+    def test_built_once_per_generation(self):
+        job = DummyEdcJob(self.df)
+        job.check_df_dw()
+        processed = job.df_dw_processed
+        pd.testing.assert_frame_equal(job.df_dw_processed, processed)
+        self.assertEqual(job.builds, 1)
+        self.assertEqual(job.cache_stats['hit'], 2)
+
+    def test_returns_copies(self):
+        job = DummyEdcJob(self.df)
+        job.df_dw_processed['Value'] = 0.0
+        job.df_dw['Value'] = 0.0
+        self.assertEqual(job.df_dw_processed['Value'].sum(), 3.0)
+        self.assertEqual(job.df_dw['Value'].tolist(), [1.0, 2.0])
+        self.assertEqual(job.builds, 1)
+
+    def test_assignment_invalidates(self):
+        job = DummyEdcJob(self.df)
+        _ = job.df_dw_processed
+        job._df = self.df.assign(Value=5.0)
+        self.assertEqual(job.df_dw_processed['Value'].tolist(), [5.0])
+        self.assertEqual(job.builds, 2)
+
+    def test_copy_has_own_cache(self):
+        job = DummyEdcJob(self.df)
+        expected = job.df_dw_processed['Value'].tolist()
+        day = copy.copy(job)
+        day._df = self.df.assign(Value=5.0)
+        self.assertEqual(day.df_dw_processed['Value'].tolist(), [5.0])
+        assert day._cache is not job._cache and day.cache_stats is not job.cache_stats
+        # the value memoised by the copy is not seen by the job
+        self.assertEqual(job.df_dw_processed['Value'].tolist(), expected)
+
+    def test_pre_run_invalidates(self):
+        job = DummyEdcJob(self.df)
+        _ = job.df_dw_processed
+        job.pre_run(self.df.assign(Value=5.0))
+        self.assertEqual(job.df_dw_processed['Value'].tolist(), [5.0])
+        self.assertEqual(job.builds, 3)
+        job.invalidate_df_dw()
+        _ = job.df_dw
+        self.assertEqual(job.builds, 4)
+
+
+class DummyBulkJob(EdcBulkJob):
+    offset_now = 1
+    day_lags = list(range(1, 9))
+
+    def __init__(self, missing=(), **kwargs):
+        super().__init__(**kwargs)
+        self.missing = set(missing)
+        self.merged = []
+
+    @property
+    def df_dw(self):
+        return pd.DataFrame({'Country': 'France', 'Metric': 'Demand', 'Product': 'ELE', 'Source': 'TEST',
+                             'Value': [float(tdate.day) for tdate in self.merged]})
+
+    def fetch_date(self, tdate):
+        # later days answer first
+        time.sleep(0.01 * (10 - (self.export_date - tdate).days))
+        if (self.export_date - tdate).days in self.missing:
+            raise ValueError(f'{tdate} not available')
+        return tdate
+
+    def merge_date(self, tdate, payload):
+        assert threading.current_thread() is threading.main_thread()
+        self.merged.append(payload)
+
+    def run_date(self, tdate):
+        self.merge_date(tdate, self.fetch_date(tdate))
+
+
+class TestRunDates(TestCase):
+
+    def test_merged_in_order(self):
+        job = DummyBulkJob(missing=[3])
+        job.pre_run()
+        expected = [job.export_date - datetime.timedelta(days=day) for day in job.day_lags if day != 3]
+        self.assertEqual(job.merged, expected)
+
+    def test_sequential(self):
+        job = DummyBulkJob(missing=[3])
+        job.max_date_workers = 1
+        assert not job.fetches_concurrently
+        job.pre_run()
+        self.assertEqual(len(job.merged), 7)
+
+    def test_fetches_stop_at_deadline(self):
+        class SlowBulkJob(DummyBulkJob):
+            def fetch_date(self, tdate):
+                while True:
+                    check_deadline()
+                    time.sleep(0.01)
+
+        job = SlowBulkJob()
+        job.max_date_workers = 2
+        begin = time.monotonic()
+        with deadline(0.2):
+            errors = [error for _, error in job.run_dates(job.export_date - datetime.timedelta(days=day)
+                                                          for day in range(1, 4))]
+        # the workers stopped at the deadline: the pool was shut down quickly
+        self.assertLess(time.monotonic() - begin, 2)
+        self.assertTrue(all(isinstance(error, TimeoutError) for error in errors))
+
+    def test_reset(self):
+        job = DummyBulkJob()
+        job.pre_run()
+        self.assertEqual(len(job.df_dw), 8)
+        job.reset()
+        self.assertEqual(job.merged, [])
+        self.assertEqual(len(job.df_dw), 0)
+
+    def test_error_tolerance(self):
+        job = DummyBulkJob(missing=range(4, 100))
+        with mock.patch.multiple(DummyBulkJob, check_df_dw=mock.DEFAULT, process_df_dw=mock.DEFAULT):
+            job.bulk_run(error_tolerance=2)
+        self.assertEqual(len(job.merged), 3)
+        self.assertEqual(job.earliest_available_date, job.export_date - datetime.timedelta(days=3))
+
+    def test_bulk_run_by_batches(self):
+        job = DummyBulkJob(missing=[3])
+        end_date = job.export_date - datetime.timedelta(days=1)
+        start_date = end_date - datetime.timedelta(days=6)
+        with tempfile.TemporaryDirectory() as folder:
+            checkpoint = Path(folder) / 'dummy.checkpoint'
+            job.bulk_run_by_batches(3, start_date=start_date, end_date=end_date, folder=folder,
+                                    checkpoint=checkpoint)
+            self.assertEqual(len(list(Path(folder).glob('*.csv'))), 3)
+            self.assertEqual(job.merged, [])
+            self.assertEqual(job.earliest_available_date, start_date)
+            # the checkpoint stops after the missing day 3
+            self.assertEqual(checkpoint.read_text(), (job.export_date - datetime.timedelta(days=2)).isoformat())
+            # the next run starts again from day 3
+            job.missing = set()
+            with mock.patch.object(DummyBulkJob, 'commit_batch') as commit:
+                job.bulk_run_by_batches(3, start_date=start_date, end_date=end_date, checkpoint=checkpoint)
+            self.assertEqual(commit.call_args_list[0].args[1], job.export_date - datetime.timedelta(days=3))
+            self.assertEqual(checkpoint.read_text(), start_date.isoformat())
+            # nothing left to scrape
+            with mock.patch.object(DummyBulkJob, 'merge_date') as merge:
+                job.bulk_run_by_batches(3, start_date=start_date, end_date=end_date, checkpoint=checkpoint)
+                merge.assert_not_called()
+
+    def test_bulk_run_by_batches_commit_error(self):
+        job = DummyBulkJob()
+        end_date = job.export_date - datetime.timedelta(days=1)
+        start_date = end_date - datetime.timedelta(days=5)
+        with tempfile.TemporaryDirectory() as folder:
+            checkpoint = Path(folder) / 'dummy.checkpoint'
+            with mock.patch.object(DummyBulkJob, 'commit_batch', side_effect=[None, IOError('db down')]):
+                with self.assertRaises(IOError):
+                    job.bulk_run_by_batches(3, start_date=start_date, end_date=end_date, checkpoint=checkpoint)
+            # only the first batch was committed
+            self.assertEqual(checkpoint.read_text(), (job.export_date - datetime.timedelta(days=3)).isoformat())
 
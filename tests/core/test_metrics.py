@@ -0,0 +1,64 @@
+import datetime
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from iea_scraper.core import metrics
+from iea_scraper.core.http_client import HttpClient
+from iea_scraper.core.metrics import StageMeter, summarize, write_json_lines, write_textfile
+
+
+class TestStageMeter(TestCase):
+
+    def test_measures(self):
+        stage = {}
+        http = HttpClient()
+        response = mock.Mock(content=b'x' * 100)
+        response.request.body = b'{}'
+        with mock.patch('requests.Session.request', return_value=response):
+            with StageMeter(stage) as measured:
+                http.post('https://api.eia.gov/', data=b'{}')
+                measured['rows'] = 5
+            with StageMeter(stage):
+                http.get('https://api.eia.gov/')
+        self.assertEqual(stage['http_bytes_received'], 200)
+        self.assertEqual(stage['http_bytes_sent'], 4)
+        self.assertEqual(stage['rows'], 5)
+        assert stage['duration'] >= 0 and stage['cpu'] >= 0
+        if metrics.resource is not None:
+            assert stage['peak_rss'] > 0
+
+
+class TestExport(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.stages = {'download': {'duration': 12.0, 'cpu': 1.0, 'rows': None, 'http_bytes_received': 3_200_000},
+                       'upsert': {'duration': 4.0, 'cpu': 2.0, 'rows': 20000, 'peak_rss': 200_000_000}}
+        self.started = datetime.datetime(2022, 1, 1)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_summarize(self):
+        self.assertEqual(summarize(self.stages), 'download 12s 3.2MB | upsert 4s 20000 rows | rss 200MB')
+        assert summarize({}) is None
+
+    def test_json_lines(self):
+        path = Path(self.folder.name) / 'metrics.jsonl'
+        for _ in range(2):
+            write_json_lines('gov_noaa_ncei.gsod', self.started, 'OK', 16.0, self.stages, path=path)
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1]['stage'], 'upsert')
+        self.assertEqual(lines[1]['rows'], 20000)
+
+    def test_textfile(self):
+        folder = Path(self.folder.name)
+        write_textfile('gov_noaa_ncei.gsod', self.started, 'ERROR', 16.0, self.stages, folder=folder)
+        text = (folder / 'iea_scraper_gov_noaa_ncei.gsod.prom').read_text()
+        assert 'iea_scraper_run_success{job="gov_noaa_ncei.gsod"} 0' in text
+        assert 'iea_scraper_stage_rows_out{job="gov_noaa_ncei.gsod",stage="upsert"} 20000' in text
+        assert 'stage="download"} 20000' not in text
+        self.assertEqual(text.count('# TYPE iea_scraper_stage_wall_seconds gauge'), 1)
@@ -0,0 +1,73 @@
+from datetime import datetime
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+
+from iea_scraper.core.payload import PayloadEncoder, decode, dumps, to_columns, from_columns
+from iea_scraper.core.utils import batch_upload
+
+RECORDS = [{'area': 'FRA', 'product': 'COAL', 'value': 1.5},
+           {'area': 'FRA', 'product': 'GAS', 'value': None},
+           {'area': 'DEU', 'product': 'COAL', 'value': 3.0},
+           {'area': 'FRA', 'product': 'COAL', 'value': 4.0}]
+
+
+class TestPayload(TestCase):
+
+    def test_columns_layout(self):
+        payload = to_columns(RECORDS)
+        self.assertEqual(payload['columns']['area'], {'dict': ['FRA', 'DEU'], 'codes': [0, 0, 1, 0]})
+        self.assertEqual(payload['columns']['value'], [1.5, None, 3.0, 4.0])
+        self.assertEqual(from_columns(payload), RECORDS)
+
+    def test_columns_layout_missing_keys(self):
+        records = [{'area': 'FRA'}, {'area': 'DEU', 'value': 2.0}]
+        payload = to_columns(records)
+        self.assertEqual(payload['columns']['value'], [None, 2.0])
+        self.assertEqual(from_columns(payload), [{'area': 'FRA', 'value': None}, {'area': 'DEU', 'value': 2.0}])
+
+    def test_dumps_without_orjson(self):
+        obj = [{'value': np.float64(1.5), 'count': np.int64(2), 'missing': float('nan'), 'nan': np.float64('nan'),
+                'values': np.array([1, 2]), 'date': datetime(2020, 1, 2)}]
+        expected = dumps(obj)
+        with mock.patch('iea_scraper.core.payload.orjson', None):
+            self.assertEqual(decode(dumps(obj), {}), decode(expected, {}))
+            self.assertEqual(decode(dumps(obj), {}),
+                             [{'value': 1.5, 'count': 2, 'missing': None, 'nan': None, 'values': [1, 2],
+                               'date': '2020-01-02T00:00:00'}])
+
+    def test_round_trip(self):
+        for layout in ('records', 'columns'):
+            for compression in (None, 'gzip', 'deflate'):
+                body, headers = PayloadEncoder(layout, compression).encode(RECORDS)
+                self.assertEqual(decode(body, headers), RECORDS)
+                self.assertEqual(headers.get('Content-Encoding'), compression)
+
+    def test_invalid_layout(self):
+        with self.assertRaises(ValueError):
+            PayloadEncoder('rows')
+
+    def test_batch_upload_with_encoder(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.post.return_value.status_code = 201
+            batch_upload(RECORDS, 'http://api/main/datapoint', 3, max_in_flight=1,
+                         encoder=PayloadEncoder('columns', 'gzip'))
+            sent = [decode(call.kwargs['data'], call.kwargs['headers'])
+                    for call in client.return_value.post.call_args_list]
+            self.assertEqual(sent, [RECORDS[:3], RECORDS[3:]])
+
+    def test_frame_round_trip(self):
+        df = pd.DataFrame(RECORDS)
+        for layout in ('records', 'columns'):
+            body, headers = PayloadEncoder(layout, 'gzip').encode(df)
+            self.assertEqual(decode(body, headers), RECORDS)
+
+    def test_batch_upload_frames(self):
+        frames = (pd.DataFrame(RECORDS) for _ in range(2))
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.post.return_value.status_code = 201
+            batch_upload(frames, 'http://api/main/datapoint', 3, max_in_flight=1)
+            sent = [decode(call.kwargs['data'], call.kwargs['headers'])
+                    for call in client.return_value.post.call_args_list]
+            self.assertEqual(sent, [RECORDS[:3], RECORDS[3:]] * 2)
@@ -0,0 +1,49 @@
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from iea_scraper.core import reference_index
+from iea_scraper.core.reference_index import ReferenceIndex, map_area, map_period
+from iea_scraper.jobs.utils import convert_area_to_code
+
+AREAS = [{'code': 'FRANCE', 'iso_alpha_3': 'FRA', 'iso_alpha_2': 'FR'},
+         {'code': 'GERMANY', 'iso_alpha_3': 'DEU', 'iso_alpha_2': 'DE'},
+         {'code': 'EUROPE', 'iso_alpha_3': None, 'iso_alpha_2': None},
+         {'code': 'FRANCE_OLD', 'iso_alpha_3': 'FRA', 'iso_alpha_2': None}]
+PERIODS = [{'code': '2020', 'id': 2020}, {'code': '2020Q1', 'id': 20201}]
+
+
+def dimension_data(dimension, query_string=None):
+    return {'area': AREAS, 'period': PERIODS}[dimension]
+
+
+class TestReferenceIndex(TestCase):
+
+    def test_index(self):
+        index = ReferenceIndex(AREAS, ('iso_alpha_3', 'iso_alpha_2'))
+        self.assertEqual(dict(index.mapping), {'FRA': 'FRANCE', 'DEU': 'GERMANY', 'FR': 'FRANCE', 'DE': 'GERMANY'})
+        with self.assertRaises(TypeError):
+            index.mapping['ITA'] = 'ITALY'
+        values = pd.Series(['FR', 'DEU', None, 'ITA', 'FRA'], index=[3, 4, 5, 6, 7], name='area')
+        mapped = index.map(values)
+        self.assertEqual(mapped.tolist(), ['FRANCE', 'GERMANY', None, None, 'FRANCE'])
+        self.assertEqual(mapped.index.tolist(), [3, 4, 5, 6, 7])
+        self.assertEqual(index.map(values.astype('category')).tolist(), mapped.tolist())
+        self.assertEqual(index.map(['DE']).tolist(), ['GERMANY'])
+
+    def test_convert(self):
+        index = ReferenceIndex(PERIODS, 'id')
+        self.assertEqual(index.map(pd.Series(['2020Q1', '2020', '2021']), convert=lambda x: int(x.replace('Q', '')))
+                         .tolist(), ['2020Q1', '2020', None])
+
+    def test_dimension_functions(self):
+        with mock.patch('iea_scraper.core.reference_index.get_dimension_db_data', side_effect=dimension_data):
+            self.assertEqual(map_area(pd.Series(['DEU'])).tolist(), ['GERMANY'])
+            self.assertEqual(map_period(pd.Series([20201])).tolist(), ['2020Q1'])
+            # built once per dimension data
+            self.assertIs(reference_index.get_reference_index('area', 'iso_alpha_3'),
+                          reference_index.get_reference_index('area', 'iso_alpha_3'))
+            df = pd.DataFrame({'area': ['FRA', 'XXX'], 'value': [1.0, 2.0]})
+            df = convert_area_to_code(df)
+        self.assertEqual(df.columns.tolist(), ['value', 'area'])
+        self.assertEqual(df['area'].tolist(), ['FRANCE', None])
@@ -0,0 +1,40 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from iea_scraper.core import factory, registry
+
+
+class TestRegistry(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = registry.build_registry()
+
+    def test_class_name(self):
+        self.assertEqual(registry.class_name('br_oil_prod'), 'BrOilProdJob')
+
+    def test_entries(self):
+        job = self.registry['gov_eia.bulk_intl']
+        self.assertEqual(job['module'], 'iea_scraper.jobs.gov_eia.bulk_intl')
+        self.assertEqual(job['class'], 'BulkIntlJob')
+        self.assertEqual(job['type'], 'ExtDb')
+        self.assertIn('daily_master', job['schedule'])
+        self.assertEqual(self.registry['eu_entsoe.european_power_stats']['type'], 'Edc')
+
+    def test_cache_rebuilt_when_stale(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / 'registry.json'
+            path.write_text(json.dumps({'fingerprint': 'stale', 'jobs': {}}))
+            try:
+                self.assertEqual(registry.get_registry(path), self.registry)
+                self.assertEqual(json.loads(path.read_text())['fingerprint'], registry.fingerprint())
+            finally:
+                registry.get_registry.cache_clear()
+
+    def test_factory(self):
+        job = factory.get_scraper_job('ca_gc_statcan', 'ca_oil_prod')
+        self.assertEqual(type(job).__name__, 'CaOilProdJob')
+        with self.assertRaises(ValueError):
+            factory.get_scraper_job('ca_gc_statcan', 'missing_job')
@@ -0,0 +1,32 @@
+import datetime
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from iea_scraper.core.run_history import RunHistoryStore
+
+
+class TestRunHistoryStore(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = RunHistoryStore(Path(self.folder.name) / 'run_history.db')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_record_and_last_runs(self):
+        started = datetime.datetime(2022, 1, 1)
+        self.store.record('gov_noaa_ncei.gsod', started, 'OK', 120.0,
+                          {'download': {'duration': 100.0, 'rows': None}, 'upsert': {'duration': 20.0, 'rows': 5}})
+        self.store.record('gov_noaa_ncei.gsod', started, 'ERROR', 1.0)
+        runs = self.store.last_runs('gov_noaa_ncei.gsod')
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]['stages']['upsert'], {'duration': 20.0, 'rows': 5})
+
+    def test_expected_duration(self):
+        assert self.store.expected_duration('com_argusmedia.argus_prices') is None
+        for duration in (10.0, 30.0, 1000.0, 20.0):
+            self.store.record('com_argusmedia.argus_prices', datetime.datetime.now(), 'OK', duration)
+        self.assertEqual(self.store.expected_duration('com_argusmedia.argus_prices'), 25.0)
+        self.assertEqual(self.store.expected_duration('com_argusmedia.argus_prices', n=2), 510.0)
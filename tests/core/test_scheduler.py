@@ -0,0 +1,87 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from iea_scraper.core import db
+from iea_scraper.core.scheduler import schedule, check_order
+
+
+def job(provider_code, source_code, seconds=0.0):
+    time.sleep(seconds)
+    return f'{provider_code}.{source_code}'
+
+
+def logging_job(provider_code, source_code):
+    logging.getLogger('tests.scheduler').info(f'{provider_code} scraped')
+    return len(db._engines)
+
+
+class TestScheduler(TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.running = []
+        self.lock = threading.Lock()
+
+    def record(self, provider_code, source_code, seconds=0.05):
+        with self.lock:
+            self.running.append(provider_code)
+            self.events.append(('start', source_code, list(self.running)))
+        time.sleep(seconds)
+        with self.lock:
+            self.running.remove(provider_code)
+            self.events.append(('end', source_code, list(self.running)))
+        return source_code
+
+    def test_order_and_limits(self):
+        tasks = {name: {'provider_code': provider, 'source_code': name}
+                 for name, provider in [('a', 'jp_1'), ('b', 'jp_1'), ('c', 'jp_1'), ('d', 'jp_2'), ('all', 'jp')]}
+        with ThreadPoolExecutor(4) as executor:
+            futures = schedule(tasks, self.record, after={'all': ['a', 'b', 'c', 'd']},
+                               max_workers=3, max_per_provider=2, executor=executor)
+        self.assertEqual([f.result() for f in futures.values()], list(tasks))
+        starts = [running for event, _, running in self.events if event == 'start']
+        assert all(len(running) <= 3 and running.count('jp_1') <= 2 for running in starts)
+        ends = [name for event, name, _ in self.events if event == 'end']
+        self.assertEqual(ends[-1], 'all')
+        self.assertEqual(sum(1 for event, _, _ in self.events[:-2] if event == 'start'), 4)
+
+    def test_processes(self):
+        tasks = {str(i): {'provider_code': f'p{i}', 'source_code': 's', 'seconds': 0.5} for i in range(4)}
+        begin = time.monotonic()
+        futures = schedule(tasks, job, max_workers=4)
+        self.assertLess(time.monotonic() - begin, 1.5)
+        self.assertEqual([f.result() for f in futures.values()], [f'p{i}.s' for i in range(4)])
+
+    def test_worker_initialisation(self):
+        db.get_engine('sqlite://')
+        tasks = {str(i): {'provider_code': f'p{i}', 'source_code': 's'} for i in range(2)}
+        root = logging.getLogger()
+        level = root.level
+        root.setLevel(logging.INFO)
+        try:
+            with self.assertLogs('tests.scheduler', level='INFO') as logs:
+                futures = schedule(tasks, logging_job, max_workers=2)
+        finally:
+            root.setLevel(level)
+            db.dispose_engines()
+        # the engines of the parent are not reused by the workers
+        self.assertEqual([f.result() for f in futures.values()], [0, 0])
+        # the records of the workers are handled by the parent
+        self.assertEqual(sorted(logs.output), ['INFO:tests.scheduler:p0 scraped', 'INFO:tests.scheduler:p1 scraped'])
+
+    def test_check_order(self):
+        self.assertRaises(ValueError, check_order, ['a', 'b'], {'a': ['b'], 'b': ['a']})
+        self.assertRaises(ValueError, check_order, ['a'], {'a': ['x']})
+        check_order(['a', 'b'], {'b': ['a']})
+
+    def test_priority(self):
+        tasks = {name: {'provider_code': name, 'source_code': name} for name in 'abc'}
+        with ThreadPoolExecutor(1) as executor:
+            futures = schedule(tasks, self.record, max_workers=1, executor=executor, priority=['c', 'a', 'b'])
+        self.assertEqual([name for event, name, _ in self.events if event == 'start'], ['c', 'a', 'b'])
+        self.assertEqual(list(futures), ['a', 'b', 'c'])
+        self.assertRaises(ValueError, schedule, tasks, self.record, priority=['a'])
+
@@ -1,6 +1,9 @@
 
 import unittest
-from iea_scraper.core.ts import Normalizer
+from unittest import mock
+
+from iea_scraper.core.ts import Normalizer, VocabularyMatcher, get_one_mapping, get_vocab_list, mapping, \
+    auto_mapping
 
 class TestNormalize(unittest.TestCase):
 
@@ -12,3 +15,42 @@ class TestNormalize(unittest.TestCase):
 
     def test_things(self):
         self.assertEqual(self.normalizer.normalize("CRUDE OIL"), "crude oil")
+
+
+DIMENSION = [{'code': 'CRUDEOIL', 'long_name': 'Crude oil', 'meta_data': '{"keywords": ["crude"]}'},
+             {'code': 'OIL', 'long_name': 'Oil', 'meta_data': None},
+             {'code': 'GAS', 'long_name': 'Natural gas', 'meta_data': '{"keywords": ["gas", "lng"]}'},
+             {'code': 'None', 'long_name': 'None', 'meta_data': None}]
+
+
+class TestVocabularyMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.normalizer = Normalizer()
+        self.names = {x['code']: get_vocab_list(x, self.normalizer) for x in DIMENSION if x['code'] != 'None'}
+        self.matcher = VocabularyMatcher(self.names)
+
+    def test_same_as_get_one_mapping(self):
+        for text in ['Crude oil production', 'Natural gas and crude oil', 'oil and gas', 'gasoline', 'coal', '',
+                     'lng imports of crude oil', 'soil']:
+            text = self.normalizer.normalize(text)
+            self.assertEqual(self.matcher.earliest(text), get_one_mapping(text, {'d': self.names}).get('d'), text)
+
+    def test_rank_at_same_position(self):
+        # at the same position, the first entry in the order of the codes wins, whatever its length
+        matcher = VocabularyMatcher({'A': ['ab'], 'B': ['abc'], 'C': ['b']})
+        self.assertEqual(matcher.earliest('xabc'), 'A')
+        self.assertEqual(VocabularyMatcher({'B': ['abc'], 'A': ['ab']}).earliest('xabc'), 'B')
+        self.assertEqual(VocabularyMatcher({'A': ['b'], 'B': ['']}).earliest('ab'), 'B')
+
+    def test_last(self):
+        self.assertEqual(self.matcher.last('natural gas and crude oil'), 'GAS')
+        self.assertEqual(self.matcher.last('crude oil'), 'OIL')
+        self.assertIsNone(self.matcher.last('coal'))
+
+    def test_mapping(self):
+        with mock.patch('iea_scraper.core.ts.get_dimension_db_data', return_value=DIMENSION):
+            self.assertEqual(mapping(['Crude oil', 'Coal', 'Gas and oil'], ['product']),
+                             [{'product': 'CRUDEOIL'}, {}, {'product': 'GAS'}])
+            self.assertEqual(auto_mapping(['product'], 'Gas and oil'), {'product': 'GAS'})
+            self.assertEqual(auto_mapping(['product'], 'Coal'), {})
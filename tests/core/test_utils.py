@@ -1,9 +1,24 @@
 from unittest import mock, TestCase
-from iea_scraper.core.utils import get_dimension_db_data
+from pathlib import Path
+import os
+import tempfile
+import requests
+from iea_scraper.core.dimension_cache import DimensionCache
+from iea_scraper.core.utils import get_dimension_db_data, stream_to_file, update_db_sources, get_db_source_index, \
+    iter_batches, batch_upload
 from iea_scraper.settings import API_END_POINT
 
 class GetDimensionDbData(TestCase):
-    
+
+    def setUp(self):
+        # the snapshots of the tests are not shared with the scrapers
+        self.folder = tempfile.TemporaryDirectory()
+        patcher = mock.patch('iea_scraper.core.utils.get_dimension_cache',
+                             return_value=DimensionCache(Path(self.folder.name)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.folder.cleanup)
+
     def test_basic(self):
         data = get_dimension_db_data('product')
         assert len(data) > 0, f"Error with {data}"
@@ -13,12 +28,108 @@ class GetDimensionDbData(TestCase):
         get_dimension_db_data.cache_clear()
 
     def test_query(self):
-        with mock.patch('requests.get') as req:
+        get_dimension_db_data.cache_clear()
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
             get_dimension_db_data('area', "code=FRANCE")
-            req.assert_called_once_with(f"{API_END_POINT}/dimension/area?code=FRANCE")
+            client.return_value.get.assert_called_once_with(f"{API_END_POINT}/dimension/area?code=FRANCE")
             get_dimension_db_data.cache_clear()
         data = get_dimension_db_data('area', "code=FRANCE")
         assert data[0]['iso_alpha_3'] == "FRA", str(data[0])
 
+    def test_error_not_cached(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.get.return_value.raise_for_status.side_effect = requests.HTTPError('503')
+            self.assertRaises(requests.HTTPError, get_dimension_db_data, 'detail', 'code=X')
+            client.return_value.get.return_value.raise_for_status.side_effect = None
+            client.return_value.get.return_value.json.return_value = [{'code': 'X'}]
+            self.assertEqual(get_dimension_db_data('detail', 'code=X'), [{'code': 'X'}])
+
+    def test_cache_clear_keeps_snapshots(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.get.return_value.json.return_value = [{'code': 'FRANCE'}]
+            get_dimension_db_data('area')
+            get_dimension_db_data.cache_clear()
+            self.assertEqual(get_dimension_db_data('area'), [{'code': 'FRANCE'}])
+            client.return_value.get.assert_called_once()
+        assert any(Path(self.folder.name).rglob('*.pickle'))
+
+
+
+
+
+class StreamToFile(TestCase):
+
+    def test_checksum_and_atomic_write(self):
+        response = mock.Mock()
+        response.iter_content.return_value = iter([b'a', b'bc'])
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = Path(folder) / 'cksum.txt'
+            checksum, size = stream_to_file(response, file_path)
+            self.assertEqual(checksum, "900150983cd24fb0d6963f7d28e17f72")
+            self.assertEqual(size, 3)
+            self.assertEqual(file_path.read_bytes(), b'abc')
+            self.assertEqual(os.listdir(folder), ['cksum.txt'])
+
+    def test_no_partial_file_on_error(self):
+        response = mock.Mock()
+        response.iter_content.side_effect = IOError('connection reset')
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = Path(folder) / 'cksum.txt'
+            with self.assertRaises(IOError):
+                stream_to_file(response, file_path)
+            self.assertEqual(os.listdir(folder), [])
+
+
+class UpdateDbSources(TestCase):
+
+    def test_one_put_per_source(self):
+        data = [{'id': 1, 'checksum': 'a'}, {'id': 2, 'checksum': 'b'}]
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            update_db_sources(data)
+            client.return_value.put.assert_any_call(f"{API_END_POINT}/dimension/source/1", json={'checksum': 'a'})
+            client.return_value.put.assert_any_call(f"{API_END_POINT}/dimension/source/2", json={'checksum': 'b'})
+            assert client.return_value.put.call_count == 2
+            assert client.return_value.put.return_value.raise_for_status.call_count == 2
+
+    def test_bulk_put(self):
+        data = [{'id': 1, 'checksum': 'a'}, {'id': 2, 'checksum': 'b'}]
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.put.return_value.status_code = 200
+            update_db_sources(data, bulk=True)
+            client.return_value.put.assert_called_once_with(f"{API_END_POINT}/dimension/source", json=data)
+
+    def test_source_index_of_source_codes(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.get.return_value.status_code = 200
+            client.return_value.get.return_value.json.side_effect = [[{'code': 'a', 'id': 1}], []]
+            self.assertEqual(get_db_source_index(['a', 'b', 'a']), {'a': {'code': 'a', 'id': 1}})
+            assert client.return_value.get.call_count == 2
+
+
+class BatchUpload(TestCase):
+
+    def test_iter_batches(self):
+        self.assertEqual(list(iter_batches(list(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(iter_batches((x for x in range(4)), 2)), [[0, 1], [2, 3]])
+
+    def test_all_batches_posted(self):
+        data = ({'value': x} for x in range(10))
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.post.return_value.status_code = 201
+            batch_upload(data, 'http://api/main/datapoint', 3)
+            sent = [call.kwargs['json'] for call in client.return_value.post.call_args_list]
+            self.assertEqual(sorted(x['value'] for batch in sent for x in batch), list(range(10)))
+            assert len(sent) == 4
 
+    def test_retry_on_server_error(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client, \
+                mock.patch('iea_scraper.core.utils.time.sleep'):
+            client.return_value.post.side_effect = [mock.Mock(status_code=503), mock.Mock(status_code=201)]
+            batch_upload([{'value': 1}], 'http://api/main/datapoint', 3)
+            assert client.return_value.post.call_count == 2
 
+    def test_client_error_raises(self):
+        with mock.patch('iea_scraper.core.utils.get_api_client') as client:
+            client.return_value.post.return_value = mock.Mock(status_code=400, text='bad')
+            with self.assertRaises(IOError):
+                batch_upload([{'value': 1}], 'http://api/main/datapoint', 3)